@@ -11,7 +11,37 @@ class AppConfig:
     SOUND_START_UP = os.path.join(_PROJECT_ROOT, "data", "sounds", "start_up_sound.wav")
     SOUND_END_SESSION = os.path.join(_PROJECT_ROOT, "data", "sounds", "end_up_sound.wav")
 
+    TTS_CACHE_ENABLED = os.getenv("TTS_CACHE_ENABLED", "true").lower() == "true"
+    TTS_CACHE_DIR = os.path.join(_PROJECT_ROOT, "data", "cache", "tts")
+    TTS_CACHE_MAX_BYTES = int(os.getenv("TTS_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+
+    VOSK_MODEL_PATH = os.path.join(_PROJECT_ROOT, "voice", "voices", "assets", "models", "vosk", "vosk-model-small-en-us-0.15")
+
+    LLM_ENDPOINT = os.getenv("LLM_ENDPOINT", "https://models.github.ai/inference")
+    LLM_MODEL_NAME = os.getenv("LLM_MODEL_NAME", "openai/gpt-5-nano")
+    LLM_API_KEY = os.getenv("GITHUB_TOKEN") or os.getenv("API_TOKEN")
+
+    RUNTIME_MAX_SESSIONS = int(os.getenv("RUNTIME_MAX_SESSIONS", "32"))
+    RUNTIME_MAX_CONCURRENT_SYNTHESIS = int(os.getenv("RUNTIME_MAX_CONCURRENT_SYNTHESIS", "8"))
+    RUNTIME_DECODE_WORKERS = int(os.getenv("RUNTIME_DECODE_WORKERS", str(os.cpu_count() or 4)))
+
+    PLAYBACK_SAMPLE_RATE = int(os.getenv("PLAYBACK_SAMPLE_RATE", "24000"))
+    PLAYBACK_BLOCK_MS = int(os.getenv("PLAYBACK_BLOCK_MS", "20"))
+
     GEMINI_LIVE_MODEL_NAME = "models/gemini-2.5-flash-preview-native-audio-dialog"
     GEMINI_LIVE_SYSTEM_INSTRUCTION = "You are a helpful assistant. Be concise and friendly."
     GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
-    GEMINI_LIVE_VIDEO_MODE = "none" # Options: "camera", "screen", "none"
\ No newline at end of file
+    GEMINI_LIVE_VIDEO_MODE = "none" # Options: "camera", "screen", "none"
+    # Received audio buffered before playback starts, and the most held before the oldest is dropped.
+    GEMINI_LIVE_JITTER_TARGET_MS = int(os.getenv("GEMINI_LIVE_JITTER_TARGET_MS", "120"))
+    GEMINI_LIVE_JITTER_MAX_MS = int(os.getenv("GEMINI_LIVE_JITTER_MAX_MS", "2000"))
+    # Only upload microphone audio the local VAD hears as speech; optionally also flush
+    # playback locally when the user starts talking (needs headphones or echo cancellation).
+    GEMINI_LIVE_VAD_GATE = os.getenv("GEMINI_LIVE_VAD_GATE", "true").lower() == "true"
+    GEMINI_LIVE_LOCAL_BARGE_IN = os.getenv("GEMINI_LIVE_LOCAL_BARGE_IN", "false").lower() == "true"
+    # Resume a dropped Live connection with the server's resumption handle, holding up to
+    # GEMINI_LIVE_RECONNECT_BUFFER_MS of mic audio meanwhile; optionally keep a connection
+    # open in standby so the next conversation starts without connect latency.
+    GEMINI_LIVE_SESSION_RESUMPTION = os.getenv("GEMINI_LIVE_SESSION_RESUMPTION", "true").lower() == "true"
+    GEMINI_LIVE_RECONNECT_BUFFER_MS = int(os.getenv("GEMINI_LIVE_RECONNECT_BUFFER_MS", "5000"))
+    GEMINI_LIVE_STANDBY = os.getenv("GEMINI_LIVE_STANDBY", "false").lower() == "true"
\ No newline at end of file
@@ -0,0 +1,174 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from core.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class _Entry:
+    def __init__(self, factory: Callable[[], Any], closer: Optional[Callable[[Any], None]]):
+        self.factory = factory
+        self.closer = closer
+        self.instance: Any = None
+        self.loaded = False
+        self.load_seconds: Optional[float] = None
+        self.lock = threading.Lock()
+
+
+class ModelRegistry:
+    """
+    Builds each heavy model or client once and hands out the shared instance.
+
+    Factories are registered by name and run on first `get` (lazy) or up front
+    through `prewarm` (eager). Every load is timed so startup cost can be
+    reported. This class is a singleton; use the module-level `model_registry`.
+    """
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(ModelRegistry, cls).__new__(cls)
+            cls._instance._entries: Dict[str, _Entry] = {}
+            cls._instance._lock = threading.Lock()
+        return cls._instance
+
+    def register(self, name: str, factory: Callable[[], Any],
+                 closer: Optional[Callable[[Any], None]] = None, replace: bool = False) -> None:
+        """
+        Register how to build a model.
+
+        Args:
+            name (str): Key the model is fetched by.
+            factory (Callable[[], Any]): Builds the model; called at most once.
+            closer (Optional[Callable[[Any], None]]): Releases the model, e.g. `lambda m: m.delete()`.
+            replace (bool): Replace an existing registration (releasing a loaded instance).
+                            Otherwise registering a known name is a no-op.
+        """
+        with self._lock:
+            existing = self._entries.get(name)
+            if existing is not None and not replace:
+                return
+            self._entries[name] = _Entry(factory, closer)
+        if existing is not None:
+            self._close_entry(name, existing)
+
+    def get(self, name: str) -> Any:
+        """
+        Return the model, building it on first use.
+
+        Args:
+            name (str): Registered name.
+
+        Returns:
+            Any: The shared instance.
+
+        Raises:
+            KeyError: If nothing is registered under `name`.
+            Exception: Whatever the factory raised; the next `get` retries.
+        """
+        with self._lock:
+            entry = self._entries.get(name)
+        if entry is None:
+            raise KeyError(f"No model registered as '{name}'.")
+        if entry.loaded:
+            return entry.instance
+
+        with entry.lock:
+            if not entry.loaded:
+                start = time.perf_counter()
+                instance = entry.factory()
+                entry.load_seconds = time.perf_counter() - start
+                entry.instance = instance
+                entry.loaded = True
+                logger.info(f"Loaded '{name}' in {entry.load_seconds * 1000:.0f} ms")
+        return entry.instance
+
+    def get_or_create(self, name: str, factory: Callable[[], Any],
+                      closer: Optional[Callable[[Any], None]] = None) -> Any:
+        """Register `factory` under `name` unless already registered, then `get` it."""
+        self.register(name, factory, closer)
+        return self.get(name)
+
+    def is_loaded(self, name: str) -> bool:
+        """True if the model has been built."""
+        with self._lock:
+            entry = self._entries.get(name)
+        return bool(entry and entry.loaded)
+
+    def prewarm(self, names: Optional[Iterable[str]] = None, max_workers: int = 4) -> Dict[str, float]:
+        """
+        Build models now instead of on first use, in parallel.
+
+        Args:
+            names (Optional[Iterable[str]]): Models to build; defaults to every registered one.
+            max_workers (int): Models loaded at the same time.
+
+        Returns:
+            Dict[str, float]: Load time in seconds of each requested model
+                              (0.0 for ones that were already loaded).
+
+        Raises:
+            Exception: The first factory error, after every load has been attempted.
+        """
+        with self._lock:
+            names = list(names) if names is not None else list(self._entries)
+        errors = []
+
+        def load(name: str) -> None:
+            try:
+                self.get(name)
+            except Exception as e:
+                logger.error(f"Failed to pre-warm '{name}': {e}")
+                errors.append(e)
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ModelPrewarm") as pool:
+            list(pool.map(load, names))
+        logger.info(f"Pre-warmed {len(names)} model(s) in {(time.perf_counter() - start) * 1000:.0f} ms")
+        if errors:
+            raise errors[0]
+        return {name: self.load_times().get(name, 0.0) for name in names}
+
+    def load_times(self) -> Dict[str, float]:
+        """Return the load time in seconds of every model built so far."""
+        with self._lock:
+            return {name: entry.load_seconds for name, entry in self._entries.items() if entry.loaded}
+
+    def report(self) -> str:
+        """Return the load times as a single human-readable line."""
+        times = self.load_times()
+        if not times:
+            return "no models loaded"
+        return ", ".join(f"{name}={seconds * 1000:.0f}ms" for name, seconds in sorted(times.items()))
+
+    def release(self, name: str) -> None:
+        """Release a loaded model; it will be rebuilt on the next `get`."""
+        with self._lock:
+            entry = self._entries.get(name)
+        if entry is not None:
+            self._close_entry(name, entry)
+
+    def close(self) -> None:
+        """Release every loaded model."""
+        with self._lock:
+            entries = list(self._entries.items())
+        for name, entry in entries:
+            self._close_entry(name, entry)
+
+    def _close_entry(self, name: str, entry: _Entry) -> None:
+        with entry.lock:
+            if not entry.loaded:
+                return
+            instance, entry.instance, entry.loaded = entry.instance, None, False
+        if entry.closer is not None:
+            try:
+                entry.closer(instance)
+            except Exception as e:
+                logger.error(f"Error releasing '{name}': {e}")
+
+
+model_registry = ModelRegistry()
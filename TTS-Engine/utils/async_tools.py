@@ -1,6 +1,226 @@
 # jarvis/utils/async_tools.py
 # Async utilities
 import asyncio
+import concurrent.futures
+import queue
+import threading
+from typing import Any, AsyncIterator, Awaitable, Iterator, Optional
+
+from core.logger import get_logger
+
+logger = get_logger(__name__)
 
 async def run_async_task(task):
     await asyncio.create_task(task)
+
+
+class BackgroundEventLoop:
+    """
+    An asyncio event loop running forever in a daemon thread.
+
+    Lets synchronous code drive async clients (websockets, aiohttp sessions)
+    without creating a new event loop, and a new connection, per call.
+    """
+
+    def __init__(self, name: str = "BackgroundEventLoop"):
+        self.name = name
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run_loop, name=name, daemon=True)
+        self._thread.start()
+
+    def _run_loop(self) -> None:
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def in_loop_thread(self) -> bool:
+        """Return True when called from the loop's own thread."""
+        return threading.current_thread() is self._thread
+
+    def submit(self, coro: Awaitable[Any]) -> concurrent.futures.Future:
+        """
+        Schedule a coroutine on the loop.
+
+        Returns:
+            concurrent.futures.Future: Future for the coroutine's result.
+        """
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro: Awaitable[Any], timeout: Optional[float] = None) -> Any:
+        """
+        Run a coroutine on the loop and block until it finishes.
+
+        Raises:
+            RuntimeError: If called from the loop thread, which would deadlock.
+        """
+        if self.in_loop_thread():
+            raise RuntimeError(f"{self.name}.run() called from its own loop thread.")
+        return self.submit(coro).result(timeout)
+
+    def iterate(self, agen: AsyncIterator[Any], max_buffered: int = 32) -> Iterator[Any]:
+        """
+        Consume an async iterator from synchronous code.
+
+        Items are produced on the loop and handed over as they arrive, so the
+        caller sees each one without waiting for the iterator to finish.
+        """
+        if self.in_loop_thread():
+            raise RuntimeError(f"{self.name}.iterate() called from its own loop thread.")
+
+        items: "queue.Queue" = queue.Queue(maxsize=max_buffered)
+        done = object()
+
+        async def pump():
+            try:
+                async for item in agen:
+                    await asyncio.to_thread(items.put, (item, None))
+            except BaseException as e:
+                await asyncio.to_thread(items.put, (done, e))
+                return
+            await asyncio.to_thread(items.put, (done, None))
+
+        future = self.submit(pump())
+        try:
+            while True:
+                item, error = items.get()
+                if item is done:
+                    if error is not None:
+                        raise error
+                    return
+                yield item
+        finally:
+            if not future.done():
+                future.cancel()
+                # Unblock a producer waiting on a full queue so cancellation lands.
+                try:
+                    while True:
+                        items.get_nowait()
+                except queue.Empty:
+                    pass
+
+    async def run_async(self, coro: Awaitable[Any]) -> Any:
+        """
+        Await a coroutine on this loop from any event loop.
+
+        Objects bound to this loop (e.g. an aiohttp session) can then be used
+        from coroutines running elsewhere.
+        """
+        if asyncio.get_running_loop() is self.loop:
+            return await coro
+        return await asyncio.wrap_future(self.submit(coro))
+
+    async def aiterate(self, agen: AsyncIterator[Any]) -> AsyncIterator[Any]:
+        """
+        Consume an async iterator that runs on this loop from any event loop.
+        """
+        caller_loop = asyncio.get_running_loop()
+        if caller_loop is self.loop:
+            async for item in agen:
+                yield item
+            return
+
+        items: asyncio.Queue = asyncio.Queue()
+        done = object()
+
+        async def pump():
+            try:
+                async for item in agen:
+                    caller_loop.call_soon_threadsafe(items.put_nowait, (item, None))
+            except BaseException as e:
+                caller_loop.call_soon_threadsafe(items.put_nowait, (done, e))
+                return
+            caller_loop.call_soon_threadsafe(items.put_nowait, (done, None))
+
+        future = self.submit(pump())
+        try:
+            while True:
+                item, error = await items.get()
+                if item is done:
+                    if error is not None:
+                        raise error
+                    return
+                yield item
+        finally:
+            if not future.done():
+                future.cancel()
+
+    def stop(self) -> None:
+        """Stop the loop and wait for its thread to exit."""
+        if self.loop.is_running():
+            self.loop.call_soon_threadsafe(self.loop.stop)
+        if not self.in_loop_thread():
+            self._thread.join(timeout=5)
+
+
+async def iterate_in_thread(iterator: Iterator[Any], max_buffered: int = 32) -> AsyncIterator[Any]:
+    """
+    Consume a blocking iterator from a coroutine.
+
+    The iterator is advanced on a daemon thread and its items are handed to the
+    calling loop as they are produced. Leaving the `async for` early returns at
+    once; the thread stops after the item it is currently producing, which may
+    be a blocking read that never completes.
+    """
+    loop = asyncio.get_running_loop()
+    items: asyncio.Queue = asyncio.Queue()
+    # Bounds the items produced but not yet consumed.
+    slots = threading.Semaphore(max_buffered)
+    done = object()
+    stopped = threading.Event()
+
+    def put(item: Any) -> bool:
+        slots.acquire()
+        if stopped.is_set():
+            return False
+        try:
+            loop.call_soon_threadsafe(items.put_nowait, item)
+        except RuntimeError:
+            return False  # the consumer's loop is gone
+        return True
+
+    def pump() -> None:
+        try:
+            for item in iterator:
+                if not put((item, None)):
+                    break
+        except BaseException as e:
+            put((done, e))
+            return
+        finally:
+            close = getattr(iterator, "close", None)
+            if close is not None:
+                close()
+        put((done, None))
+
+    threading.Thread(target=pump, name="IterateInThread", daemon=True).start()
+    try:
+        while True:
+            item, error = await items.get()
+            slots.release()
+            if item is done:
+                if error is not None:
+                    raise error
+                return
+            yield item
+    finally:
+        stopped.set()
+        # Wake a producer waiting for a free slot so it sees the stop flag.
+        slots.release()
+
+
+_shared_loop: Optional[BackgroundEventLoop] = None
+_shared_loop_lock = threading.Lock()
+
+
+def get_background_loop() -> BackgroundEventLoop:
+    """
+    Get the process-wide background event loop, starting it on first use.
+
+    Returns:
+        BackgroundEventLoop: The shared loop.
+    """
+    global _shared_loop
+    with _shared_loop_lock:
+        if _shared_loop is None:
+            _shared_loop = BackgroundEventLoop(name="JarvisBackgroundLoop")
+            logger.info("Started shared background event loop.")
+        return _shared_loop
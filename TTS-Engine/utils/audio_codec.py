@@ -0,0 +1,216 @@
+import numpy as np
+
+# G.711 mu-law, as used by telephone audio (and Twilio Media Streams).
+_MULAW_BIAS = 0x84
+MULAW_SILENCE = 0xFF
+
+
+def _build_decode_table() -> np.ndarray:
+    codes = ~np.arange(256, dtype=np.int32) & 0xFF
+    sign = codes & 0x80
+    exponent = (codes >> 4) & 0x07
+    mantissa = codes & 0x0F
+    magnitude = (((mantissa << 3) + _MULAW_BIAS) << exponent) - _MULAW_BIAS
+    return np.where(sign, -magnitude, magnitude).astype(np.int16)
+
+
+def _build_encode_table() -> np.ndarray:
+    # Indexed by the int16 sample reinterpreted as uint16. Follows the reference
+    # G.711 encoder on 14-bit samples, so output is bit-exact with other codecs.
+    samples = np.arange(65536, dtype=np.uint16).view(np.int16).astype(np.int32) >> 2
+    mask = np.where(samples < 0, 0x7F, 0xFF)
+    magnitude = np.minimum(np.abs(samples), 8159) + 0x21
+    segment = np.floor(np.log2(magnitude)).astype(np.int32) - 5
+    codes = (np.clip(segment, 0, 7) << 4) | ((magnitude >> (np.clip(segment, 0, 7) + 1)) & 0x0F)
+    codes = np.where(segment > 7, 0x7F, codes)
+    return (codes ^ mask).astype(np.uint8)
+
+
+_DECODE_TABLE = _build_decode_table()
+_ENCODE_TABLE = _build_encode_table()
+
+
+def mulaw_decode(data: bytes) -> np.ndarray:
+    """
+    Decode mu-law bytes to int16 PCM with a single table lookup.
+
+    Args:
+        data (bytes): One mu-law code per sample.
+
+    Returns:
+        np.ndarray: int16 samples.
+    """
+    return _DECODE_TABLE[np.frombuffer(data, dtype=np.uint8)]
+
+
+def mulaw_encode(pcm: np.ndarray) -> bytes:
+    """
+    Encode int16 PCM to mu-law bytes with a single table lookup.
+
+    Args:
+        pcm (np.ndarray): int16 samples.
+
+    Returns:
+        bytes: One mu-law code per sample.
+    """
+    return _ENCODE_TABLE[np.ascontiguousarray(pcm, dtype=np.int16).view(np.uint16)].tobytes()
+
+
+def float_to_pcm16(pcm: np.ndarray) -> np.ndarray:
+    """Convert float samples in [-1, 1] to int16, clipping out-of-range values."""
+    return (np.clip(pcm, -1.0, 1.0) * 32767.0).astype(np.int16)
+
+
+def _lowpass_kernel(cutoff: float, taps: int = 63) -> np.ndarray:
+    # Windowed-sinc FIR; `cutoff` is a fraction of the input sample rate.
+    n = np.arange(taps) - (taps - 1) / 2.0
+    kernel = 2 * cutoff * np.sinc(2 * cutoff * n) * np.hamming(taps)
+    return (kernel / kernel.sum()).astype(np.float32)
+
+
+def resample_block(pcm: np.ndarray, src_rate: int, dst_rate: int) -> np.ndarray:
+    """
+    Resample a complete block of mono float32 PCM.
+
+    Downsampling low-passes first so content above the new Nyquist frequency
+    does not fold back as aliasing; upsampling interpolates linearly.
+
+    Args:
+        pcm (np.ndarray): Samples shaped (frames,).
+        src_rate (int): Rate of the input.
+        dst_rate (int): Desired rate.
+
+    Returns:
+        np.ndarray: float32 samples at `dst_rate`.
+    """
+    if src_rate == dst_rate or len(pcm) == 0:
+        return pcm.astype(np.float32, copy=False)
+    if dst_rate < src_rate:
+        pcm = np.convolve(pcm, _lowpass_kernel(0.45 * dst_rate / src_rate), mode="same")
+    target_length = int(round(len(pcm) * dst_rate / src_rate))
+    positions = np.arange(target_length) * (src_rate / dst_rate)
+    return np.interp(positions, np.arange(len(pcm)), pcm).astype(np.float32)
+
+
+class StreamResampler:
+    """
+    Resamples a stream of mono float32 blocks, e.g. a file read piece by piece.
+
+    Same filter and interpolation as `resample_block`, but the filter history
+    and the fractional read position carry over between blocks, so the output
+    is continuous and the whole stream never has to be in memory. The filter
+    delay is compensated: output sample n is the input at n * src/dst. Call
+    `flush` after the last block to get the final samples; the stream then
+    has as many samples as `resample_block` makes of the whole input.
+    """
+
+    def __init__(self, src_rate: int, dst_rate: int, taps: int = 63):
+        """
+        Args:
+            src_rate (int): Rate of the input.
+            dst_rate (int): Desired rate.
+            taps (int): Length of the anti-aliasing filter used when downsampling (odd).
+        """
+        self.src_rate = src_rate
+        self.dst_rate = dst_rate
+        self._step = src_rate / dst_rate
+        self._kernel = _lowpass_kernel(0.45 * dst_rate / src_rate, taps) if dst_rate < src_rate else None
+        self._delay = (taps - 1) // 2 if self._kernel is not None else 0
+        self.reset()
+
+    def process(self, pcm: np.ndarray) -> np.ndarray:
+        """
+        Args:
+            pcm (np.ndarray): The next float32 samples at the input rate.
+
+        Returns:
+            np.ndarray: float32 samples at the output rate (possibly empty).
+        """
+        pcm = pcm.astype(np.float32, copy=False)
+        if self.src_rate == self.dst_rate:
+            return pcm
+        self._received += len(pcm)
+        # Never run ahead of the length `resample_block` gives the input so far.
+        return self._resample(pcm, int(round(self._received * self.dst_rate / self.src_rate)))
+
+    def flush(self) -> np.ndarray:
+        """Return the samples still held back by the filter delay, and reset."""
+        if self.src_rate == self.dst_rate:
+            return np.zeros(0, np.float32)
+        target_length = int(round(self._received * self.dst_rate / self.src_rate))
+        # Output positions past the last input sample repeat it, as `np.interp` does in `resample_block`.
+        out = self._resample(np.zeros(self._delay, dtype=np.float32), target_length, past_end=True)
+        self.reset()
+        return out
+
+    def reset(self) -> None:
+        """Forget the stream so far, e.g. before starting another file."""
+        self._history = np.zeros(len(self._kernel) - 1 if self._kernel is not None else 0, dtype=np.float32)
+        self._last = 0.0
+        self._base = 0
+        self._received = 0
+        self._emitted = 0
+        # Filtered sample k corresponds to input sample k - delay.
+        self._position = float(self._delay)
+
+    def _resample(self, pcm: np.ndarray, limit: int, past_end: bool = False) -> np.ndarray:
+        if self._kernel is not None:
+            history = np.concatenate([self._history, pcm])
+            self._history = history[len(history) - len(self._kernel) + 1:]
+            pcm = np.convolve(history, self._kernel, mode="valid")
+        # `samples` holds filtered input from absolute index `self._base - 1`.
+        samples = np.concatenate([[self._last], pcm]) if self._base > 0 else pcm
+        first = self._base - 1 if self._base > 0 else 0
+        last = self._base + len(pcm) - 1
+        count = limit - self._emitted
+        if not past_end:
+            available = int(np.floor((last - self._position) / self._step)) + 1 if self._position <= last else 0
+            count = min(count, available)
+        if count <= 0 or len(samples) == 0:
+            out = np.zeros(0, np.float32)
+        else:
+            positions = self._position + np.arange(count) * self._step
+            out = np.interp(positions - first, np.arange(len(samples)), samples).astype(np.float32)
+            self._position += count * self._step
+            self._emitted += count
+        if len(pcm):
+            self._last = float(pcm[-1])
+            self._base += len(pcm)
+        return out
+
+
+class Upsampler2x:
+    """
+    Doubles the sample rate of a stream of int16 frames, e.g. 8 kHz telephone audio to 16 kHz.
+
+    Each output pair is the midpoint to the previous sample followed by the
+    sample itself. The last sample of a frame is carried into the next, so
+    frame boundaries join without a click.
+    """
+
+    def __init__(self):
+        self._previous = 0
+
+    def process(self, pcm: np.ndarray) -> np.ndarray:
+        """
+        Args:
+            pcm (np.ndarray): int16 samples at the input rate.
+
+        Returns:
+            np.ndarray: int16 samples at twice the rate.
+        """
+        if len(pcm) == 0:
+            return pcm
+        samples = pcm.astype(np.int32)
+        previous = np.empty_like(samples)
+        previous[0] = self._previous
+        previous[1:] = samples[:-1]
+        self._previous = int(samples[-1])
+        out = np.empty(2 * len(samples), dtype=np.int16)
+        out[0::2] = (previous + samples) // 2
+        out[1::2] = samples
+        return out
+
+    def reset(self) -> None:
+        """Forget the carried sample, e.g. at the start of a new stream."""
+        self._previous = 0
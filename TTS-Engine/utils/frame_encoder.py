@@ -0,0 +1,128 @@
+import io
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+import PIL.Image
+
+
+class FrameChangeDetector:
+    """
+    Decides whether a frame differs enough from the last one sent to be worth sending.
+
+    Each frame is box-averaged down to a small grayscale grid and compared
+    cell by cell with the grid of the last frame that was accepted. A cell
+    counts as changed when its mean brightness moved by more than
+    `cell_threshold`; the frame is accepted when at least `min_changed` of
+    the cells changed. Comparing against the last accepted frame, rather
+    than the previous one, means a slow change still gets through once it
+    has added up. A blinking cursor or sensor noise averages out inside a cell.
+    """
+
+    def __init__(self, grid: Tuple[int, int] = (64, 36), cell_threshold: int = 8, min_changed: float = 0.001):
+        """
+        Args:
+            grid (Tuple[int, int]): Columns and rows of the comparison grid.
+            cell_threshold (int): Mean brightness change (0-255) that marks a cell as changed.
+            min_changed (float): Share of changed cells that makes a frame new.
+        """
+        self.grid = grid
+        self.cell_threshold = cell_threshold
+        self.min_changed = min_changed
+        self.last_change = 1.0
+        self._reference: Optional[np.ndarray] = None
+
+    def check(self, img: PIL.Image.Image) -> bool:
+        """
+        Compare a frame with the last accepted one, and accept it if it changed.
+
+        Returns:
+            bool: True if the frame should be sent.
+        """
+        cells = np.asarray(img.resize(self.grid, PIL.Image.BOX).convert("L"), dtype=np.int16)
+        if self._reference is None:
+            self.last_change = 1.0
+        else:
+            self.last_change = float(np.mean(np.abs(cells - self._reference) > self.cell_threshold))
+            if self.last_change < self.min_changed:
+                return False
+        self._reference = cells
+        return True
+
+    def reset(self) -> None:
+        """Forget the reference frame, so the next frame is always accepted."""
+        self._reference = None
+
+
+class FrameEncoder:
+    """
+    Turns raw captured pixels into JPEG message payloads.
+
+    Frames are wrapped as PIL images straight from the capture's own buffer
+    (BGRA from a screen grab, BGR from a camera), with the channel swap done
+    by the JPEG encoder's raw decoder rather than a separate conversion pass.
+    With a `FrameChangeDetector`, frames that look the same as the last one
+    sent are dropped before any encoding work. Frames are scaled down to
+    `max_size` before encoding, and the output buffer is reused from frame
+    to frame. The payload carries the JPEG bytes as they are; the session
+    serializes them, so they are not base64-encoded here.
+    """
+
+    MIME_TYPE = "image/jpeg"
+
+    def __init__(self, max_size: int = 1024, quality: int = 75, detector: Optional[FrameChangeDetector] = None):
+        """
+        Args:
+            max_size (int): Longest side of the encoded image, in pixels.
+            quality (int): JPEG quality, 1-95.
+            detector (Optional[FrameChangeDetector]): Skips frames that did not change.
+        """
+        self.max_size = max_size
+        self.quality = quality
+        self.detector = detector
+        self._output = io.BytesIO()
+        self.frames = 0
+        self.skipped = 0
+        self.bytes_out = 0
+
+    def encode_bgra(self, pixels, size: Tuple[int, int]) -> Optional[Dict[str, Any]]:
+        """
+        Encode a screen grab.
+
+        Args:
+            pixels: Raw BGRA bytes, row by row (e.g. `mss` `ScreenShot.raw`).
+            size (Tuple[int, int]): Width and height.
+
+        Returns:
+            Optional[Dict[str, Any]]: {"mime_type": "image/jpeg", "data": bytes}, or None
+                                      if the detector found nothing new.
+        """
+        return self._encode(PIL.Image.frombuffer("RGB", size, pixels, "raw", "BGRX", 0, 1))
+
+    def encode_bgr(self, frame) -> Optional[Dict[str, Any]]:
+        """
+        Encode a camera frame.
+
+        Args:
+            frame: Contiguous height x width x 3 uint8 BGR array (e.g. from `cv2.VideoCapture.read`).
+
+        Returns:
+            Optional[Dict[str, Any]]: {"mime_type": "image/jpeg", "data": bytes}, or None
+                                      if the detector found nothing new.
+        """
+        height, width = frame.shape[:2]
+        return self._encode(PIL.Image.frombuffer("RGB", (width, height), frame, "raw", "BGR", 0, 1))
+
+    def _encode(self, img: PIL.Image.Image) -> Optional[Dict[str, Any]]:
+        if self.detector is not None and not self.detector.check(img):
+            self.skipped += 1
+            return None
+        # thumbnail() first reduces by whole factors, which is far cheaper than a full
+        # resample, and keeps the aspect ratio.
+        img.thumbnail((self.max_size, self.max_size))
+        self._output.seek(0)
+        self._output.truncate()
+        img.save(self._output, format="jpeg", quality=self.quality)
+        data = self._output.getvalue()
+        self.frames += 1
+        self.bytes_out += len(data)
+        return {"mime_type": self.MIME_TYPE, "data": data}
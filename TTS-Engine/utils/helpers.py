@@ -1,37 +1,35 @@
 import os
-import pygame
+from typing import Union, TYPE_CHECKING
+
 from core.logger import get_logger
 
+if TYPE_CHECKING:
+    from voice.text_to_speech.audio import AudioData
+
 logger = get_logger(__name__)
 
-def play_audio(file_path: str) -> None:
+def play_audio(audio: Union[str, "AudioData"]) -> None:
     """
-    Play an audio file using pygame.
-    
+    Play an audio file, or audio held in memory, and wait until it has finished.
+
+    Audio goes through the shared playback engine, so the output device stays
+    open between calls instead of being initialized and torn down each time.
+
     Args:
-        file_path (str): Path to the audio file to play.
-        
+        audio (str | AudioData): Path to the audio file to play, or in-memory
+                                 audio returned by a TTS provider.
+
     Raises:
         FileNotFoundError: If the audio file doesn't exist.
         Exception: If there's an error playing the audio.
     """
-    if not os.path.exists(file_path):
-        raise FileNotFoundError(f"Audio file not found: {file_path}")
-    
+    if isinstance(audio, str) and not os.path.exists(audio):
+        raise FileNotFoundError(f"Audio file not found: {audio}")
+
     try:
-        # Initialize pygame mixer
-        pygame.mixer.init()
-        
-        # Load and play the audio file
-        pygame.mixer.music.load(file_path)
-        pygame.mixer.music.play()
-        
-        # Wait for playback to finish
-        while pygame.mixer.music.get_busy():
-            pygame.time.Clock().tick(10)
-        
-        # Clean up pygame resources
-        pygame.mixer.quit()
+        # Import here to avoid circular imports
+        from voice.text_to_speech.playback import get_playback_engine
+        get_playback_engine().play(audio).wait()
     except Exception as e:
         logger.error(f"Error playing audio: {e}")
         raise Exception(f"Failed to play audio: {e}")
@@ -0,0 +1,145 @@
+import random
+import time
+from typing import Any, Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from core.logger import get_logger
+
+try:
+    import httpx
+except ImportError:  # HTTP/2 support is optional
+    httpx = None
+
+logger = get_logger(__name__)
+
+# Exceptions a PooledHTTPSession request can raise, whichever backend is in use.
+HTTP_ERRORS = (requests.exceptions.RequestException,) + ((httpx.HTTPError,) if httpx else ())
+
+
+class PooledHTTPSession:
+    """
+    A keep-alive HTTP session with timeouts and bounded retries.
+
+    One instance is meant to be owned by a provider for its whole lifetime so
+    that TCP and TLS handshakes are paid once instead of on every request.
+    Requests go through `requests.Session` by default; with `http2=True` and
+    `httpx[http2]` installed, an HTTP/2 `httpx.Client` is used instead.
+    """
+
+    RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+    def __init__(self,
+                 pool_size: int = 4,
+                 connect_timeout: float = 3.05,
+                 read_timeout: float = 20.0,
+                 max_retries: int = 2,
+                 backoff_factor: float = 0.25,
+                 http2: bool = False,
+                 headers: Optional[Dict[str, str]] = None):
+        """
+        Initialize the session.
+
+        Args:
+            pool_size (int): Maximum keep-alive connections kept per host.
+            connect_timeout (float): Seconds to wait for a connection to be established.
+            read_timeout (float): Seconds to wait for the server to send data.
+            max_retries (int): Retries after the first attempt on 5xx/429 responses
+                               and connection errors.
+            backoff_factor (float): Base delay in seconds; attempt n waits
+                                    backoff_factor * 2**n plus jitter.
+            http2 (bool): Prefer HTTP/2 via httpx when it is installed.
+            headers (Optional[Dict[str, str]]): Headers sent with every request.
+        """
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.http2 = False
+        self._client = None
+
+        if http2:
+            if httpx is None:
+                logger.warning("HTTP/2 requested but httpx is not installed; using HTTP/1.1 keep-alive.")
+            else:
+                try:
+                    self._client = httpx.Client(
+                        http2=True,
+                        headers=headers,
+                        timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+                        limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size),
+                    )
+                    self.http2 = True
+                except ImportError:
+                    logger.warning("HTTP/2 requested but the 'h2' package is missing; using HTTP/1.1 keep-alive.")
+
+        if self._client is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            if headers:
+                session.headers.update(headers)
+            self._client = session
+
+    def _is_retryable_error(self, error: Exception) -> bool:
+        if isinstance(error, requests.exceptions.ConnectionError):
+            return True
+        if httpx is not None and isinstance(error, (httpx.ConnectError, httpx.ConnectTimeout, httpx.RemoteProtocolError)):
+            return True
+        return False
+
+    def _sleep_before_retry(self, attempt: int) -> None:
+        delay = self.backoff_factor * (2 ** attempt)
+        time.sleep(delay + random.uniform(0, delay / 2))
+
+    def request(self, method: str, url: str, **kwargs: Any):
+        """
+        Send a request, retrying transient failures.
+
+        Args:
+            method (str): HTTP method.
+            url (str): Request URL.
+            **kwargs: Passed to the underlying client (json, data, headers, ...).
+
+        Returns:
+            The response of the last attempt. Callers still call raise_for_status().
+
+        Raises:
+            Exception: One of HTTP_ERRORS when every attempt failed to connect.
+        """
+        if not self.http2:
+            kwargs.setdefault("timeout", (self.connect_timeout, self.read_timeout))
+
+        for attempt in range(self.max_retries + 1):
+            try:
+                response = self._client.request(method, url, **kwargs)
+            except Exception as e:
+                if attempt < self.max_retries and self._is_retryable_error(e):
+                    logger.warning(f"{method} {url} failed ({e}); retrying ({attempt + 1}/{self.max_retries}).")
+                    self._sleep_before_retry(attempt)
+                    continue
+                raise
+
+            if response.status_code in self.RETRY_STATUSES and attempt < self.max_retries:
+                logger.warning(f"{method} {url} returned {response.status_code}; retrying ({attempt + 1}/{self.max_retries}).")
+                response.close()
+                self._sleep_before_retry(attempt)
+                continue
+            return response
+
+    def post(self, url: str, **kwargs: Any):
+        """Send a POST request. See `request`."""
+        return self.request("POST", url, **kwargs)
+
+    def get(self, url: str, **kwargs: Any):
+        """Send a GET request. See `request`."""
+        return self.request("GET", url, **kwargs)
+
+    def close(self) -> None:
+        """Close all pooled connections."""
+        try:
+            self._client.close()
+        except Exception as e:
+            logger.warning(f"Error closing HTTP session: {e}")
@@ -0,0 +1,150 @@
+import threading
+from typing import Any, Dict, Union
+
+import numpy as np
+
+
+class JitterBuffer:
+    """
+    A bounded playout buffer between a network stream and an audio callback.
+
+    The network side `write`s chunks as they arrive, at whatever irregular
+    pace; the device callback `read_into`s a preallocated array every period.
+    Playback starts only once `target_ms` of audio is buffered, which absorbs
+    arrival jitter, and the buffer never holds more than `max_ms`: on overrun
+    the oldest audio is dropped, so latency cannot creep up over a long
+    session. If the buffer runs dry mid-stream (an underrun) it outputs
+    silence and waits for the target depth again. `end_of_stream` marks the
+    end of a reply, so the tail plays out without waiting and draining to
+    empty is not counted as an underrun.
+
+    Storage is allocated once; `write` and `read_into` only copy samples.
+    """
+
+    def __init__(self, sample_rate: int, target_ms: int = 120, max_ms: int = 2000):
+        """
+        Args:
+            sample_rate (int): Rate of the int16 mono audio.
+            target_ms (int): Audio buffered before playback (re)starts.
+            max_ms (int): Most audio held; older audio is dropped beyond it.
+        """
+        if target_ms > max_ms:
+            raise ValueError("target_ms must not exceed max_ms.")
+        self.sample_rate = sample_rate
+        self.target = sample_rate * target_ms // 1000
+        self.capacity = max(1, sample_rate * max_ms // 1000)
+        self._data = np.zeros(self.capacity, dtype=np.int16)
+        self._read = 0
+        self._written = 0
+        self._playing = False
+        self._ended = False
+        self._lock = threading.Lock()
+
+        self.underruns = 0
+        self.overruns = 0
+        self.dropped_samples = 0
+        self.played_samples = 0
+        self.max_depth = 0
+
+    @property
+    def depth(self) -> int:
+        """Samples buffered and not yet played."""
+        return self._written - self._read
+
+    @property
+    def depth_ms(self) -> float:
+        return 1000.0 * self.depth / self.sample_rate
+
+    def write(self, pcm: Union[bytes, bytearray, memoryview, np.ndarray]) -> None:
+        """
+        Append received audio.
+
+        Args:
+            pcm: int16 samples, or raw little-endian 16-bit PCM bytes (viewed, not copied).
+        """
+        samples = np.frombuffer(pcm, dtype="<i2") if not isinstance(pcm, np.ndarray) else pcm
+        count = len(samples)
+        if count == 0:
+            return
+        with self._lock:
+            self._ended = False
+            excess = self.depth + count - self.capacity
+            if excess > 0:
+                # Drop the oldest audio rather than let latency grow.
+                self.overruns += 1
+                self.dropped_samples += excess
+                self._read += excess
+            kept = samples[-self.capacity:]
+            start = (self._written + count - len(kept)) % self.capacity
+            first = min(len(kept), self.capacity - start)
+            self._data[start:start + first] = kept[:first]
+            if first < len(kept):
+                self._data[:len(kept) - first] = kept[first:]
+            self._written += count
+            self.max_depth = max(self.max_depth, self.depth)
+
+    def read_into(self, out: np.ndarray) -> int:
+        """
+        Fill `out` with the next samples to play, padding with silence.
+
+        Meant to be called from the audio device callback with an array
+        allocated once, so playback allocates nothing per period.
+
+        Args:
+            out (np.ndarray): int16 array to fill completely.
+
+        Returns:
+            int: Samples of real audio written (the rest is silence).
+        """
+        wanted = len(out)
+        with self._lock:
+            depth = self.depth
+            if not self._playing and (depth >= self.target or (self._ended and depth > 0)):
+                self._playing = True
+            count = min(wanted, depth) if self._playing else 0
+            if count:
+                start = self._read % self.capacity
+                first = min(count, self.capacity - start)
+                out[:first] = self._data[start:start + first]
+                if first < count:
+                    out[first:count] = self._data[:count - first]
+                self._read += count
+                self.played_samples += count
+            if self._playing and count < wanted:
+                self._playing = False
+                if not self._ended:
+                    self.underruns += 1
+        out[count:] = 0
+        return count
+
+    def end_of_stream(self) -> None:
+        """Mark that no more audio follows for now; what is buffered plays out."""
+        with self._lock:
+            self._ended = True
+
+    def clear(self) -> int:
+        """
+        Drop everything buffered, e.g. when the listener interrupts.
+
+        Returns:
+            int: Samples dropped.
+        """
+        with self._lock:
+            dropped = self.depth
+            self._read = self._written
+            self._playing = False
+            self._ended = True
+            return dropped
+
+    def stats(self) -> Dict[str, Any]:
+        """Current depth and counters, in milliseconds where it applies."""
+        to_ms = 1000.0 / self.sample_rate
+        return {
+            "depth_ms": round(self.depth * to_ms, 1),
+            "target_ms": round(self.target * to_ms, 1),
+            "max_depth_ms": round(self.max_depth * to_ms, 1),
+            "underruns": self.underruns,
+            "overruns": self.overruns,
+            "dropped_ms": round(self.dropped_samples * to_ms, 1),
+            "played_ms": round(self.played_samples * to_ms, 1),
+        }
@@ -0,0 +1,226 @@
+import asyncio
+import time
+from typing import Any, AsyncContextManager, Callable, List, Optional, Sequence, Tuple
+
+from core.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class LiveConnection:
+    """
+    Keeps a realtime session connected across drops, and optionally one warm for the next conversation.
+
+    `connect(handle)` must return an async context manager that yields a
+    session, e.g. `client.aio.live.connect(...)` with the session resumption
+    handle put into the config (None starts a new session). The connection
+    follows the session's resumption updates through `observe`. After a
+    drop, `reconnect` opens a session with the latest handle, so the
+    conversation continues with its context. It retries with backoff and
+    falls back to a new session if the handle is refused.
+
+    With `standby`, `prepare_standby` opens a session ahead of time in the
+    background, and the next `start` takes it instead of paying the connect
+    latency. A standby older than `standby_max_age_s` is discarded. It must
+    be used on the event loop that opened it.
+    """
+
+    def __init__(self,
+                 connect: Callable[[Optional[str]], AsyncContextManager[Any]],
+                 standby: bool = False,
+                 standby_max_age_s: float = 300.0,
+                 retry_delays: Sequence[float] = (0.0, 0.5, 1.0, 2.0, 5.0),
+                 min_uptime_s: float = 5.0,
+                 close_timeout: float = 2.0):
+        """
+        Args:
+            connect (Callable[[Optional[str]], AsyncContextManager[Any]]): Opens a session,
+                resuming the one `handle` refers to.
+            standby (bool): Keep a session warm for the next conversation.
+            standby_max_age_s (float): Oldest standby session still used.
+            retry_delays (Sequence[float]): Seconds to wait before each connect attempt. Also
+                the backoff between reconnects when sessions keep dropping right away.
+            min_uptime_s (float): A session that dropped sooner than this counts as dropping right away.
+            close_timeout (float): Longest to wait for a dropped session to close.
+        """
+        self.connect = connect
+        self.standby = standby
+        self.standby_max_age_s = standby_max_age_s
+        self.retry_delays = tuple(retry_delays) or (0.0,)
+        self.min_uptime_s = min_uptime_s
+        self.close_timeout = close_timeout
+        self.handle: Optional[str] = None
+        self.session = None
+
+        self.connects = 0
+        self.reconnects = 0
+        self.resumed = 0
+        self.standby_hits = 0
+        self.go_aways = 0
+        self.reconnect_times: List[float] = []
+        self._connected_seconds = 0.0
+        self._quick_drops = 0
+        self._current: Optional[Tuple[AsyncContextManager[Any], float]] = None
+        self._standby_task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        """
+        Open the session for a new conversation, from the standby if one is warm.
+
+        Returns:
+            The session.
+        """
+        await self._close_current()
+        self.handle = None
+        started = time.perf_counter()
+        standby = await self._take_standby()
+        if standby is not None:
+            self.standby_hits += 1
+            context, self.session = standby
+        else:
+            context, self.session, _ = await self._connect(None)
+        self._current = (context, time.monotonic())
+        logger.info(f"Live session ready in {1000 * (time.perf_counter() - started):.0f} ms"
+                    f"{' (warm standby)' if standby is not None else ''}")
+        return self.session
+
+    async def reconnect(self):
+        """
+        Replace a dropped session, resuming it with the latest handle.
+
+        Returns:
+            The new session.
+
+        Raises:
+            ConnectionError: If no session could be opened.
+        """
+        started = time.perf_counter()
+        if self._current is not None and time.monotonic() - self._current[1] < self.min_uptime_s:
+            # Sessions keep dropping right after connecting: back off rather than hammer the server.
+            self._quick_drops += 1
+            await asyncio.sleep(self.retry_delays[min(self._quick_drops, len(self.retry_delays) - 1)])
+        else:
+            self._quick_drops = 0
+        await self._close_current()
+        context, self.session, resumed = await self._connect(self.handle)
+        self._current = (context, time.monotonic())
+        elapsed = time.perf_counter() - started
+        self.reconnects += 1
+        self.resumed += resumed
+        self.reconnect_times.append(elapsed)
+        logger.info(f"Live session reconnected in {1000 * elapsed:.0f} ms "
+                    f"({'resumed' if resumed else 'new session, context lost'}); {self.stats()}")
+        return self.session
+
+    def observe(self, message) -> bool:
+        """
+        Follow the session's control messages. Call it for every message received.
+
+        Returns:
+            bool: True if the server announced it will close the connection (GoAway);
+                  reconnect now rather than wait for the drop.
+        """
+        update = getattr(message, "session_resumption_update", None)
+        if update is not None and getattr(update, "resumable", False) and getattr(update, "new_handle", None):
+            self.handle = update.new_handle
+        go_away = getattr(message, "go_away", None)
+        if go_away is not None:
+            self.go_aways += 1
+            logger.info(f"Server closes the live connection in {getattr(go_away, 'time_left', None)}; reconnecting")
+            return True
+        return False
+
+    def prepare_standby(self) -> None:
+        """Start opening a session for the next conversation in the background, if enabled."""
+        if self.standby and self._standby_task is None:
+            self._standby_task = asyncio.create_task(self._open_standby(), name="LiveConnectionStandby")
+
+    async def close(self, keep_standby: bool = False) -> None:
+        """
+        Close the current session, and the standby unless `keep_standby`.
+        """
+        await self._close_current()
+        self.handle = None
+        if not keep_standby and self._standby_task is not None:
+            task, self._standby_task = self._standby_task, None
+            task.cancel()  # no effect if it already connected
+            try:
+                context, _, _ = await task
+            except (asyncio.CancelledError, Exception):
+                return
+            await self._exit(context)
+
+    def stats(self) -> dict:
+        """Connect and reconnect counts, resumptions, standby use, and reconnect time and frequency."""
+        times = self.reconnect_times
+        connected = self._connected_seconds
+        if self._current is not None:
+            connected += time.monotonic() - self._current[1]
+        return {
+            "connects": self.connects,
+            "reconnects": self.reconnects,
+            "resumed": self.resumed,
+            "go_aways": self.go_aways,
+            "standby_hits": self.standby_hits,
+            "reconnect_ms": round(1000 * sum(times) / len(times), 1) if times else 0.0,
+            "max_reconnect_ms": round(1000 * max(times), 1) if times else 0.0,
+            "reconnects_per_hour": round(3600 * self.reconnects / connected, 1) if connected > 0 else 0.0,
+        }
+
+    async def _connect(self, handle: Optional[str]) -> Tuple[AsyncContextManager[Any], Any, bool]:
+        last_error: Optional[Exception] = None
+        for delay in self.retry_delays:
+            if delay:
+                await asyncio.sleep(delay)
+            context = self.connect(handle)
+            try:
+                session = await context.__aenter__()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                last_error = e
+                logger.warning(f"Live connect failed{' (resuming)' if handle else ''}: {e}")
+                continue
+            self.connects += 1
+            return context, session, handle is not None
+        if handle is not None:
+            logger.warning("Could not resume the live session; starting a new one")
+            return await self._connect(None)
+        raise ConnectionError(f"Could not open a live session: {last_error}") from last_error
+
+    async def _open_standby(self) -> Tuple[AsyncContextManager[Any], Any, float]:
+        context, session, _ = await self._connect(None)
+        logger.info("Warm standby live session ready")
+        return context, session, time.monotonic()
+
+    async def _take_standby(self) -> Optional[Tuple[AsyncContextManager[Any], Any]]:
+        task, self._standby_task = self._standby_task, None
+        if task is None:
+            return None
+        try:
+            # Still connecting is fine: waiting for it is quicker than starting over.
+            context, session, opened = await task
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"Standby live session failed: {e}")
+            return None
+        if time.monotonic() - opened > self.standby_max_age_s:
+            await self._exit(context)
+            return None
+        return context, session
+
+    async def _close_current(self) -> None:
+        current, self._current = self._current, None
+        self.session = None
+        if current is not None:
+            context, opened = current
+            self._connected_seconds += time.monotonic() - opened
+            await self._exit(context)
+
+    async def _exit(self, context) -> None:
+        # A dropped connection can take a while to notice it is gone; do not wait on it.
+        try:
+            await asyncio.wait_for(context.__aexit__(None, None, None), self.close_timeout)
+        except Exception as e:
+            logger.debug(f"Error closing a live session: {e}")
@@ -0,0 +1,97 @@
+from typing import Optional
+
+import numpy as np
+
+
+class PCMRingBuffer:
+    """
+    A preallocated ring buffer of audio samples addressed by absolute position.
+
+    One producer (normally an audio callback) appends with `write`; any number
+    of consumers keep their own cursor and copy out ranges with `read`. Positions
+    count samples written since the last `clear`, so a consumer can tell when
+    data it wanted has already been overwritten. The producer never allocates
+    and never takes a lock: samples are stored before `total_written` advances,
+    so a reader never sees a range that is still being filled.
+    """
+
+    def __init__(self, capacity: int, dtype=np.int16):
+        """
+        Initialize the buffer.
+
+        Args:
+            capacity (int): Number of samples kept before the oldest are overwritten.
+            dtype: Sample type, int16 by default.
+        """
+        if capacity <= 0:
+            raise ValueError("capacity must be positive.")
+        self.capacity = capacity
+        self._data = np.zeros(capacity, dtype=dtype)
+        self._written = 0
+
+    @property
+    def total_written(self) -> int:
+        """Absolute position one past the newest sample."""
+        return self._written
+
+    @property
+    def oldest(self) -> int:
+        """Absolute position of the oldest sample still held."""
+        return max(0, self._written - self.capacity)
+
+    def __len__(self) -> int:
+        return self._written - self.oldest
+
+    def write(self, samples: np.ndarray) -> int:
+        """
+        Append samples, overwriting the oldest ones once the buffer is full.
+
+        Args:
+            samples (np.ndarray): 1-D samples of the buffer's dtype.
+
+        Returns:
+            int: The new `total_written` position.
+        """
+        count = len(samples)
+        # Only the newest `capacity` samples can survive this write.
+        kept = samples[-self.capacity:] if count > self.capacity else samples
+        start = (self._written + count - len(kept)) % self.capacity
+        first = min(len(kept), self.capacity - start)
+        self._data[start:start + first] = kept[:first]
+        if first < len(kept):
+            self._data[:len(kept) - first] = kept[first:]
+        self._written += count
+        return self._written
+
+    def read(self, start: int, end: Optional[int] = None) -> np.ndarray:
+        """
+        Copy out the samples between two absolute positions.
+
+        Args:
+            start (int): First position to read.
+            end (Optional[int]): One past the last position; defaults to `total_written`.
+
+        Returns:
+            np.ndarray: A copy of the requested samples.
+
+        Raises:
+            IndexError: If part of the range was overwritten or not written yet.
+        """
+        end = self._written if end is None else end
+        if start < self.oldest or end > self._written or start > end:
+            raise IndexError(f"Range [{start}, {end}) is outside the buffered [{self.oldest}, {self._written}).")
+        first_index = start % self.capacity
+        count = end - start
+        if first_index + count <= self.capacity:
+            return self._data[first_index:first_index + count].copy()
+        split = self.capacity - first_index
+        return np.concatenate((self._data[first_index:], self._data[:count - split]))
+
+    def latest(self, count: int) -> np.ndarray:
+        """Copy out the newest `count` samples (fewer if less is buffered)."""
+        end = self._written
+        return self.read(max(self.oldest, end - count), end)
+
+    def clear(self) -> None:
+        """Forget all samples and restart positions at zero. Storage is kept."""
+        self._written = 0
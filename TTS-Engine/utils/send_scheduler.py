@@ -0,0 +1,327 @@
+import asyncio
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Tuple
+
+import numpy as np
+
+from core.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Queued after the last upload of a stretch of speech so the server ends the user's turn
+# without waiting for silence that will never be sent.
+AUDIO_STREAM_END = {"audio_stream_end": True}
+
+
+class SendScheduler:
+    """
+    Multiplexes audio, text and video onto one realtime session.
+
+    Producers hand messages over with `put` (or `put_nowait`), like an
+    `asyncio.Queue`. Each message goes into a lane for its kind:
+    "audio/..." payloads and `AUDIO_STREAM_END` into the audio lane,
+    "image/..." payloads into the video lane, and strings or {"text": ...}
+    into the text lane. `run` sends from the lanes with strict priority,
+    audio first, then text, then video. A video frame is never started
+    while audio is waiting.
+
+    - Audio: small chunks are coalesced into one send. A send waits until
+      `min_audio_ms` has queued up, or the oldest chunk is `coalesce_ms` old.
+      A backlog is joined into sends of up to `max_send_ms`. Beyond
+      `max_audio_ms` queued, the oldest audio is dropped.
+    - Video: the lane holds `video_slots` frames. A newer frame replaces
+      the oldest, and a frame older than `max_video_age_s` is dropped
+      unsent. A send cannot be interrupted, so a frame holds audio back
+      for its whole transfer. A frame that would take longer than
+      `max_video_stall_ms` at the measured send rate is dropped, and no
+      frame is started for a while after an audio send that took longer
+      than that. `video_lost` counts the frames dropped after they were
+      accepted; a producer that skips unchanged frames should send the
+      next one regardless when it goes up.
+
+    A message whose send fails, or is cancelled because the connection
+    dropped, goes back to the head of its lane, so after a reconnect `run`
+    can continue on the new session without losing it. A message that
+    fails `max_send_attempts` times in a row is dropped instead, so one the
+    server keeps rejecting cannot force reconnect after reconnect. Message
+    count, bytes, drops and latency (from `put` to the end of the send) are
+    kept per kind; see `stats`. Anything with an async `send(input=...)`
+    method will do as the session, so a fake can stand in for the live one.
+    """
+
+    AUDIO = "audio"
+    TEXT = "text"
+    VIDEO = "video"
+    KINDS = (AUDIO, TEXT, VIDEO)
+
+    def __init__(self,
+                 sample_rate: int = 16000,
+                 min_audio_ms: int = 40,
+                 coalesce_ms: int = 20,
+                 max_send_ms: int = 500,
+                 max_audio_ms: int = 2000,
+                 congestion_ms: int = 200,
+                 video_slots: int = 1,
+                 max_video_age_s: float = 2.0,
+                 max_video_stall_ms: Optional[int] = None,
+                 max_send_attempts: int = 3,
+                 stats_interval: float = 30.0):
+        """
+        Args:
+            sample_rate (int): Rate of the 16-bit mono audio, to convert byte counts to time.
+            min_audio_ms (int): Audio worth sending on its own without waiting for more.
+            coalesce_ms (int): Longest a smaller audio chunk waits to be joined with the next.
+            max_send_ms (int): Most audio joined into one send.
+            max_audio_ms (int): Most audio queued; beyond it the oldest is dropped.
+            congestion_ms (int): Queued audio at which `congested` turns True.
+            video_slots (int): Frames the video lane holds.
+            max_video_age_s (float): Frames older than this are dropped unsent.
+            max_video_stall_ms (Optional[int]): Longest a frame may hold audio back.
+                Defaults to `coalesce_ms` plus `min_audio_ms`.
+            max_send_attempts (int): Failed sends of one message before it is dropped.
+            stats_interval (float): Seconds between stats log lines while running.
+        """
+        bytes_per_ms = sample_rate * 2 / 1000.0
+        self.bytes_per_ms = bytes_per_ms
+        self.min_audio_bytes = int(min_audio_ms * bytes_per_ms)
+        self.coalesce_s = coalesce_ms / 1000.0
+        self.max_send_bytes = int(max_send_ms * bytes_per_ms)
+        self.max_audio_bytes = int(max_audio_ms * bytes_per_ms)
+        self.congestion_bytes = int(congestion_ms * bytes_per_ms)
+        self.max_video_age_s = max_video_age_s
+        if max_video_stall_ms is None:
+            max_video_stall_ms = coalesce_ms + min_audio_ms
+        self.max_video_stall_s = max_video_stall_ms / 1000.0
+        self.max_send_attempts = max(1, max_send_attempts)
+        self.stats_interval = stats_interval
+
+        # Lane entries are (message, put time); audio entries are (bytes or None for stream end,
+        # put time, mime type).
+        self._audio: Deque[Tuple[Optional[Any], float, str]] = deque()
+        self._audio_bytes = 0
+        self._text: Deque[Tuple[Any, float]] = deque()
+        self._video: Deque[Tuple[Any, float]] = deque(maxlen=max(1, video_slots))
+        self._wakeup = asyncio.Event()
+        # Bytes per second the session's sends have been taking, once measured.
+        self._send_rate: Optional[float] = None
+        # No frame starts before this, after an audio send took longer than a frame may stall it.
+        self._video_hold_until = 0.0
+        self.video_lost = 0
+        # Consecutive failed sends of the message at the head of each lane.
+        self._failures = {kind: 0 for kind in self.KINDS}
+        self._stats = {kind: {"messages": 0, "bytes": 0, "dropped": 0, "latency_sum": 0.0, "latency_max": 0.0}
+                       for kind in self.KINDS}
+        # Latencies of the most recent sends of each kind, for percentiles.
+        self._latencies: Dict[str, Deque[float]] = {kind: deque(maxlen=1000) for kind in self.KINDS}
+
+    @property
+    def audio_backlog_ms(self) -> float:
+        """Audio queued and not yet sent, in milliseconds."""
+        return self._audio_bytes / self.bytes_per_ms
+
+    @property
+    def congested(self) -> bool:
+        """True while audio is backing up, a hint for producers of optional traffic to slow down."""
+        return self._audio_bytes >= self.congestion_bytes
+
+    async def put(self, msg) -> None:
+        """Queue a message; never blocks, so it can replace `asyncio.Queue.put`."""
+        self.put_nowait(msg)
+
+    def put_nowait(self, msg) -> bool:
+        """
+        Queue a message.
+
+        Args:
+            msg: {"data": ..., "mime_type": ...}, `AUDIO_STREAM_END`, a string or {"text": ...}.
+
+        Returns:
+            bool: True if older queued data of the same kind was dropped to make room.
+        """
+        now = time.perf_counter()
+        dropped = False
+        if isinstance(msg, str):
+            self._text.append(({"text": msg}, now))
+        elif msg.get("audio_stream_end"):
+            self._audio.append((None, now, ""))
+        elif "text" in msg:
+            self._text.append((msg, now))
+        elif str(msg.get("mime_type", "")).startswith("image/"):
+            if len(self._video) == self._video.maxlen:
+                self._stats[self.VIDEO]["dropped"] += 1
+                dropped = True
+            self._video.append((msg, now))
+        else:
+            data = bytes(msg["data"])
+            self._audio.append((data, now, msg.get("mime_type", "audio/pcm")))
+            self._audio_bytes += len(data)
+            while self._audio_bytes > self.max_audio_bytes:
+                if self._drop_oldest_audio():
+                    dropped = True
+                else:
+                    break
+        self._wakeup.set()
+        return dropped
+
+    async def run(self, session) -> None:
+        """Send queued messages to `session` until cancelled."""
+        last_log = time.perf_counter()
+        while True:
+            kind, msg, queued_at = await self._next()
+            started = time.perf_counter()
+            try:
+                await self._send(session, kind, msg)
+            except asyncio.CancelledError:
+                # The link task was cancelled mid-send after the connection dropped: not the
+                # message's fault, keep it for the session that replaces this one.
+                self._requeue(kind, msg, queued_at)
+                raise
+            except Exception as e:
+                self._failures[kind] += 1
+                if self._failures[kind] < self.max_send_attempts:
+                    self._requeue(kind, msg, queued_at)
+                else:
+                    self._failures[kind] = 0
+                    self._stats[kind]["dropped"] += 1
+                    if kind == self.VIDEO:
+                        self.video_lost += 1
+                    logger.warning(f"Dropped a {kind} message after {self.max_send_attempts} failed sends: {e}")
+                raise
+            self._failures[kind] = 0
+            now = time.perf_counter()
+            stats = self._stats[kind]
+            latency = now - queued_at
+            size = len(msg.get("data", b"")) if isinstance(msg, dict) else 0
+            stats["messages"] += 1
+            stats["bytes"] += size
+            stats["latency_sum"] += latency
+            stats["latency_max"] = max(stats["latency_max"], latency)
+            self._latencies[kind].append(latency)
+            if size and now > started:
+                rate = size / (now - started)
+                self._send_rate = rate if self._send_rate is None else 0.7 * self._send_rate + 0.3 * rate
+            if kind == self.AUDIO and latency > self.max_video_stall_s:
+                self._video_hold_until = now + self.max_video_stall_s
+            if now - last_log >= self.stats_interval:
+                last_log = now
+                logger.info(f"Send scheduler: {self.stats()}")
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Per kind: messages and bytes sent, messages dropped, and latency in ms: the
+        mean and max over the whole run, and the 95th percentile over recent sends.
+        """
+        report = {}
+        for kind, stats in self._stats.items():
+            sent = stats["messages"]
+            recent = self._latencies[kind]
+            report[kind] = {
+                "messages": sent,
+                "bytes": stats["bytes"],
+                "dropped": stats["dropped"],
+                "latency_ms": round(1000.0 * stats["latency_sum"] / sent, 1) if sent else 0.0,
+                "p95_latency_ms": round(1000.0 * float(np.percentile(recent, 95)), 1) if recent else 0.0,
+                "max_latency_ms": round(1000.0 * stats["latency_max"], 1),
+            }
+        return report
+
+    async def _next(self) -> Tuple[str, Any, float]:
+        while True:
+            timeout = None
+            if self._audio:
+                wait = self._audio_wait()
+                if wait <= 0:
+                    return self._take_audio()
+                timeout = wait  # hold back everything else while audio coalesces
+            elif self._text:
+                msg, queued_at = self._text.popleft()
+                return self.TEXT, msg, queued_at
+            elif self._video:
+                msg, queued_at = self._video[0]
+                now = time.perf_counter()
+                if now - queued_at > self.max_video_age_s or self._too_slow(msg):
+                    self._video.popleft()
+                    self._drop_video()
+                    continue
+                if now >= self._video_hold_until:
+                    self._video.popleft()
+                    return self.VIDEO, msg, queued_at
+                # Audio was late just now: leave the link to it for a moment.
+                timeout = self._video_hold_until - now
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    def _audio_wait(self) -> float:
+        # Seconds until the head of the audio lane is due.
+        queued = 0
+        for data, _, _ in self._audio:
+            if data is None:
+                return 0.0  # the stream ends here; send what there is
+            queued += len(data)
+            if queued >= self.min_audio_bytes:
+                return 0.0
+        return self._audio[0][1] + self.coalesce_s - time.perf_counter()
+
+    def _take_audio(self) -> Tuple[str, Any, float]:
+        data, queued_at, mime_type = self._audio.popleft()
+        if data is None:
+            return self.AUDIO, AUDIO_STREAM_END, queued_at
+        chunks = [data]
+        size = len(data)
+        while self._audio:
+            next_data, _, next_mime = self._audio[0]
+            if next_data is None or next_mime != mime_type or size + len(next_data) > self.max_send_bytes:
+                break
+            self._audio.popleft()
+            chunks.append(next_data)
+            size += len(next_data)
+        self._audio_bytes -= size
+        return self.AUDIO, {"data": b"".join(chunks), "mime_type": mime_type}, queued_at
+
+    def _too_slow(self, msg) -> bool:
+        # Whether sending the frame at the measured rate would hold audio back too long.
+        if self._send_rate is None:
+            return False
+        return len(msg.get("data", b"")) / self._send_rate > self.max_video_stall_s
+
+    def _drop_video(self) -> None:
+        self._stats[self.VIDEO]["dropped"] += 1
+        self.video_lost += 1
+
+    def _requeue(self, kind: str, msg, queued_at: float) -> None:
+        if kind == self.AUDIO:
+            if msg is AUDIO_STREAM_END:
+                self._audio.appendleft((None, queued_at, ""))
+            else:
+                self._audio.appendleft((msg["data"], queued_at, msg["mime_type"]))
+                self._audio_bytes += len(msg["data"])
+        elif kind == self.TEXT:
+            self._text.appendleft((msg, queued_at))
+        elif len(self._video) < self._video.maxlen:
+            self._video.appendleft((msg, queued_at))
+        else:
+            self._drop_video()  # a newer frame took its place
+
+    def _drop_oldest_audio(self) -> bool:
+        for index, (data, _, _) in enumerate(self._audio):
+            if data is not None:
+                del self._audio[index]
+                self._audio_bytes -= len(data)
+                self._stats[self.AUDIO]["dropped"] += 1
+                return True
+        return False
+
+    async def _send(self, session, kind: str, msg) -> None:
+        if msg is AUDIO_STREAM_END:
+            # Only newer sessions understand it; older ones end the turn from the silence alone.
+            send_realtime_input = getattr(session, "send_realtime_input", None)
+            if send_realtime_input is not None:
+                await send_realtime_input(audio_stream_end=True)
+        elif kind == self.TEXT:
+            await session.send(input=msg["text"], end_of_turn=True)
+        else:
+            await session.send(input=msg)
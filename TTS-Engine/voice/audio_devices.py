@@ -0,0 +1,610 @@
+import atexit
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from core.logger import get_logger
+from utils.ring_buffer import PCMRingBuffer
+
+logger = get_logger(__name__)
+
+# Called from the PortAudio thread with each captured int16 period and whether the device overflowed.
+InputCallback = Callable[[np.ndarray, bool], None]
+# Fills an int16 array with the next samples to play and returns how many were real audio.
+OutputSource = Callable[[np.ndarray], int]
+
+
+def _default_backend():
+    # Imported lazily so the manager can be driven by a fake PortAudio module on
+    # machines without it.
+    import pyaudio
+    return pyaudio
+
+
+class InputTap:
+    """
+    One consumer of a shared input stream.
+
+    A tap has its own cursor into the stream's ring buffer. Read it like a
+    blocking PyAudio stream with `read`, or pass a callback to
+    `AudioDeviceManager.open_input` to be handed every period as it is
+    captured. `close` releases the tap; the device stays open for the other
+    consumers.
+    """
+
+    def __init__(self, stream: "_SharedInput", start: int, callback: Optional[InputCallback]):
+        self._stream = stream
+        self.cursor = start
+        self.callback = callback
+        self.overruns = 0
+        self.closed = False
+
+    @property
+    def sample_rate(self) -> int:
+        """Rate of the stream the tap reads from."""
+        return self._stream.sample_rate
+
+    def read(self, frames: int, timeout: Optional[float] = None) -> bytes:
+        """
+        Wait for the next `frames` samples and return them as int16 bytes.
+
+        Args:
+            frames (int): Samples to read.
+            timeout (Optional[float]): Longest to wait, in seconds.
+
+        Raises:
+            EOFError: If the tap or the manager was closed, or the device was lost
+                and could not be reopened.
+            TimeoutError: If the audio did not arrive in time.
+        """
+        return self.read_array(frames, timeout).tobytes()
+
+    def read_array(self, frames: int, timeout: Optional[float] = None) -> np.ndarray:
+        """Like `read`, returning an int16 array."""
+        buffer = self._stream.buffer
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._stream.new_audio:
+                while buffer.total_written < self.cursor + frames:
+                    if self.closed:
+                        if self._stream.failed:
+                            raise EOFError("Input device was lost and could not be reopened.")
+                        raise EOFError("Input tap closed.")
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        raise TimeoutError(f"No audio from input device within {timeout} s.")
+                    self._stream.new_audio.wait(remaining)
+            if self.cursor < buffer.oldest:
+                self._skip_lost()
+                continue
+            chunk = buffer.read(self.cursor, self.cursor + frames)
+            if self.cursor < buffer.oldest:
+                continue  # overwritten while it was being copied
+            self.cursor += frames
+            return chunk
+
+    def discard(self) -> None:
+        """Skip the audio captured but not read yet, so the next read starts with new audio."""
+        with self._stream.new_audio:
+            self.cursor = self._stream.buffer.total_written
+
+    def close(self) -> None:
+        """Stop consuming. The device closes once no tap has used it for a while."""
+        if not self.closed:
+            self._stream.manager._release_input(self)
+
+    def _skip_lost(self) -> None:
+        self.overruns += 1
+        logger.warning(f"Input tap fell behind; skipped {self._stream.buffer.oldest - self.cursor} samples")
+        self.cursor = self._stream.buffer.oldest
+
+
+class OutputHandle:
+    """One source mixed into a shared output stream; `close` removes it."""
+
+    def __init__(self, stream: "_SharedOutput", source: OutputSource):
+        self._stream = stream
+        self.source = source
+        self.closed = False
+
+    def close(self) -> None:
+        """Stop playing this source. The device closes once no source has used it for a while."""
+        if not self.closed:
+            self._stream.manager._release_output(self)
+
+
+class ManagedOutputStream:
+    """
+    A sounddevice-style output stream that plays through the device manager.
+
+    `PlaybackEngine` opens its output as a stream whose callback fills
+    float32 blocks shaped (frames, channels). This adapter hands that
+    callback to the manager as one more source of the shared output stream
+    at its rate, so playback runs on the same PortAudio context as the
+    microphone rather than a second audio stack.
+    """
+
+    def __init__(self, manager: "AudioDeviceManager", samplerate: int, channels: int, callback: Callable,
+                 device_index: Optional[int] = None):
+        """
+        Args:
+            manager (AudioDeviceManager): Manager owning the device.
+            samplerate (int): Playback rate.
+            channels (int): Channels the callback fills; they are mixed down to mono.
+            callback (Callable): Called as callback(outdata, frames, time_info, status).
+            device_index (Optional[int]): Device to play on; None for the default.
+        """
+        self.manager = manager
+        self.samplerate = samplerate
+        self.channels = channels
+        self.callback = callback
+        self.device_index = device_index
+        self._block = np.zeros((0, channels), dtype=np.float32)
+        self._handle: Optional[OutputHandle] = None
+
+    def start(self) -> None:
+        if self._handle is None:
+            self._handle = self.manager.open_output(self.samplerate, self._fill, self.device_index)
+
+    def stop(self) -> None:
+        handle, self._handle = self._handle, None
+        if handle is not None:
+            handle.close()
+
+    def close(self) -> None:
+        self.stop()
+
+    def _fill(self, out: np.ndarray) -> int:
+        if len(self._block) != len(out):
+            self._block = np.zeros((len(out), self.channels), dtype=np.float32)
+        self.callback(self._block, len(out), None, None)
+        mono = self._block[:, 0] if self.channels == 1 else self._block.mean(axis=1)
+        out[:] = np.clip(mono, -1.0, 1.0) * 32767.0
+        return len(out)
+
+
+class _SharedStream:
+    # State common to shared input and output streams: the PortAudio stream, its
+    # consumers, since when it has had none and whether it was given up on.
+
+    def __init__(self, manager: "AudioDeviceManager", sample_rate: int, device_index: Optional[int]):
+        self.manager = manager
+        self.sample_rate = sample_rate
+        self.device_index = device_index
+        self.frames_per_buffer = max(1, sample_rate * manager.period_ms // 1000)
+        self.stream = None
+        self.users: Tuple = ()
+        self.last_callback = 0.0
+        self.idle_since: Optional[float] = None
+        self.failed = False
+
+
+class _SharedInput(_SharedStream):
+
+    def __init__(self, manager: "AudioDeviceManager", sample_rate: int, device_index: Optional[int]):
+        super().__init__(manager, sample_rate, device_index)
+        self.buffer = PCMRingBuffer(int(sample_rate * manager.buffer_seconds))
+        self.new_audio = threading.Condition()
+        self.overflows = 0
+
+    def open_kwargs(self) -> Dict[str, Any]:
+        return {"input": True, "input_device_index": self.device_index, "stream_callback": self.on_input}
+
+    def on_input(self, in_data, frame_count, time_info, status):
+        backend = self.manager.backend
+        overflowed = bool(status & backend.paInputOverflow)
+        self.overflows += overflowed
+        self.last_callback = time.monotonic()
+        samples = np.frombuffer(in_data, dtype=np.int16)
+        self.buffer.write(samples)
+        # `users` is replaced, never mutated, so it can be read here without the manager's lock.
+        for tap in self.users:
+            if tap.callback is not None:
+                try:
+                    tap.callback(samples, overflowed)
+                except Exception as e:
+                    logger.error(f"Error in input callback: {e}")
+        with self.new_audio:
+            self.new_audio.notify_all()
+        return (None, backend.paContinue)
+
+
+class _SharedOutput(_SharedStream):
+
+    def __init__(self, manager: "AudioDeviceManager", sample_rate: int, device_index: Optional[int]):
+        super().__init__(manager, sample_rate, device_index)
+        self._out = np.zeros(self.frames_per_buffer, dtype=np.int16)
+        self._part = np.zeros(self.frames_per_buffer, dtype=np.int16)
+        self._mix = np.zeros(self.frames_per_buffer, dtype=np.int32)
+
+    def open_kwargs(self) -> Dict[str, Any]:
+        return {"output": True, "output_device_index": self.device_index, "stream_callback": self.on_output}
+
+    def on_output(self, in_data, frame_count, time_info, status):
+        self.last_callback = time.monotonic()
+        if frame_count != len(self._out):
+            self._out = np.zeros(frame_count, dtype=np.int16)
+            self._part = np.zeros(frame_count, dtype=np.int16)
+            self._mix = np.zeros(frame_count, dtype=np.int32)
+        out = self._out
+        sources = self.users
+        if len(sources) == 1:
+            self._fill(sources[0], out)
+        else:
+            # Several sources play at once: sum them, clipping rather than wrapping around.
+            self._mix[:] = 0
+            for handle in sources:
+                if self._fill(handle, self._part):
+                    self._mix += self._part
+            np.clip(self._mix, -32768, 32767, out=self._mix)
+            out[:] = self._mix
+        return (out.tobytes(), self.manager.backend.paContinue)
+
+    @staticmethod
+    def _fill(handle: OutputHandle, out: np.ndarray) -> int:
+        try:
+            return handle.source(out)
+        except Exception as e:
+            logger.error(f"Error in output source: {e}")
+            out[:] = 0
+            return 0
+
+
+class AudioDeviceManager:
+    """
+    One PortAudio context and one stream per device for the whole process.
+
+    Initializing PortAudio probes every host API and device, and opening a
+    stream takes the device from idle; both cost far more than a turn of
+    conversation can spare. The manager does each once. The context is
+    created on first use and kept until the process exits, and each
+    (device, rate) gets a single shared stream, reference counted by its
+    consumers:
+
+    - Input: the stream records into a ring buffer. Every consumer opens an
+      `InputTap` with its own cursor, which it reads like a blocking stream
+      or is handed each period through a callback. Wake word detection,
+      speech recognition and a live dialog can all listen at once, and
+      handing the microphone from one to the next is a new cursor, not a
+      device reopen.
+    - Output: sources are mixed into one callback stream.
+
+    A stream whose last consumer left stays open for `linger_s`, so
+    consumers that take turns do not reopen it; a watchdog thread closes it
+    after that. The watchdog also notices a stream that stopped delivering
+    (the device was unplugged) and calls `refresh`,
+    which re-enumerates the devices and reopens every stream on the current
+    default device; consumers keep their taps and handles throughout. A
+    refresh interrupts every stream, so while streams keep stalling the
+    watchdog waits longer between refreshes, up to `max_refresh_backoff_s`.
+    A stream that cannot be reopened at all is given up on: its taps raise
+    EOFError and its handles are closed. Call `refresh` directly after
+    plugging a new device in, since PortAudio only sees devices present
+    when it was initialized.
+    """
+
+    def __init__(self,
+                 period_ms: int = 20,
+                 buffer_seconds: float = 10.0,
+                 linger_s: float = 10.0,
+                 watch_interval_s: float = 2.0,
+                 stall_s: float = 1.0,
+                 max_refresh_backoff_s: float = 60.0,
+                 backend: Optional[Any] = None):
+        """
+        Args:
+            period_ms (int): Audio per device callback; smaller lowers latency.
+            buffer_seconds (float): Input kept for taps that fall behind and for pre-roll.
+            linger_s (float): How long a stream stays open after its last consumer leaves
+                (to within `watch_interval_s`).
+            watch_interval_s (float): Seconds between watchdog checks.
+            stall_s (float): An open stream without a callback for this long counts as lost.
+            max_refresh_backoff_s (float): Longest wait between watchdog refreshes while
+                streams keep stalling.
+            backend (Optional[Any]): The `pyaudio` module, or a fake with the same interface.
+        """
+        self.period_ms = period_ms
+        self.buffer_seconds = buffer_seconds
+        self.linger_s = linger_s
+        self.watch_interval_s = watch_interval_s
+        self.stall_s = stall_s
+        self.max_refresh_backoff_s = max_refresh_backoff_s
+        self._refresh_backoff = 0.0
+        self._next_refresh = 0.0
+        self._backend = backend
+        self._pa = None
+        self._devices: Optional[List[Dict[str, Any]]] = None
+        self._inputs: Dict[Tuple[Optional[int], int], _SharedInput] = {}
+        self._outputs: Dict[Tuple[Optional[int], int], _SharedOutput] = {}
+        self._lock = threading.RLock()
+        self._closed = threading.Event()
+        self._watchdog: Optional[threading.Thread] = None
+
+        self.contexts = 0
+        self.streams_opened = 0
+        self.reused = 0
+        self.refreshes = 0
+
+    @property
+    def backend(self):
+        """The `pyaudio` module (or the fake standing in for it)."""
+        if self._backend is None:
+            self._backend = _default_backend()
+        return self._backend
+
+    @property
+    def pyaudio(self):
+        """The shared PortAudio context, created on first use. Never terminate it."""
+        with self._lock:
+            if self._pa is None:
+                started = time.perf_counter()
+                self._pa = self.backend.PyAudio()
+                self.contexts += 1
+                logger.info(f"PortAudio initialized in {1000 * (time.perf_counter() - started):.0f} ms")
+            return self._pa
+
+    def devices(self) -> List[Dict[str, Any]]:
+        """Device info of every device found at the last (re-)enumeration."""
+        with self._lock:
+            if self._devices is None:
+                pa = self.pyaudio
+                self._devices = [pa.get_device_info_by_index(index) for index in range(pa.get_device_count())]
+            return list(self._devices)
+
+    def open_input(self,
+                   sample_rate: int = 16000,
+                   callback: Optional[InputCallback] = None,
+                   device_index: Optional[int] = None,
+                   pre_roll_ms: int = 0) -> InputTap:
+        """
+        Start consuming 16-bit mono audio from an input device.
+
+        Args:
+            sample_rate (int): Capture rate; consumers at the same rate share a stream.
+            callback (Optional[InputCallback]): Called from the device thread with every
+                captured period. Keep it short; it must not block.
+            device_index (Optional[int]): Device to record from; None for the default.
+            pre_roll_ms (int): Audio captured before the call to start from, when the
+                stream was already open.
+
+        Returns:
+            InputTap: The tap, positioned at the newest audio (less the pre-roll).
+        """
+        with self._lock:
+            shared = self._acquire(self._inputs, _SharedInput, sample_rate, device_index)
+            buffer = shared.buffer
+            start = max(buffer.oldest, buffer.total_written - sample_rate * pre_roll_ms // 1000)
+            tap = InputTap(shared, start, callback)
+            shared.users = shared.users + (tap,)
+            return tap
+
+    def open_output(self,
+                    sample_rate: int,
+                    source: OutputSource,
+                    device_index: Optional[int] = None) -> OutputHandle:
+        """
+        Start playing 16-bit mono audio on an output device.
+
+        Args:
+            sample_rate (int): Playback rate; sources at the same rate share a stream and are mixed.
+            source (OutputSource): Fills each period from the device thread, e.g.
+                `JitterBuffer.read_into`. It must not block.
+            device_index (Optional[int]): Device to play on; None for the default.
+
+        Returns:
+            OutputHandle: Close it to stop playing the source.
+        """
+        with self._lock:
+            shared = self._acquire(self._outputs, _SharedOutput, sample_rate, device_index)
+            handle = OutputHandle(shared, source)
+            shared.users = shared.users + (handle,)
+            return handle
+
+    def refresh(self) -> None:
+        """
+        Re-enumerate the devices and reopen every stream.
+
+        PortAudio is terminated and initialized again, which is the only way
+        it picks up devices added or removed since. Streams opened on the
+        default device move to the current default; a stream whose device is
+        gone falls back to the default. Taps and handles stay valid, except
+        on a stream that cannot be reopened: it is given up on, its taps
+        raise EOFError and its handles are closed.
+        """
+        with self._lock:
+            if self._closed.is_set():
+                return
+            streams = list(self._inputs.values()) + list(self._outputs.values())
+            for shared in streams:
+                self._close_stream(shared)
+            if self._pa is not None:
+                try:
+                    self._pa.terminate()
+                except Exception as e:
+                    logger.error(f"Error terminating PortAudio: {e}")
+                self._pa = None
+            self._devices = None
+            self.refreshes += 1
+            names = [device.get("name") for device in self.devices()]
+            logger.info(f"Audio devices re-enumerated: {names}")
+            for shared in streams:
+                if shared.device_index is not None and shared.device_index >= len(names):
+                    logger.warning(f"Audio device {shared.device_index} is gone; using the default device")
+                    shared.device_index = None
+                self._open_stream(shared)
+                if shared.stream is None:
+                    self._fail_stream(shared)
+
+    def stats(self) -> Dict[str, Any]:
+        """PortAudio inits, streams opened and reused, refreshes, open streams, consumers and overflows."""
+        with self._lock:
+            streams = list(self._inputs.values()) + list(self._outputs.values())
+            return {
+                "contexts": self.contexts,
+                "streams_opened": self.streams_opened,
+                "reused": self.reused,
+                "refreshes": self.refreshes,
+                "open_streams": sum(1 for shared in streams if shared.stream is not None),
+                "consumers": sum(len(shared.users) for shared in streams),
+                "input_overflows": sum(shared.overflows for shared in self._inputs.values()),
+            }
+
+    def close(self) -> None:
+        """Close every stream and terminate PortAudio. Open taps raise EOFError."""
+        with self._lock:
+            if self._closed.is_set():
+                return
+            self._closed.set()
+            for shared in list(self._inputs.values()) + list(self._outputs.values()):
+                for user in shared.users:
+                    user.closed = True
+                self._close_stream(shared)
+                if isinstance(shared, _SharedInput):
+                    with shared.new_audio:
+                        shared.new_audio.notify_all()
+            self._inputs.clear()
+            self._outputs.clear()
+            if self._pa is not None:
+                try:
+                    self._pa.terminate()
+                except Exception as e:
+                    logger.error(f"Error terminating PortAudio: {e}")
+                self._pa = None
+        logger.info("Audio device manager closed.")
+
+    def _acquire(self, streams: Dict, stream_type, sample_rate: int, device_index: Optional[int]):
+        if self._closed.is_set():
+            raise RuntimeError("Audio device manager is closed.")
+        key = (device_index, sample_rate)
+        shared = streams.get(key)
+        if shared is None:
+            shared = streams[key] = stream_type(self, sample_rate, device_index)
+        shared.idle_since = None
+        if shared.stream is None:
+            self._open_stream(shared)
+            if shared.stream is None:
+                del streams[key]
+                raise OSError(f"Could not open audio device {device_index if device_index is not None else '(default)'}")
+        else:
+            self.reused += 1
+        return shared
+
+    def _open_stream(self, shared: _SharedStream) -> None:
+        backend = self.backend
+        started = time.perf_counter()
+        try:
+            shared.stream = self.pyaudio.open(format=backend.paInt16, channels=1, rate=shared.sample_rate,
+                                              frames_per_buffer=shared.frames_per_buffer, **shared.open_kwargs())
+        except Exception as e:
+            logger.error(f"Failed to open audio stream at {shared.sample_rate} Hz: {e}")
+            shared.stream = None
+            return
+        shared.last_callback = time.monotonic()
+        self.streams_opened += 1
+        kind = "input" if isinstance(shared, _SharedInput) else "output"
+        logger.info(f"Opened shared {kind} stream at {shared.sample_rate} Hz "
+                    f"in {1000 * (time.perf_counter() - started):.0f} ms")
+        self._start_watchdog()
+
+    def _close_stream(self, shared: _SharedStream) -> None:
+        stream, shared.stream = shared.stream, None
+        if stream is None:
+            return
+        try:
+            if stream.is_active():
+                stream.stop_stream()
+            stream.close()
+        except Exception as e:
+            logger.error(f"Error closing audio stream: {e}")
+
+    def _fail_stream(self, shared: _SharedStream) -> None:
+        shared.failed = True
+        users, shared.users = shared.users, ()
+        for user in users:
+            user.closed = True
+        streams = self._inputs if isinstance(shared, _SharedInput) else self._outputs
+        for key, other in list(streams.items()):
+            if other is shared:
+                del streams[key]
+        if isinstance(shared, _SharedInput):
+            with shared.new_audio:
+                shared.new_audio.notify_all()
+        logger.error(f"Gave up on the audio stream at {shared.sample_rate} Hz; closed its {len(users)} consumer(s)")
+
+    def _release_input(self, tap: InputTap) -> None:
+        self._release(tap)
+        with tap._stream.new_audio:
+            tap._stream.new_audio.notify_all()
+
+    def _release_output(self, handle: OutputHandle) -> None:
+        self._release(handle)
+
+    def _release(self, user) -> None:
+        with self._lock:
+            user.closed = True
+            shared = user._stream
+            shared.users = tuple(other for other in shared.users if other is not user)
+            if not shared.users:
+                shared.idle_since = time.monotonic()
+
+    def _close_idle(self, now: float) -> None:
+        for streams in (self._inputs, self._outputs):
+            for key, shared in list(streams.items()):
+                if not shared.users and shared.idle_since is not None and now - shared.idle_since >= self.linger_s:
+                    self._close_stream(shared)
+                    del streams[key]
+                    logger.info(f"Closed idle audio stream at {shared.sample_rate} Hz")
+
+    def _start_watchdog(self) -> None:
+        if self._watchdog is None or not self._watchdog.is_alive():
+            self._watchdog = threading.Thread(target=self._watch, name="AudioDeviceWatchdog", daemon=True)
+            self._watchdog.start()
+
+    def _watch(self) -> None:
+        while not self._closed.wait(self.watch_interval_s):
+            with self._lock:
+                now = time.monotonic()
+                self._close_idle(now)
+                streams = [shared for shared in list(self._inputs.values()) + list(self._outputs.values())
+                           if shared.users]
+                if not streams:
+                    if not self._inputs and not self._outputs:
+                        self._watchdog = None
+                        return
+                    continue
+                lost = [shared for shared in streams if shared.stream is None or now - shared.last_callback > self.stall_s]
+                if not lost:
+                    self._refresh_backoff = 0.0
+                    continue
+                if now < self._next_refresh:
+                    continue
+                logger.warning(f"{len(lost)} audio stream(s) stopped delivering audio; re-enumerating devices")
+                try:
+                    self.refresh()
+                except Exception as e:
+                    logger.error(f"Audio device refresh failed: {e}")
+                # Back off in case the refresh did not help: every refresh interrupts the streams that work.
+                self._refresh_backoff = min(self.max_refresh_backoff_s,
+                                            2 * (self._refresh_backoff or self.watch_interval_s))
+                self._next_refresh = time.monotonic() + self._refresh_backoff
+
+
+_shared_manager: Optional[AudioDeviceManager] = None
+_shared_manager_lock = threading.Lock()
+
+
+def get_audio_device_manager() -> AudioDeviceManager:
+    """
+    Get the process-wide audio device manager, creating it on first use.
+
+    Returns:
+        AudioDeviceManager: The shared manager.
+    """
+    global _shared_manager
+    with _shared_manager_lock:
+        if _shared_manager is None:
+            _shared_manager = AudioDeviceManager()
+            atexit.register(_shared_manager.close)
+        return _shared_manager
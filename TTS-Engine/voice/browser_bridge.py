@@ -0,0 +1,204 @@
+import asyncio
+import json
+import queue
+import threading
+import time
+from typing import Any, Dict, Optional
+from urllib.parse import urlencode, urlsplit, urlunsplit
+
+from core.logger import get_logger
+from utils.async_tools import BackgroundEventLoop, get_background_loop
+
+logger = get_logger(__name__)
+
+
+class BrowserSpeechBridge:
+    """
+    A local websocket the speech recognition page connects to.
+
+    The page pushes its recognition events (start, result, end, error) as
+    JSON the moment the browser fires them, and takes start/stop commands
+    over the same socket. Python blocks on a queue of those events instead
+    of polling the DOM through WebDriver, so a transcript arrives as soon as
+    the browser has it and a turn costs no WebDriver round trips at all.
+
+    The page finds the bridge through a `bridge` query parameter on its URL
+    (see `page_url`). One page is served at a time; a new connection replaces
+    the previous one.
+    """
+
+    DISCONNECTED = "disconnected"
+    # Close code telling a page it was replaced by a newer one and must not reconnect.
+    REPLACED_CLOSE_CODE = 4000
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, loop: Optional[BackgroundEventLoop] = None):
+        """
+        Args:
+            host (str): Interface to listen on; keep it local.
+            port (int): Port to listen on; 0 picks a free one.
+            loop (Optional[BackgroundEventLoop]): Loop to run the server on. Defaults to the shared one.
+        """
+        self.host = host
+        self.port = port
+        self.loop = loop or get_background_loop()
+        self.events: "queue.Queue[Dict[str, Any]]" = queue.Queue()
+        self._connection = None
+        self._connections = 0
+        self._state = threading.Condition()
+        self._server = None
+        self._turn = 0
+
+    @property
+    def url(self) -> str:
+        """Websocket URL the page should connect to."""
+        return f"ws://{self.host}:{self.port}"
+
+    @property
+    def connected(self) -> bool:
+        """True while a page is connected."""
+        return self._connection is not None
+
+    @property
+    def connections(self) -> int:
+        """Number of page connections so far; compare before and after loading a page."""
+        return self._connections
+
+    def start(self) -> None:
+        """Start listening for the page, if not already."""
+        if self._server is None:
+            self.loop.run(self._start(), timeout=10)
+            logger.info(f"Browser speech bridge listening on {self.url}")
+
+    def page_url(self, url: str) -> str:
+        """Return `url` with the query parameter that points the page at this bridge."""
+        self.start()
+        parts = urlsplit(url)
+        query = "&".join(part for part in (parts.query, urlencode({"bridge": self.url})) if part)
+        return urlunsplit((parts.scheme, parts.netloc, parts.path, query, parts.fragment))
+
+    def wait_connected(self, timeout: Optional[float] = None, after: Optional[int] = None) -> bool:
+        """
+        Block until a page is connected.
+
+        Args:
+            timeout (Optional[float]): Seconds to wait.
+            after (Optional[int]): Only a connection made after `connections` had this
+                                   value counts, e.g. the one from a page just loaded.
+
+        Returns:
+            bool: False on timeout.
+        """
+        with self._state:
+            return self._state.wait_for(
+                lambda: self.connected and (after is None or self._connections > after), timeout)
+
+    def send(self, command: Dict[str, Any]) -> bool:
+        """
+        Send a command to the page.
+
+        Args:
+            command (Dict[str, Any]): JSON-serializable command, e.g. {"type": "start", "lang": "en-US"}.
+
+        Returns:
+            bool: False if no page is connected or the send failed.
+        """
+        if not self.connected:
+            return False
+        try:
+            self.loop.run(self._send(json.dumps(command)), timeout=5)
+            return True
+        except Exception as e:
+            logger.warning(f"Could not send {command.get('type')} to the speech page: {e}")
+            return False
+
+    def start_recognition(self, language: str) -> bool:
+        """
+        Ask the page to start recognizing speech in `language`.
+
+        Starts a new turn: from now on `next_event` only returns this
+        recognition's events (and disconnects), never late ones from an earlier turn.
+        """
+        self._turn += 1
+        return self.send({"type": "start", "lang": language, "turn": self._turn})
+
+    def stop_recognition(self) -> bool:
+        """Ask the page to stop recognizing; it will still report the final result and `end`."""
+        return self.send({"type": "stop"})
+
+    def next_event(self, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """
+        Wait for the next event from the page.
+
+        Returns:
+            Optional[Dict[str, Any]]: The event (with a "type" key), or None on timeout.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                event = self.events.get(timeout=remaining)
+            except queue.Empty:
+                return None
+            if event.get("type") == self.DISCONNECTED or event.get("turn") == self._turn:
+                return event
+
+    def drain(self) -> None:
+        """Drop events left over from an earlier turn."""
+        while True:
+            try:
+                self.events.get_nowait()
+            except queue.Empty:
+                return
+
+    def close(self) -> None:
+        """Stop listening and disconnect the page."""
+        if self._server is None:
+            return
+        try:
+            self.loop.run(self._close(), timeout=5)
+        except Exception as e:
+            logger.error(f"Error closing browser speech bridge: {e}")
+        self._server = None
+
+    async def _start(self) -> None:
+        from websockets.asyncio.server import serve
+
+        self._server = await serve(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def _handle(self, connection) -> None:
+        with self._state:
+            previous, self._connection = self._connection, connection
+            self._connections += 1
+            self._state.notify_all()
+        if previous is not None:
+            await previous.close(self.REPLACED_CLOSE_CODE, "replaced by a newer page")
+        logger.info("Speech recognition page connected to the bridge")
+        try:
+            async for raw in connection:
+                try:
+                    event = json.loads(raw)
+                except ValueError:
+                    logger.warning(f"Ignoring malformed message from the speech page: {raw!r}")
+                    continue
+                self.events.put(event)
+        except Exception as e:
+            logger.debug(f"Speech page connection ended: {e}")
+        finally:
+            if self._connection is connection:
+                with self._state:
+                    self._connection = None
+                    self._state.notify_all()
+                self.events.put({"type": self.DISCONNECTED})
+                logger.info("Speech recognition page disconnected from the bridge")
+
+    async def _send(self, message: str) -> None:
+        if self._connection is None:
+            raise ConnectionError("No speech page connected.")
+        await self._connection.send(message)
+
+    async def _close(self) -> None:
+        self._server.close()
+        if self._connection is not None:
+            await self._connection.close()
+        await asyncio.wait_for(self._server.wait_closed(), timeout=3)
@@ -0,0 +1,167 @@
+import atexit
+import threading
+from typing import Callable, Generator, Optional
+
+import numpy as np
+
+from core.logger import get_logger
+from utils.ring_buffer import PCMRingBuffer
+from voice.audio_devices import get_audio_device_manager
+
+logger = get_logger(__name__)
+
+
+def _shared_input(sample_rate: int, frames_per_buffer: int):
+    # A tap on the process-wide input stream: wake word detection and other
+    # consumers keep listening to the same device.
+    return get_audio_device_manager().open_input(sample_rate)
+
+
+class MicrophoneCapture:
+    """
+    Keeps the microphone open and records it continuously into a ring buffer.
+
+    A capture thread reads fixed-size frames and appends them to a
+    `PCMRingBuffer`; it never waits on a consumer. Consumers mark where a turn
+    starts with `mark`, which can reach back into audio that was captured
+    before the call, so the first syllable is not lost, and then follow the
+    buffer from there with `chunks`. Opening the device happens once, not once
+    per turn.
+    """
+
+    def __init__(self,
+                 sample_rate: int = 16000,
+                 frame_ms: int = 20,
+                 buffer_seconds: float = 30.0,
+                 input_factory: Optional[Callable[[int, int], object]] = None):
+        """
+        Initialize the capture. The device is opened by `start()`.
+
+        Args:
+            sample_rate (int): Capture rate.
+            frame_ms (int): Frame read per device call; smaller lowers latency.
+            buffer_seconds (float): Audio kept for consumers that fall behind and for pre-roll.
+            input_factory (Optional[Callable[[int, int], object]]): Called with
+                (sample_rate, frames_per_buffer) to open the input. The result needs
+                `read(frames) -> bytes` and `close()`. Defaults to a tap on the
+                shared input stream of `voice.audio_devices`.
+        """
+        self.sample_rate = sample_rate
+        self.frame_samples = max(1, sample_rate * frame_ms // 1000)
+        self.buffer = PCMRingBuffer(int(buffer_seconds * sample_rate))
+        self.input_factory = input_factory or _shared_input
+        self.overruns = 0
+
+        self._input = None
+        self._thread: Optional[threading.Thread] = None
+        self._running = threading.Event()
+        # Wakes waiting consumers; the ring buffer itself is written without a lock.
+        self._new_audio = threading.Condition()
+
+    @property
+    def running(self) -> bool:
+        """True while the capture thread is recording."""
+        return self._running.is_set()
+
+    def start(self) -> None:
+        """Open the device and start recording, if not already running."""
+        if self.running:
+            return
+        self._input = self.input_factory(self.sample_rate, self.frame_samples)
+        self._running.set()
+        self._thread = threading.Thread(target=self._capture_loop, name="MicrophoneCapture", daemon=True)
+        self._thread.start()
+        logger.info(f"Microphone capture started at {self.sample_rate} Hz, "
+                    f"{1000 * self.frame_samples // self.sample_rate} ms frames")
+
+    def mark(self, pre_roll_ms: int = 0) -> int:
+        """
+        Mark a turn boundary.
+
+        Args:
+            pre_roll_ms (int): Audio from before the boundary to include.
+
+        Returns:
+            int: Buffer position to start consuming from.
+        """
+        self.start()
+        pre_roll = self.sample_rate * pre_roll_ms // 1000
+        return max(self.buffer.oldest, self.buffer.total_written - pre_roll)
+
+    def chunks(self, start: Optional[int] = None, timeout: Optional[float] = None) -> Generator[np.ndarray, None, None]:
+        """
+        Yield captured int16 audio from `start` onwards, as it arrives.
+
+        Each chunk is everything captured since the previous one, so a slow
+        consumer receives fewer, larger chunks instead of falling behind. If it
+        falls more than the buffer length behind, the lost audio is skipped.
+
+        Args:
+            start (Optional[int]): Position from `mark`; defaults to now.
+            timeout (Optional[float]): Stop after this many seconds without new audio.
+        """
+        cursor = self.mark() if start is None else start
+        while self.running:
+            end = self.buffer.total_written
+            if end > cursor:
+                if cursor < self.buffer.oldest:
+                    self.overruns += 1
+                    logger.warning(f"Capture consumer fell behind; skipped {self.buffer.oldest - cursor} samples")
+                    cursor = self.buffer.oldest
+                chunk = self.buffer.read(cursor, end)
+                if cursor < self.buffer.oldest:
+                    continue  # overwritten while it was being copied
+                yield chunk
+                cursor = end
+                continue
+            with self._new_audio:
+                if self.buffer.total_written == cursor and not self._new_audio.wait(timeout) and timeout is not None:
+                    return
+
+    def close(self) -> None:
+        """Stop recording and release the device."""
+        if not self.running:
+            return
+        self._running.clear()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+        try:
+            self._input.close()
+        except Exception as e:
+            logger.error(f"Error closing microphone: {e}")
+        with self._new_audio:
+            self._new_audio.notify_all()
+
+    def _capture_loop(self) -> None:
+        try:
+            while self.running:
+                data = self._input.read(self.frame_samples)
+                self.buffer.write(np.frombuffer(data, dtype=np.int16))
+                with self._new_audio:
+                    self._new_audio.notify_all()
+        except Exception as e:
+            logger.error(f"Microphone capture stopped: {e}")
+            self._running.clear()
+            with self._new_audio:
+                self._new_audio.notify_all()
+
+
+_shared_capture: Optional[MicrophoneCapture] = None
+_shared_capture_lock = threading.Lock()
+
+
+def get_microphone_capture(sample_rate: int = 16000, frame_ms: int = 20) -> MicrophoneCapture:
+    """
+    Get the process-wide microphone capture, creating it on first use.
+
+    The rate and frame size only apply when it is created.
+
+    Returns:
+        MicrophoneCapture: The shared capture (not started).
+    """
+    global _shared_capture
+    with _shared_capture_lock:
+        if _shared_capture is None:
+            _shared_capture = MicrophoneCapture(sample_rate, frame_ms)
+            atexit.register(_shared_capture.close)
+        return _shared_capture
@@ -1,3 +1,5 @@
+from typing import Optional
+
 import pyaudio
 from google import genai
 from google.genai import types
@@ -24,8 +26,15 @@ def get_gemini_client(api_key: str):
         api_key=api_key,
     )
 
-def get_live_connect_config(system_instruction_text: str) -> types.LiveConnectConfig:
-    """Constructs and returns the LiveConnectConfig for Gemini."""
+def get_live_connect_config(system_instruction_text: str, session_resumption: bool = True) -> types.LiveConnectConfig:
+    """
+    Constructs and returns the LiveConnectConfig for Gemini.
+
+    Args:
+        system_instruction_text (str): The system instruction.
+        session_resumption (bool): Ask the server for resumption handles, so a dropped
+                                   connection can be resumed (see `with_resumption_handle`).
+    """
     
     if not system_instruction_text:
         logger.warning("No system instruction provided for Gemini Live session. Using a generic default.")
@@ -49,7 +58,18 @@ def get_live_connect_config(system_instruction_text: str) -> types.LiveConnectCo
             parts=[types.Part.from_text(text=system_instruction_text)],
             role="user"
         ),
-        # session_resumption=types.SessionResumptionConfig(
-        #     handle="HANDLE HERE"
-        # )
-    )
\ No newline at end of file
+        session_resumption=types.SessionResumptionConfig() if session_resumption else None,
+    )
+
+
+def with_resumption_handle(config: types.LiveConnectConfig, handle: Optional[str]) -> types.LiveConnectConfig:
+    """
+    Return `config` set up to resume the session `handle` refers to.
+
+    Args:
+        config (types.LiveConnectConfig): Config from `get_live_connect_config`.
+        handle (Optional[str]): Latest handle from a session resumption update; None starts a new session.
+    """
+    if handle is None or config.session_resumption is None:
+        return config
+    return config.model_copy(update={"session_resumption": types.SessionResumptionConfig(handle=handle)})
@@ -1,64 +1,167 @@
 import asyncio
-import pyaudio
+
 from core.logger import get_logger
+from utils.jitter_buffer import JitterBuffer
+from utils.ring_buffer import PCMRingBuffer
+from utils.send_scheduler import AUDIO_STREAM_END
+from voice.vad import SpeechGate
 
-FORMAT = pyaudio.paInt16
-CHANNELS = 1
 SEND_SAMPLE_RATE = 16000
 RECEIVE_SAMPLE_RATE = 24000
-CHUNK_SIZE = 1024
 
 logger = get_logger(__name__)
 
 class AudioHandler:
-    def __init__(self, pya=None):
-        self.pya = pya
+    """
+    Microphone and speaker I/O for a Gemini Live session.
+
+    Both streams are taps on the process-wide devices of
+    `voice.audio_devices`, so a session neither initializes PortAudio nor
+    reopens the microphone and speaker, and wake word detection can keep
+    listening alongside it. PortAudio's own thread moves the audio and the
+    event loop never hands a blocking read or write to the thread pool. The
+    microphone callback appends to a preallocated ring buffer and wakes the
+    uploader; received audio goes into a bounded `JitterBuffer` that the
+    speaker callback drains.
+
+    With the speech gate on, the uploader runs a local VAD over the captured
+    audio and only sends speech (with a short pre-roll and hangover), not a
+    continuous stream of silence. When the server reports that the user
+    interrupted, everything still queued for playback is dropped at once.
+    Optionally the local VAD flushes playback itself as soon as the user
+    starts talking; that needs headphones or echo cancellation, or the
+    assistant interrupts itself.
+    """
+
+    def __init__(self, devices=None, jitter_target_ms: int = 120, jitter_max_ms: int = 2000,
+                 capture_seconds: float = 2.0, stats_interval: float = 30.0,
+                 vad_gate: bool = True, local_barge_in: bool = False):
+        """
+        Args:
+            devices (AudioDeviceManager): Where the microphone and speaker streams come from.
+            jitter_target_ms (int): Received audio buffered before playback starts.
+            jitter_max_ms (int): Most received audio held; beyond it the oldest is dropped.
+            capture_seconds (float): Microphone audio kept if uploading falls behind.
+            stats_interval (float): Seconds between playout metric log lines.
+            vad_gate (bool): Only upload microphone audio the local VAD classifies as speech.
+            local_barge_in (bool): Flush playback when the local VAD hears speech,
+                                   without waiting for the server's interruption.
+                                   Requires `vad_gate`.
+        """
+        self.devices = devices
         self.audio_stream = None
-        
+        self.output_stream = None
+        self.playout = JitterBuffer(RECEIVE_SAMPLE_RATE, jitter_target_ms, jitter_max_ms)
+        self.capture = PCMRingBuffer(int(SEND_SAMPLE_RATE * capture_seconds))
+        self.speech_gate = SpeechGate(SEND_SAMPLE_RATE) if vad_gate else None
+        self.local_barge_in = local_barge_in and vad_gate
+        self.stats_interval = stats_interval
+        self.input_overflows = 0
+        self.capture_overruns = 0
+        self.uploaded_samples = 0
+        self.interruptions = 0
+        self.flushed_samples = 0
+
+    def flush_playback(self, reason: str) -> int:
+        """
+        Stop what is playing now and drop everything queued behind it.
+
+        The speaker callback plays silence from its next period on, so at most
+        one 20 ms period already handed to the device is still heard.
+
+        Args:
+            reason (str): Logged with the number of dropped milliseconds.
+
+        Returns:
+            int: Samples dropped.
+        """
+        dropped = self.playout.clear()
+        self.flushed_samples += dropped
+        if dropped:
+            logger.info(f"Barge-in ({reason}): dropped {1000.0 * dropped / RECEIVE_SAMPLE_RATE:.0f} ms of playback")
+        return dropped
+
     async def listen_audio(self, out_queue):
-        if not self.pya:
-            logger.error("PyAudio not initialized. Cannot listen to audio.")
+        if not self.devices:
+            logger.error("No audio devices. Cannot listen to audio.")
             return
 
+        loop = asyncio.get_running_loop()
+        new_audio = asyncio.Event()
+
+        def on_input(samples, overflowed):
+            self.input_overflows += overflowed
+            self.capture.write(samples)
+            loop.call_soon_threadsafe(new_audio.set)
+
         try:
-            mic_info = self.pya.get_default_input_device_info()
-            self.audio_stream = await asyncio.to_thread(
-                self.pya.open,
-                format=FORMAT,
-                channels=CHANNELS,
-                rate=SEND_SAMPLE_RATE,
-                input=True,
-                input_device_index=mic_info["index"],
-                frames_per_buffer=CHUNK_SIZE,
-            )
+            # Only the first session (or the first after the device went idle) opens the device.
+            self.audio_stream = await asyncio.to_thread(self.devices.open_input, SEND_SAMPLE_RATE, on_input)
         except Exception as e:
             logger.error(f"Failed to open audio stream for listening: {e}", exc_info=True)
             return
 
+        async def upload(start, end):
+            if end > start:
+                self.uploaded_samples += end - start
+                data = self.capture.read(start, end).tobytes()
+                await out_queue.put({"data": data, "mime_type": "audio/pcm"})
+
         logger.info(f"Listen audio task started.")
+        gate = self.speech_gate
+        # `cursor` is the next sample to classify (or send, without the gate); `sent` the next
+        # sample to send while the gate is open.
+        cursor = sent = self.capture.total_written
+        if gate is not None:
+            gate.reset(cursor)
         try:
             while True:
-                read_kwargs = {}
-                if __debug__:
-                    read_kwargs["exception_on_overflow"] = False
-                
-                data = await asyncio.to_thread(self.audio_stream.read, CHUNK_SIZE, **read_kwargs)
-                await out_queue.put({"data": data, "mime_type": "audio/pcm"})
+                await new_audio.wait()
+                new_audio.clear()
+                end = self.capture.total_written
+                if cursor < self.capture.oldest:
+                    # Uploading fell more than the ring buffer behind; skip what was lost.
+                    self.capture_overruns += 1
+                    cursor = sent = self.capture.oldest
+                    if gate is not None:
+                        gate.reset(cursor)
+                if gate is None:
+                    await upload(cursor, end)
+                    cursor = end
+                    continue
+
+                while cursor + gate.frame_length <= end:
+                    change = gate.process(self.capture.read(cursor, cursor + gate.frame_length))
+                    cursor += gate.frame_length
+                    if change == SpeechGate.OPENED:
+                        sent = max(gate.open_from, self.capture.oldest)
+                        if self.local_barge_in:
+                            self.flush_playback("local VAD")
+                    elif change == SpeechGate.CLOSED:
+                        await upload(sent, cursor)
+                        sent = cursor
+                        await out_queue.put(AUDIO_STREAM_END)
+                if gate.is_open:
+                    await upload(sent, cursor)
+                    sent = cursor
         except asyncio.CancelledError:
             logger.info("Listen audio task cancelled.")
         except Exception as e:
             logger.error(f"Error in listen_audio: {e}", exc_info=True)
         finally:
-            if self.audio_stream and self.audio_stream.is_active():
-                try:
-                    self.audio_stream.stop_stream()
-                    self.audio_stream.close()
-                except Exception as e_close:
-                    logger.error(f"Error closing listen_audio stream: {e_close}")
+            self._close_stream(self.audio_stream, "listen_audio")
             self.audio_stream = None
             logger.info("Listen audio task finished.")
 
-    async def receive_audio(self, session, audio_in_queue):
+    async def receive_audio(self, session, on_message=None):
+        """
+        Play the audio the session sends until the connection ends.
+
+        Args:
+            session: The live session.
+            on_message (Optional[Callable[[Any], bool]]): Sees every message first; returning
+                True stops receiving, e.g. when the server announces it will disconnect.
+        """
         logger.info("Receive audio task started.")
         try:
             while True:
@@ -66,14 +169,33 @@ class AudioHandler:
                     logger.warning("Session not active in receive_audio. Waiting.")
                     await asyncio.sleep(0.1)
                     continue
-                
+
                 turn = session.receive()
+                received = 0
                 async for response in turn:
+                    received += 1
+                    if on_message is not None and on_message(response):
+                        return
+                    content = getattr(response, "server_content", None)
+                    if content is not None and getattr(content, "interrupted", False):
+                        # The user talked over the reply and the server cancelled it: drop what is
+                        # queued instead of playing it to the end. Messages arrive in order, so
+                        # audio after this belongs to the next reply.
+                        self.interruptions += 1
+                        self.flush_playback("server")
+                        continue
                     if data := response.data:
-                        audio_in_queue.put_nowait(data)
+                        self.playout.write(data)
                         continue
                     if text := response.text:
                         print(text, end="", flush=True)
+                    if content is not None and getattr(content, "turn_complete", False):
+                        self.playout.end_of_stream()
+                # The turn is complete: let the tail play out without waiting for more.
+                self.playout.end_of_stream()
+                if not received:
+                    logger.info("Live connection closed; receive audio task stopping.")
+                    return
         except asyncio.CancelledError:
             logger.info("Receive audio task cancelled.")
         except Exception as e:
@@ -81,51 +203,61 @@ class AudioHandler:
         finally:
             logger.info("Receive audio task finished.")
 
-    async def play_audio(self, audio_in_queue):
-        if not self.pya:
-            logger.error("PyAudio not initialized. Cannot play audio.")
+    async def play_audio(self):
+        if not self.devices:
+            logger.error("No audio devices. Cannot play audio.")
             return
 
-        stream = None
         try:
-            stream = await asyncio.to_thread(
-                self.pya.open,
-                format=FORMAT,
-                channels=CHANNELS,
-                rate=RECEIVE_SAMPLE_RATE,
-                output=True,
-            )
+            self.output_stream = await asyncio.to_thread(
+                self.devices.open_output, RECEIVE_SAMPLE_RATE, self.playout.read_into)
         except Exception as e:
             logger.error(f"Failed to open audio stream for playing: {e}", exc_info=True)
             return
 
         logger.info("Play audio task started.")
         try:
+            # The callback does the playing; this task only reports how the buffer is doing.
             while True:
-                bytestream = await audio_in_queue.get()
-                await asyncio.to_thread(stream.write, bytestream)
-                audio_in_queue.task_done()
+                await asyncio.sleep(self.stats_interval)
+                logger.info(f"Playout buffer: {self.playout.stats()}, "
+                            f"mic overflows: {self.input_overflows}, upload overruns: {self.capture_overruns}, "
+                            f"{self._barge_in_stats()}")
         except asyncio.CancelledError:
             logger.info("Play audio task cancelled.")
         except Exception as e:
             logger.error(f"Error in play_audio: {e}", exc_info=True)
         finally:
-            if stream and stream.is_active():
-                try:
-                    stream.stop_stream()
-                    stream.close()
-                except Exception as e_close:
-                    logger.error(f"Error closing play_audio stream: {e_close}")
-            logger.info("Play audio task finished.")
-            
+            self._close_stream(self.output_stream, "play_audio")
+            self.output_stream = None
+            logger.info(f"Play audio task finished. Playout buffer: {self.playout.stats()}")
+
+    def _barge_in_stats(self) -> str:
+        stats = (f"interruptions: {self.interruptions}, "
+                 f"flushed: {1000.0 * self.flushed_samples / RECEIVE_SAMPLE_RATE:.0f} ms")
+        captured = self.capture.total_written
+        if self.speech_gate is not None and captured:
+            stats += (f", mic uploaded: {100.0 * self.uploaded_samples / captured:.0f}% "
+                      f"in {self.speech_gate.opened} speech segments")
+        return stats
+
+    def _close_stream(self, stream, name: str) -> None:
+        if stream is None:
+            return
+        try:
+            stream.close()
+        except Exception as e_close:
+            logger.error(f"Error closing {name} stream: {e_close}")
+
     async def close_audio_resources(self):
         if self.audio_stream:
             try:
-                if self.audio_stream.is_active():
-                    self.audio_stream.stop_stream()
                 self.audio_stream.close()
                 logger.info("GeminiLiveSession microphone audio_stream closed.")
             except Exception as e:
                 logger.error(f"Error closing microphone audio_stream in GeminiLiveSession: {e}", exc_info=True)
             finally:
                 self.audio_stream = None
+        if self.output_stream:
+            self._close_stream(self.output_stream, "play_audio")
+            self.output_stream = None
@@ -8,18 +8,22 @@ class CommunicationHandler:
         pass
         
     async def send_realtime(self, out_queue, session):
+        """
+        Send everything the audio and video tasks queue up.
+
+        Args:
+            out_queue (SendScheduler): Where the tasks put their messages; it decides the send order.
+            session: The live session.
+        """
         logger.info("Send realtime (audio/video) task started.")
         try:
-            while True:
-                msg = await out_queue.get()
-                if session:
-                    await session.send(input=msg)
-                else:
-                    logger.warning("Session not active in send_realtime, cannot send message. Waiting.")
-                    await asyncio.sleep(0.1) 
+            while not session:
+                logger.warning("Session not active in send_realtime, cannot send message. Waiting.")
+                await asyncio.sleep(0.1) 
+            await out_queue.run(session)
         except asyncio.CancelledError:
             logger.info("Send realtime task cancelled.")
         except Exception as e:
             logger.error(f"Error in send_realtime: {e}", exc_info=True)
         finally:
-            logger.info("Send realtime task finished.")
+            logger.info(f"Send realtime task finished. Sent: {out_queue.stats()}")
@@ -7,13 +7,9 @@ class ResourceManager:
     def __init__(self):
         pass
         
-    async def close_resources(self, pya):
-        if pya:
-            try:
-                pya.terminate()
-                logger.info("GeminiLiveSession PyAudio instance terminated.")
-            except Exception as e:
-                logger.error(f"Error terminating PyAudio in GeminiLiveSession: {e}", exc_info=True)
-            finally:
-                pya = None
+    async def close_resources(self, devices):
+        # The audio devices are shared with the rest of the process and outlive the session:
+        # PortAudio is not terminated here, and the streams close once nothing uses them.
+        if devices:
+            logger.info(f"Audio devices after GeminiLiveSession: {devices.stats()}")
         logger.info("GeminiLiveSession resources closed.")
@@ -1,7 +1,10 @@
 import asyncio
-import pyaudio
 from core.logger import get_logger
-from .audio import AudioHandler
+from utils.live_connection import LiveConnection
+from utils.send_scheduler import SendScheduler
+from voice.audio_devices import get_audio_device_manager
+from ..client_config import with_resumption_handle
+from .audio import AudioHandler, SEND_SAMPLE_RATE
 from .video import VideoHandler
 from .communication import CommunicationHandler
 from .resources import ResourceManager
@@ -9,74 +12,102 @@ from .resources import ResourceManager
 logger = get_logger(__name__)
 
 class GeminiLiveSession:
-    def __init__(self, client, connect_config, model_name: str, video_mode: str = "none"):
+    """
+    One Gemini Live conversation: microphone, speaker and video tasks around a live connection.
+
+    The media tasks run for the whole conversation, while the connection
+    underneath may be replaced. When it drops, or the server announces it
+    will close it, only the send and receive tasks are restarted on a
+    reconnected session, resumed with the latest session resumption handle,
+    so the model keeps its context. Microphone audio captured during the
+    gap waits in the send scheduler (up to `reconnect_buffer_ms`) and goes
+    out once the session is back. With `standby`, a connection for the next
+    conversation is opened in the background when one ends.
+
+    Microphone and speaker come from the process-wide audio device manager,
+    so PortAudio is initialized once per process rather than per session,
+    and the devices stay open between conversations.
+    """
+
+    def __init__(self, client, connect_config, model_name: str, video_mode: str = "none",
+                 jitter_target_ms: int = 120, jitter_max_ms: int = 2000,
+                 vad_gate: bool = True, local_barge_in: bool = False,
+                 standby: bool = False, reconnect_buffer_ms: int = 5000):
         self.client = client
         self.connect_config = connect_config
         self.model_name = model_name
         self.video_mode = video_mode
+        self.reconnect_buffer_ms = reconnect_buffer_ms
 
-        self.audio_in_queue = None
         self.out_queue = None
         self.session = None
         self.other_tasks_list = []
+        self.connection = LiveConnection(self._connect, standby=standby)
         
-        try:
-            self.pya = pyaudio.PyAudio()
-            logger.info("PyAudio instance created for GeminiLiveSession.")
-        except Exception as e:
-            logger.error(f"Failed to initialize PyAudio in GeminiLiveSession: {e}")
-            self.pya = None
-            raise
-            
-        self.audio_handler = AudioHandler(self.pya)
+        self.devices = get_audio_device_manager()
+        self.audio_handler = AudioHandler(self.devices, jitter_target_ms, jitter_max_ms,
+                                          vad_gate=vad_gate, local_barge_in=local_barge_in)
         self.video_handler = VideoHandler()
         self.comm_handler = CommunicationHandler()
         self.resource_manager = ResourceManager()
 
+    def _connect(self, handle):
+        config = with_resumption_handle(self.connect_config, handle)
+        return self.client.aio.live.connect(model=self.model_name, config=config)
+
+    async def warm_up(self) -> None:
+        """Open the standby connection now, so even the first conversation starts without connect latency."""
+        self.connection.prepare_standby()
+
     async def run(self):
         logger.info(f"GeminiLiveSession run started with video_mode: {self.video_mode}")
-        if not self.pya:
-            logger.error("PyAudio not initialized. Cannot run GeminiLiveSession.")
-            return
-            
         self.other_tasks_list = []
+        link_tasks = []
         try:
-            async with self.client.aio.live.connect(model=self.model_name, config=self.connect_config) as session:
-                self.session = session
-                logger.info(f"Gemini Live session connected.")
-                
-                self.audio_in_queue = asyncio.Queue()
-                self.out_queue = asyncio.Queue(maxsize=5)
-                
-                self.other_tasks_list.append(asyncio.create_task(
-                    self.comm_handler.send_realtime(self.out_queue, self.session), 
-                    name="GeminiSendRealtime"))
-                self.other_tasks_list.append(asyncio.create_task(
-                    self.audio_handler.listen_audio(self.out_queue), 
-                    name="GeminiListenAudio"))
-                
-                if self.video_mode == "camera":
-                    self.other_tasks_list.append(asyncio.create_task(
-                        self.video_handler.get_frames(self.out_queue, self.video_mode), 
-                        name="GeminiGetFrames"))
-                elif self.video_mode == "screen":
-                    self.other_tasks_list.append(asyncio.create_task(
-                        self.video_handler.get_screen(self.out_queue, self.video_mode), 
-                        name="GeminiGetScreen"))
-                
+            self.session = await self.connection.start()
+            logger.info(f"Gemini Live session connected.")
+
+            # Audio, video and text each get their own lane; audio is always sent first.
+            # The scheduler outlives a dropped connection, holding audio until the session is back.
+            self.out_queue = SendScheduler(SEND_SAMPLE_RATE, max_audio_ms=self.reconnect_buffer_ms)
+
+            self.other_tasks_list.append(asyncio.create_task(
+                self.audio_handler.listen_audio(self.out_queue), 
+                name="GeminiListenAudio"))
+            
+            if self.video_mode == "camera":
                 self.other_tasks_list.append(asyncio.create_task(
-                    self.audio_handler.receive_audio(self.session, self.audio_in_queue), 
-                    name="GeminiReceiveAudio"))
+                    self.video_handler.get_frames(self.out_queue, self.video_mode), 
+                    name="GeminiGetFrames"))
+            elif self.video_mode == "screen":
                 self.other_tasks_list.append(asyncio.create_task(
-                    self.audio_handler.play_audio(self.audio_in_queue), 
-                    name="GeminiPlayAudio"))
-                
-                if self.other_tasks_list:
-                    await asyncio.gather(*self.other_tasks_list, return_exceptions=True)
-                else:
-                    logger.warning("No tasks were created in GeminiLiveSession run method.")
+                    self.video_handler.get_screen(self.out_queue, self.video_mode), 
+                    name="GeminiGetScreen"))
+            
+            self.other_tasks_list.append(asyncio.create_task(
+                self.audio_handler.play_audio(), 
+                name="GeminiPlayAudio"))
 
-                logger.info("GeminiLiveSession: asyncio.gather completed for tasks.")
+            while True:
+                link_tasks = [
+                    asyncio.create_task(
+                        self.comm_handler.send_realtime(self.out_queue, self.session),
+                        name="GeminiSendRealtime"),
+                    asyncio.create_task(
+                        self.audio_handler.receive_audio(self.session, self.connection.observe),
+                        name="GeminiReceiveAudio"),
+                ]
+                # Both tasks run until the connection ends (or is about to).
+                await asyncio.wait(link_tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in link_tasks:
+                    task.cancel()
+                await asyncio.gather(*link_tasks, return_exceptions=True)
+                logger.info("Gemini Live connection ended; reconnecting.")
+                resumed = self.connection.resumed
+                self.session = await self.connection.reconnect()
+                if self.connection.resumed == resumed:
+                    # A new session has not seen the scene; send it even if nothing changed.
+                    self.video_handler.resend()
 
         except asyncio.CancelledError:
             logger.info("GeminiLiveSession run method was cancelled.")
@@ -85,7 +116,7 @@ class GeminiLiveSession:
         finally:
             logger.info("GeminiLiveSession run method entering finally block for cleanup.")
             
-            active_tasks_to_cancel = [t for t in self.other_tasks_list if t and not t.done()]
+            active_tasks_to_cancel = [t for t in self.other_tasks_list + link_tasks if t and not t.done()]
             if active_tasks_to_cancel:
                 logger.info(f"Cancelling {len(active_tasks_to_cancel)} active tasks...")
                 for task in active_tasks_to_cancel:
@@ -95,20 +126,15 @@ class GeminiLiveSession:
             else:
                 logger.info("No active tasks to cancel in finally block, or tasks already completed.")
 
+            logger.info(f"Gemini Live connection stats: {self.connection.stats()}")
+            await self.connection.close(keep_standby=True)
+            self.session = None
+            self.connection.prepare_standby()
             await self.close_resources()
             logger.info("GeminiLiveSession run method finished cleanup in finally block.")
 
     async def close_resources(self):
         logger.info("GeminiLiveSession closing resources...")
         await self.audio_handler.close_audio_resources()
-        await self.resource_manager.close_resources(self.pya)
-        self.pya = None
+        await self.resource_manager.close_resources(self.devices)
         logger.info("GeminiLiveSession resources closed.")
-
-    def __del__(self):
-        if self.pya:
-            logger.warning("GeminiLiveSession __del__ called. Attempting to terminate PyAudio if not already done.")
-            try:
-                self.pya.terminate()
-            except Exception:
-                pass
@@ -1,32 +1,118 @@
 import asyncio
-import base64
-import io
+from concurrent.futures import ThreadPoolExecutor
 import cv2
-import PIL.Image
 import mss
 from core.logger import get_logger
+from utils.frame_encoder import FrameChangeDetector, FrameEncoder
 
 logger = get_logger(__name__)
 
+
+class FrameRateController:
+    """
+    Picks the wait before the next capture from scene activity and upload backlog.
+
+    A changed frame brings the rate up to `max_fps` at once; each unchanged
+    frame slows it by `backoff` down to `min_fps`, so a static scene costs a
+    cheap capture-and-compare every few seconds and nothing else. A backlog
+    halves the rate regardless of activity.
+    """
+
+    def __init__(self, min_fps: float = 0.5, max_fps: float = 2.0, backoff: float = 1.5):
+        """
+        Args:
+            min_fps (float): Slowest capture rate, for a static scene or a congested link.
+            max_fps (float): Fastest capture rate, while the scene is changing.
+            backoff (float): Factor the interval grows by per unchanged frame.
+        """
+        if not 0 < min_fps <= max_fps:
+            raise ValueError("Need 0 < min_fps <= max_fps.")
+        self.min_interval = 1.0 / max_fps
+        self.max_interval = 1.0 / min_fps
+        self.backoff = backoff
+        self.interval = self.min_interval
+
+    def update(self, changed: bool, congested: bool) -> float:
+        """
+        Record the outcome of a capture.
+
+        Args:
+            changed (bool): The frame differed from the last one sent.
+            congested (bool): Uploads are backed up.
+
+        Returns:
+            float: Seconds to wait before the next capture.
+        """
+        if congested:
+            self.interval = min(self.max_interval, self.interval * 2)
+        elif changed:
+            self.interval = self.min_interval
+        else:
+            self.interval = min(self.max_interval, self.interval * self.backoff)
+        return self.interval
+
+
 class VideoHandler:
-    def __init__(self):
-        pass
-        
-    def _get_frame(self, cap):
-        ret, frame = cap.read()
-        if not ret:
-            return None
-        frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        img = PIL.Image.fromarray(frame_rgb)
-        img.thumbnail([1024, 1024])
+    """
+    Camera and screen frames for a Gemini Live session.
+
+    Each capture task keeps its source open for its whole run: the camera
+    through one `cv2.VideoCapture`, the screen through one `mss` instance.
+    Frames go from the capture's raw buffer to a downscaled JPEG in a single
+    encode (see `FrameEncoder`) and are sent as bytes.
+
+    Frames that did not change are skipped before encoding, and the capture
+    rate follows scene activity. Frames go into the send scheduler's video
+    lane, where a newer frame replaces one not yet sent and audio always
+    goes first. When a frame had to be replaced, or audio is backing up,
+    capture slows down. When the scheduler drops a frame it had accepted,
+    or `resend` is called, the next frame is sent even if the scene did
+    not change, so the model is never left with an outdated view.
+    """
 
-        image_io = io.BytesIO()
-        img.save(image_io, format="jpeg")
-        image_io.seek(0)
+    def __init__(self, max_size: int = 1024, quality: int = 75,
+                 min_fps: float = 0.5, max_fps: float = 2.0):
+        """
+        Args:
+            max_size (int): Longest side of a sent frame, in pixels.
+            quality (int): JPEG quality, 1-95.
+            min_fps (float): Capture rate for a static scene or a congested link.
+            max_fps (float): Capture rate while the scene is changing.
+        """
+        self.max_size = max_size
+        self.quality = quality
+        self.min_fps = min_fps
+        self.max_fps = max_fps
+        self._resends = 0
+        self._lost_seen = 0
 
-        mime_type = "image/jpeg"
-        image_bytes = image_io.read()
-        return {"mime_type": mime_type, "data": base64.b64encode(image_bytes).decode()}
+    def resend(self) -> None:
+        """Send the next frame even if the scene did not change, e.g. after the model lost its context."""
+        self._resends += 1
+
+    def _new_encoder(self) -> FrameEncoder:
+        return FrameEncoder(self.max_size, self.quality, detector=FrameChangeDetector())
+
+    async def _pace(self, out_queue, encoder: FrameEncoder, frame, rate: FrameRateController) -> None:
+        replaced = out_queue.put_nowait(frame) if frame is not None else False
+        # The detector compares with the last frame it accepted, which may never have been sent.
+        lost = out_queue.video_lost + self._resends
+        dropped = lost != self._lost_seen
+        if dropped:
+            self._lost_seen = lost
+            encoder.detector.reset()
+        # A frame replaced or dropped before it was sent, or audio backing up, means the link is busy.
+        await asyncio.sleep(rate.update(frame is not None, replaced or dropped or out_queue.congested))
+
+    def _log_finished(self, name: str, encoder: FrameEncoder) -> None:
+        logger.info(f"{name} task finished. Encoded {encoder.frames} frames ({encoder.bytes_out} bytes), "
+                    f"skipped {encoder.skipped} unchanged.")
+
+    def _get_frame(self, cap, encoder):
+        ret, frame = cap.read()
+        if not ret:
+            raise EOFError("No frame from camera.")
+        return encoder.encode_bgr(frame)
 
     async def get_frames(self, out_queue, video_mode):
         if not video_mode == "camera":
@@ -38,50 +124,53 @@ class VideoHandler:
             logger.error("Failed to open camera for get_frames.")
             return
 
+        encoder = self._new_encoder()
+        rate = FrameRateController(self.min_fps, self.max_fps)
         logger.info("Camera frames task started.")
         try:
             while True:
-                frame = await asyncio.to_thread(self._get_frame, cap)
-                if frame is None:
+                try:
+                    frame = await asyncio.to_thread(self._get_frame, cap, encoder)
+                except EOFError:
                     logger.info("No frame from camera, exiting get_frames loop.")
                     break
-                await asyncio.sleep(1.0)
-                await out_queue.put(frame)
+                await self._pace(out_queue, encoder, frame, rate)
         except asyncio.CancelledError:
             logger.info("get_frames task cancelled.")
         finally:
             if cap.isOpened():
                 cap.release()
-            logger.info("Camera frames task finished.")
-
-    def _get_screen(self):
-        sct = mss.mss()
-        monitor = sct.monitors[0]
-        i = sct.grab(monitor)
-        mime_type = "image/jpeg"
-        png_bytes = mss.tools.to_png(i.rgb, i.size)
-        img = PIL.Image.open(io.BytesIO(png_bytes))
-        image_io = io.BytesIO()
-        img.save(image_io, format="jpeg")
-        image_io.seek(0)
-        jpeg_bytes = image_io.read()
-        return {"mime_type": mime_type, "data": base64.b64encode(jpeg_bytes).decode()}
+            self._log_finished("Camera frames", encoder)
+
+    def _get_screen(self, sct, encoder):
+        shot = sct.grab(sct.monitors[0])
+        return encoder.encode_bgra(shot.raw, shot.size)
 
     async def get_screen(self, out_queue, video_mode):
         if not video_mode == "screen":
             logger.debug("Screen mode not active, get_screen will not run.")
             return
 
+        # An mss instance holds per-thread display handles, so it is created and used on one thread.
+        grabber = ThreadPoolExecutor(max_workers=1, thread_name_prefix="GeminiScreenGrab")
+        loop = asyncio.get_running_loop()
+        try:
+            sct = await loop.run_in_executor(grabber, mss.mss)
+        except Exception as e:
+            logger.error(f"Failed to open screen capture for get_screen: {e}", exc_info=True)
+            grabber.shutdown(wait=False)
+            return
+
+        encoder = self._new_encoder()
+        rate = FrameRateController(self.min_fps, self.max_fps)
         logger.info("Screen capture task started.")
         try:
             while True:
-                frame = await asyncio.to_thread(self._get_screen)
-                if frame is None:
-                    logger.warning("No frame from screen capture, exiting get_screen loop.")
-                    break
-                await asyncio.sleep(1.0)
-                await out_queue.put(frame)
+                frame = await loop.run_in_executor(grabber, self._get_screen, sct, encoder)
+                await self._pace(out_queue, encoder, frame, rate)
         except asyncio.CancelledError:
             logger.info("get_screen task cancelled.")
         finally:
-            logger.info("Screen capture task finished.")
+            grabber.submit(sct.close)
+            grabber.shutdown(wait=False)
+            self._log_finished("Screen capture", encoder)
@@ -31,19 +31,30 @@ class GeminiLiveProvider(BaseDialogProvider):
 
         try:
             self.client = get_gemini_client(self.api_key)
-            self.connect_config = get_live_connect_config(self.system_instruction)
+            self.connect_config = get_live_connect_config(
+                self.system_instruction, session_resumption=AppConfig.GEMINI_LIVE_SESSION_RESUMPTION)
             
             self.session_handler = GeminiLiveSession(
                 client=self.client,
                 connect_config=self.connect_config,
                 model_name=self.model_name,
-                video_mode=self.video_mode
+                video_mode=self.video_mode,
+                jitter_target_ms=AppConfig.GEMINI_LIVE_JITTER_TARGET_MS,
+                jitter_max_ms=AppConfig.GEMINI_LIVE_JITTER_MAX_MS,
+                vad_gate=AppConfig.GEMINI_LIVE_VAD_GATE,
+                local_barge_in=AppConfig.GEMINI_LIVE_LOCAL_BARGE_IN,
+                standby=AppConfig.GEMINI_LIVE_STANDBY,
+                reconnect_buffer_ms=AppConfig.GEMINI_LIVE_RECONNECT_BUFFER_MS,
             )
             logger.info("GeminiLiveProvider initialized successfully with session handler.")
         except Exception as e:
             logger.error(f"Error during GeminiLiveProvider initialization: {e}", exc_info=True)
             raise
 
+    async def warm_up(self) -> None:
+        """Open a standby connection ahead of the first session (when GEMINI_LIVE_STANDBY is on)."""
+        await self.session_handler.warm_up()
+
     async def run_session(self) -> None:
         logger.info(f"Starting Gemini Live session with provider: {self.PROVIDER_NAME}")
         try:
@@ -58,6 +69,7 @@ class GeminiLiveProvider(BaseDialogProvider):
             # Ensure session_handler's resources are cleaned up if its run() didn't complete finally block.
             # session_handler.run() already has a comprehensive finally block.
             # Calling close_resources again here might be redundant but safe if designed idempotently.
-            if hasattr(self.session_handler, 'close_resources') and self.session_handler.pya is not None:
+            audio_handler = getattr(self.session_handler, 'audio_handler', None)
+            if audio_handler is not None and (audio_handler.audio_stream or audio_handler.output_stream):
                  logger.debug("Provider ensuring session_handler resources are closed from its own finally block.")
                  await self.session_handler.close_resources()
\ No newline at end of file
@@ -1,5 +1,46 @@
+import time
 from abc import ABC, abstractmethod
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
+
+
+class TranscriptEvent:
+    """
+    A partial or final hypothesis produced while audio is still streaming in.
+
+    Partials are revised as more audio arrives and may change; a final closes a
+    segment and is never revised. Times are seconds of audio since the stream started.
+    """
+
+    PARTIAL = "partial"
+    FINAL = "final"
+
+    def __init__(self, kind: str, text: str, start: float, end: float,
+                 confidence: Optional[float] = None, words: Optional[List[Dict[str, Any]]] = None):
+        """
+        Args:
+            kind (str): PARTIAL or FINAL.
+            text (str): The hypothesis.
+            start (float): Audio time the hypothesis starts at.
+            end (float): Audio time the hypothesis ends at.
+            confidence (Optional[float]): Mean word confidence in [0, 1], if the backend reports it.
+            words (Optional[List[Dict[str, Any]]]): Per-word details (word, start, end, conf).
+        """
+        self.kind = kind
+        self.text = text
+        self.start = start
+        self.end = end
+        self.confidence = confidence
+        self.words = words or []
+        self.emitted_at = time.perf_counter()
+
+    @property
+    def is_final(self) -> bool:
+        return self.kind == self.FINAL
+
+    def __repr__(self) -> str:
+        confidence = f", conf={self.confidence:.2f}" if self.confidence is not None else ""
+        return f"TranscriptEvent({self.kind}, {self.text!r}, {self.start:.2f}-{self.end:.2f}s{confidence})"
+
 
 class BaseRecognitionProvider(ABC):
     """
@@ -7,14 +7,41 @@ from core.logger import get_logger
 
 logger = get_logger(__name__)
 
+
+def launch_chrome() -> webdriver.Chrome:
+    chrome_options = Options()
+    chrome_options.add_argument("--use-fake-ui-for-media-stream")
+    chrome_options.add_argument("--headless=new")
+    chrome_options.add_argument(
+        "user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/58.0.3029.110 Safari/537.3"
+    )
+    chrome_options.add_experimental_option('excludeSwitches', ['enable-logging'])
+    return webdriver.Chrome(options=chrome_options)
+
+
 class DriverManager:
-    def __init__(self, wait_time: int = 10):
+    def __init__(self, wait_time: int = 10, pool=None):
+        """
+        Args:
+            wait_time (int): Seconds explicit waits on the page may take.
+            pool (Optional[DriverPool]): Take drivers from this pool of pre-launched
+                                         instances instead of launching Chrome on demand.
+        """
         self.wait_time = wait_time
+        self.pool = pool
         self.driver = None
         self.wait = None
+        # The pooled driver this manager holds, even after `driver` is cleared on an error.
+        self._leased = None
         self.setup_driver()
     
     def setup_driver(self) -> None:
+        if self.pool is not None:
+            self._setup_pooled_driver()
+            return
+
         if hasattr(self, 'driver') and self.driver:
             try:
                 self.driver.quit()
@@ -23,18 +50,8 @@ class DriverManager:
             finally:
                 self.driver = None
         
-        chrome_options = Options()
-        chrome_options.add_argument("--use-fake-ui-for-media-stream")
-        chrome_options.add_argument("--headless=new")
-        chrome_options.add_argument(
-            "user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-            "AppleWebKit/537.36 (KHTML, like Gecko) "
-            "Chrome/58.0.3029.110 Safari/537.3"
-        )
-        chrome_options.add_experimental_option('excludeSwitches', ['enable-logging'])
-        
         try:
-            self.driver = webdriver.Chrome(options=chrome_options)
+            self.driver = launch_chrome()
             self.wait = WebDriverWait(self.driver, self.wait_time)
             logger.info("Chrome WebDriver initialized/re-initialized successfully")
         except Exception as e:
@@ -42,7 +59,44 @@ class DriverManager:
             self.driver = None
             self.wait = None
             raise
-    
+
+    def _setup_pooled_driver(self) -> None:
+        # Whatever we held is broken (or we would not be here): swap in a warm one.
+        if self._leased is not None:
+            self.pool.discard(self._leased)
+            self._leased = None
+        try:
+            self._leased = self.pool.acquire(timeout=60)
+        except Exception as e:
+            logger.error(f"Failed to get a Chrome WebDriver from the pool: {e}")
+            self.driver = None
+            self.wait = None
+            raise
+        self.driver = self._leased
+        self.wait = WebDriverWait(self.driver, self.wait_time)
+        logger.info("Chrome WebDriver taken from the warm pool")
+
+    def begin_session(self) -> None:
+        """Make sure a driver is held for a listening session."""
+        if self.pool is not None and self._leased is None:
+            self.setup_driver()
+
+    def end_session(self) -> None:
+        """
+        Finish a listening session. A pooled driver is handed back, so it counts
+        towards recycling; it comes straight back on the next session unless it
+        was recycled, in which case a pre-launched one takes its place.
+        """
+        if self.pool is None or self._leased is None:
+            return
+        if self.driver is None:
+            self.pool.discard(self._leased)
+        else:
+            self.pool.release(self._leased)
+        self._leased = None
+        self.driver = None
+        self.wait = None
+
     def try_stop_js_recognition(self):
         if not hasattr(self, 'driver') or not self.driver:
             return
@@ -57,6 +111,10 @@ class DriverManager:
             pass
     
     def cleanup(self):
+        if self.pool is not None:
+            self.try_stop_js_recognition()
+            self.end_session()
+            return
         if hasattr(self, 'driver') and self.driver:
             self.try_stop_js_recognition()
             try:
@@ -0,0 +1,222 @@
+import atexit
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Optional
+
+from core.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class DriverPool:
+    """
+    Keeps headless Chrome instances launched ahead of time.
+
+    A maintenance thread launches instances in the background until `size`
+    are idle, and health-checks idle ones every `health_interval` seconds,
+    replacing any that died. Checking one out is then instant instead of a
+    multi-second Chrome cold start. An instance that has served
+    `max_sessions` sessions is quit and replaced, which caps the memory
+    Chrome accumulates over a long run.
+
+    Idle instances are handed out most-recently-returned first, so a caller
+    that checks out and returns a driver every turn keeps getting the same
+    one (with its page still loaded) until it is recycled.
+    """
+
+    def __init__(self,
+                 size: int = 1,
+                 max_sessions: int = 50,
+                 health_interval: float = 30.0,
+                 factory: Optional[Callable[[], Any]] = None):
+        """
+        Args:
+            size (int): Idle instances to keep ready.
+            max_sessions (int): Sessions an instance serves before it is recycled.
+            health_interval (float): Seconds between health checks of idle instances.
+            factory (Optional[Callable[[], Any]]): Launches one driver. Defaults to `launch_chrome`.
+        """
+        if size < 1:
+            raise ValueError("size must be at least 1.")
+        if factory is None:
+            from voice.recognition.providers.selenium_stt.driver_manager import launch_chrome
+            factory = launch_chrome
+        self.size = size
+        self.max_sessions = max_sessions
+        self.health_interval = health_interval
+        self.factory = factory
+        self.launched = 0
+        self.recycled = 0
+        self.failed_checks = 0
+
+        self._idle: Deque[Any] = deque()
+        self._sessions: Dict[int, int] = {}
+        self._launching = 0
+        self._condition = threading.Condition()
+        self._closed = False
+        self._thread = threading.Thread(target=self._maintain, name="DriverPool", daemon=True)
+        self._thread.start()
+
+    @property
+    def idle(self) -> int:
+        """Instances ready to be checked out."""
+        with self._condition:
+            return len(self._idle)
+
+    def acquire(self, timeout: Optional[float] = None):
+        """
+        Check out a healthy driver, waiting for a launch only if none is idle.
+
+        Args:
+            timeout (Optional[float]): Seconds to wait for a launch.
+
+        Returns:
+            WebDriver: The driver. Hand it back with `release`, or `discard` it if it broke.
+
+        Raises:
+            TimeoutError: If no driver became ready in time.
+            RuntimeError: If the pool is closed.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._condition:
+                while not self._idle:
+                    if self._closed:
+                        raise RuntimeError("DriverPool is closed.")
+                    # Wake the maintainer in case it is waiting out a health interval.
+                    self._condition.notify_all()
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        raise TimeoutError(f"No WebDriver ready after {timeout} s.")
+                    self._condition.wait(remaining)
+                driver = self._idle.pop()
+                self._condition.notify_all()  # the maintainer tops the pool back up
+            if self._healthy(driver):
+                return driver
+            self._quit(driver)
+
+    def release(self, driver) -> None:
+        """Return a driver after a session; it is recycled once it has served `max_sessions`."""
+        with self._condition:
+            sessions = self._sessions.get(id(driver), 0) + 1
+            if sessions < self.max_sessions and not self._closed:
+                self._sessions[id(driver)] = sessions
+                self._idle.append(driver)
+                self._condition.notify_all()
+                return
+            self.recycled += 1
+        logger.info(f"Recycling WebDriver after {sessions} sessions")
+        self._quit(driver)
+
+    def discard(self, driver) -> None:
+        """Quit a driver that failed; the pool launches a replacement in the background."""
+        self._quit(driver)
+
+    def close(self) -> None:
+        """Stop the maintenance thread and quit all idle drivers."""
+        with self._condition:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            self._condition.notify_all()
+        for driver in idle:
+            self._quit(driver)
+        self._thread.join(timeout=5)
+
+    def _maintain(self) -> None:
+        last_check = time.monotonic()
+        while True:
+            with self._condition:
+                while not self._closed and len(self._idle) + self._launching >= self.size:
+                    wait = self.health_interval - (time.monotonic() - last_check)
+                    if wait <= 0:
+                        break
+                    self._condition.wait(wait)
+                if self._closed:
+                    return
+                launch = len(self._idle) + self._launching < self.size
+                if launch:
+                    self._launching += 1
+                    idle = []
+                else:
+                    idle = list(self._idle)
+
+            if launch:
+                self._launch()
+                continue
+            for driver in idle:
+                if not self._healthy(driver):
+                    self.failed_checks += 1
+                    with self._condition:
+                        if driver not in self._idle:
+                            continue  # checked out meanwhile; acquire checks it again
+                        self._idle.remove(driver)
+                    logger.warning("Idle WebDriver failed its health check; replacing it")
+                    self._quit(driver)
+            last_check = time.monotonic()
+
+    def _launch(self) -> None:
+        start = time.perf_counter()
+        try:
+            driver = self.factory()
+        except Exception as e:
+            logger.error(f"Failed to launch a WebDriver for the pool: {e}")
+            driver = None
+        with self._condition:
+            self._launching -= 1
+            if driver is not None and not self._closed:
+                self.launched += 1
+                self._sessions[id(driver)] = 0
+                self._idle.appendleft(driver)  # behind the drivers callers are already reusing
+                self._condition.notify_all()
+                logger.info(f"Pre-launched WebDriver ready in {time.perf_counter() - start:.1f}s "
+                            f"({len(self._idle)} idle)")
+                return
+        if driver is not None:
+            self._quit(driver)
+        else:
+            time.sleep(1.0)  # do not spin if Chrome cannot start at all
+
+    @staticmethod
+    def _healthy(driver) -> bool:
+        try:
+            driver.execute_script("return 1")
+            return True
+        except Exception:
+            return False
+
+    def _quit(self, driver) -> None:
+        with self._condition:
+            self._sessions.pop(id(driver), None)
+            self._condition.notify_all()
+
+        # Quitting Chrome can take a moment; never make the caller wait for it.
+        def quit_driver():
+            try:
+                driver.quit()
+            except Exception as e:
+                logger.debug(f"Error quitting WebDriver: {e}")
+
+        threading.Thread(target=quit_driver, name="DriverPoolQuit", daemon=True).start()
+
+
+_shared_pool: Optional[DriverPool] = None
+_shared_pool_lock = threading.Lock()
+
+
+def get_driver_pool(size: int = 1, max_sessions: int = 50) -> DriverPool:
+    """
+    Get the process-wide WebDriver pool, creating it on first use.
+
+    The size and session limit only apply when it is created.
+
+    Returns:
+        DriverPool: The shared pool (already launching in the background).
+    """
+    global _shared_pool
+    with _shared_pool_lock:
+        if _shared_pool is None:
+            _shared_pool = DriverPool(size, max_sessions)
+            atexit.register(_shared_pool.close)
+        return _shared_pool
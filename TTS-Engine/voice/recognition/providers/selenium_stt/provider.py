@@ -4,7 +4,8 @@ from typing import Optional, Dict, Any
 from core.logger import get_logger
 from voice.recognition.base import BaseRecognitionProvider
 from voice.recognition.providers.selenium_stt.driver_manager import DriverManager
-from voice.recognition.providers.selenium_stt.recognition import RecognitionHandler
+from voice.recognition.providers.selenium_stt.driver_pool import get_driver_pool
+from voice.recognition.providers.selenium_stt.recognition import EventRecognitionHandler, RecognitionHandler
 
 logger = get_logger(__name__)
 
@@ -17,11 +18,29 @@ class SeleniumSTTProvider(BaseRecognitionProvider):
         "hi-IN": "Hindi (India)",
     }
 
-    def __init__(self, language: str = "en-US", wait_time: int = 10, quiet_timeout_seconds: float = 7.0, website_path: Optional[str] = None):
+    def __init__(self, language: str = "en-US", wait_time: int = 10, quiet_timeout_seconds: float = 7.0, website_path: Optional[str] = None,
+                 max_turn_seconds: float = 30.0, event_driven: bool = True, warm_drivers: int = 1, max_driver_sessions: int = 50):
+        """
+        Args:
+            language (str): Recognition language code, e.g. "en-US".
+            wait_time (int): Seconds to wait for the page and for recording to start.
+            quiet_timeout_seconds (float): Give up a turn after this long without speech.
+            website_path (Optional[str]): Speech page to load; defaults to the bundled index.html.
+            max_turn_seconds (float): Longest a turn waits for the browser's final result once
+                                      speech was heard; the last interim text is returned.
+            event_driven (bool): Receive recognition events pushed by the page over a local
+                                 websocket, loading the page once. False polls the DOM
+                                 through WebDriver every 100 ms, as older pages require.
+            warm_drivers (int): Chrome instances kept launched in the background, so a crashed
+                                browser is replaced instantly. 0 launches Chrome on demand.
+            max_driver_sessions (int): Listening sessions a Chrome instance serves before it is
+                                       replaced, to cap its memory growth.
+        """
         super().__init__()
         self.language = language
         self.wait_time = wait_time
         self.quiet_timeout_seconds = quiet_timeout_seconds
+        self.max_turn_seconds = max_turn_seconds
 
         default_local_html_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "assets", "index.html")
         if website_path is None:
@@ -29,11 +48,20 @@ class SeleniumSTTProvider(BaseRecognitionProvider):
         else:
             self.raw_website_path = website_path
         
-        self.driver_manager = DriverManager(wait_time)
-        self.recognition_handler = RecognitionHandler(self)
+        pool = get_driver_pool(warm_drivers, max_driver_sessions) if warm_drivers > 0 else None
+        self.driver_manager = DriverManager(wait_time, pool)
+        self.recognition_handler = EventRecognitionHandler(self) if event_driven else RecognitionHandler(self)
 
     def listen(self, prints: bool = False) -> Optional[str]:
-        result = self.recognition_handler.main()
+        try:
+            self.driver_manager.begin_session()
+        except Exception as e:
+            logger.error(f"No WebDriver available for listening: {e}")
+            return None
+        try:
+            result = self.recognition_handler.main()
+        finally:
+            self.driver_manager.end_session()
 
         if result is None:
             logger.error("Speech recognition failed critically. WebDriver might be re-initialized on next call.")
@@ -54,3 +82,5 @@ class SeleniumSTTProvider(BaseRecognitionProvider):
         if hasattr(self, 'driver_manager'):
             logger.info("Closing SeleniumSTTProvider resources...")
             self.driver_manager.cleanup()
+        if isinstance(getattr(self, 'recognition_handler', None), EventRecognitionHandler):
+            self.recognition_handler.close()
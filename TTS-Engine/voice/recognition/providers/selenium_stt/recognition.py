@@ -10,9 +10,24 @@ from selenium.common.exceptions import TimeoutException, WebDriverException
 from core.logger import get_logger
 from voice.recognition.providers.selenium_stt.language_handler import LanguageHandler
 from voice.recognition.providers.selenium_stt.utils import stream_text
+from voice.browser_bridge import BrowserSpeechBridge
 
 logger = get_logger(__name__)
 
+def resolve_page_url(raw_website_path: str) -> Optional[str]:
+    if "://" in raw_website_path:
+        return raw_website_path
+    abs_path = os.path.abspath(raw_website_path)
+    if not os.path.exists(abs_path):
+        logger.error(f"HTML file not found: {abs_path}")
+        return None
+    return Path(abs_path).as_uri()
+
+
+def clear_line(text: str = "") -> None:
+    print("\r" + " " * (len(text) + 30 if text else 70) + "\r", end="", flush=True)
+
+
 class RecognitionHandler:
     def __init__(self, provider):
         self.provider = provider
@@ -38,15 +53,9 @@ class RecognitionHandler:
                 return None
 
         try:
-            url_to_load: str
-            if "://" in self.provider.raw_website_path:
-                url_to_load = self.provider.raw_website_path
-            else:
-                abs_path = os.path.abspath(self.provider.raw_website_path)
-                if not os.path.exists(abs_path):
-                    logger.error(f"HTML file not found: {abs_path}")
-                    return None
-                url_to_load = Path(abs_path).as_uri()
+            url_to_load = resolve_page_url(self.provider.raw_website_path)
+            if url_to_load is None:
+                return None
             
             current_url = ""
             try:
@@ -124,10 +133,7 @@ class RecognitionHandler:
             self.provider.driver_manager.try_stop_js_recognition() 
             final_text = self.get_text()
 
-            clear_length = 70
-            if last_processed_text:
-                clear_length = len(last_processed_text) + 30
-            print("\r" + " " * clear_length + "\r", end="", flush=True)
+            clear_line(last_processed_text)
             
             return final_text
 
@@ -140,3 +146,108 @@ class RecognitionHandler:
             if hasattr(self.provider.driver_manager, 'driver') and self.provider.driver_manager.driver:
                 self.provider.driver_manager.try_stop_js_recognition()
             return None
+
+
+class EventRecognitionHandler:
+    """
+    Runs listening turns over a `BrowserSpeechBridge` instead of polling the page.
+
+    The page is loaded once, with the bridge address in its URL, and stays
+    loaded across turns. Each turn sends a start command carrying the
+    language and then blocks on the events the page pushes, returning as soon
+    as the browser marks the result final. WebDriver is only used to (re)load
+    the page, so a turn costs no WebDriver round trips and no polling delay.
+    """
+
+    # Browser errors that just mean nothing was said.
+    SILENT_ERRORS = ("no-speech", "aborted")
+
+    def __init__(self, provider, bridge: Optional[BrowserSpeechBridge] = None):
+        self.provider = provider
+        self.bridge = bridge or BrowserSpeechBridge()
+        self._page_driver = None
+
+    def ensure_page(self) -> bool:
+        """Load the page into the current driver if it is not already connected to the bridge."""
+        driver_manager = self.provider.driver_manager
+        if not driver_manager.driver:
+            try:
+                driver_manager.setup_driver()
+            except Exception as e:
+                logger.error(f"Failed to setup driver: {e}")
+                return False
+        if self.bridge.connected and self._page_driver is driver_manager.driver:
+            return True
+
+        url = resolve_page_url(self.provider.raw_website_path)
+        if url is None:
+            return False
+        connections = self.bridge.connections
+        try:
+            driver_manager.driver.get(self.bridge.page_url(url))
+        except WebDriverException as e:
+            logger.error(f"WebDriver failed to load the speech page: {e}")
+            driver_manager.driver = None
+            return False
+        if not self.bridge.wait_connected(self.provider.wait_time, after=connections):
+            logger.error("Speech page did not connect to the bridge.")
+            return False
+        self._page_driver = driver_manager.driver
+        return True
+
+    def main(self) -> Optional[str]:
+        if not self.ensure_page():
+            return None
+
+        self.bridge.drain()
+        if not self.bridge.start_recognition(self.provider.language):
+            return None
+        event = self.bridge.next_event(self.provider.wait_time)
+        if event is None or event.get("type") != "start":
+            logger.warning("Recording did not start in time.")
+            self.bridge.stop_recognition()
+            return "" if event is None or event.get("type") != BrowserSpeechBridge.DISCONNECTED else None
+
+        print("\033[94m\rListening...", end='', flush=True)
+        text = ""
+        started = time.monotonic()
+        quiet_deadline = started + self.provider.quiet_timeout_seconds
+        # The browser normally ends the turn once speech was heard, but a page that
+        # never sends the final result must not hold the turn open forever.
+        turn_deadline = started + self.provider.max_turn_seconds
+        try:
+            while True:
+                deadline = turn_deadline if text else min(quiet_deadline, turn_deadline)
+                event = self.bridge.next_event(max(0.0, deadline - time.monotonic()))
+                if event is None and text:
+                    logger.warning(f"No final result within {self.provider.max_turn_seconds} s; "
+                                   "using the last interim text.")
+                    self.bridge.stop_recognition()
+                    return text
+                if event is None:
+                    clear_line()
+                    print("Quiet timeout: No speech detected in this attempt.", flush=True)
+                    self.bridge.stop_recognition()
+                    return ""
+                kind = event.get("type")
+                if kind == "result":
+                    text = event.get("transcript", "")
+                    if event.get("final"):
+                        self.bridge.stop_recognition()
+                        return text
+                    stream_text(text)
+                elif kind == "end":
+                    return text
+                elif kind == "error":
+                    if event.get("error") in self.SILENT_ERRORS:
+                        return text
+                    logger.error(f"Browser speech recognition error: {event.get('error')}")
+                    return None
+                elif kind == BrowserSpeechBridge.DISCONNECTED:
+                    logger.error("Speech page disconnected during recording; it will be reloaded on the next call.")
+                    return None
+        finally:
+            clear_line(text)
+
+    def close(self) -> None:
+        self.bridge.close()
@@ -1,10 +1,12 @@
+import json
 import os
-import pyaudio
-from typing import Optional, Dict, Any, Generator
-from vosk import Model, KaldiRecognizer
-import ast
+import numpy as np
+from typing import Optional, Dict, Any, Generator, Iterable, Iterator, AsyncIterator, List, Union
 from core.logger import get_logger
-from voice.recognition.base import BaseRecognitionProvider
+from utils.async_tools import iterate_in_thread
+from voice.capture import MicrophoneCapture, get_microphone_capture
+from voice.recognition.base import BaseRecognitionProvider, TranscriptEvent
+from voice.vosk_pool import RecognizerPool, get_recognizer_pool, get_vosk_model, transcribe_file
 
 logger = get_logger(__name__)
 
@@ -12,6 +14,93 @@ class ModelNotFoundError(Exception):
     """Exception raised when a Vosk model is not found."""
     pass
 
+PCMChunk = Union[bytes, np.ndarray]
+
+
+def _mean_confidence(words: List[Dict[str, Any]]) -> Optional[float]:
+    confidences = [word["conf"] for word in words if "conf" in word]
+    return sum(confidences) / len(confidences) if confidences else None
+
+
+class TranscriptStream:
+    """
+    Partial and final transcripts of a PCM source, as they are recognized.
+
+    Iterate it with `for` from a thread, or with `async for` from a coroutine,
+    in which case reading and decoding run on a worker thread. Either way the
+    source is consumed once.
+    """
+
+    def __init__(self, pool: RecognizerPool, source: Iterable[PCMChunk],
+                 sample_rate: int = 16000, partials: bool = True):
+        """
+        Args:
+            pool (RecognizerPool): A recognizer is checked out of it while the stream is iterated.
+            source (Iterable[PCMChunk]): Mono 16-bit PCM chunks, as bytes or int16 arrays.
+            sample_rate (int): Rate of the source; must match the recognizer's.
+            partials (bool): Emit partial events, not just finals.
+        """
+        self.pool = pool
+        self.source = source
+        self.sample_rate = sample_rate
+        self.partials = partials
+        self._samples_fed = 0
+        self._segment_start = 0.0
+        self._last_partial = ""
+
+    def __iter__(self) -> Iterator[TranscriptEvent]:
+        with self.pool.recognizer() as recognizer:
+            for chunk in self.source:
+                if isinstance(chunk, np.ndarray):
+                    chunk = np.ascontiguousarray(chunk, dtype="<i2").tobytes()
+                self._samples_fed += len(chunk) // 2
+                # AcceptWaveform returns True when Kaldi closed a segment at a pause.
+                if recognizer.AcceptWaveform(chunk):
+                    event = self._final(recognizer.Result())
+                    if event is not None:
+                        yield event
+                elif self.partials:
+                    event = self._partial(recognizer.PartialResult())
+                    if event is not None:
+                        yield event
+            event = self._final(recognizer.FinalResult())
+            if event is not None:
+                yield event
+
+    async def __aiter__(self) -> AsyncIterator[TranscriptEvent]:
+        async for event in iterate_in_thread(iter(self)):
+            yield event
+
+    @property
+    def position(self) -> float:
+        """Seconds of audio decoded so far."""
+        return self._samples_fed / float(self.sample_rate)
+
+    def _final(self, result: str) -> Optional[TranscriptEvent]:
+        result = json.loads(result)
+        self._last_partial = ""
+        start, self._segment_start = self._segment_start, self.position
+        text = result.get("text", "")
+        if not text:
+            return None
+        words = result.get("result", [])
+        if words:
+            start, end = words[0]["start"], words[-1]["end"]
+        else:
+            end = self.position
+        return TranscriptEvent(TranscriptEvent.FINAL, text, start, end, _mean_confidence(words), words)
+
+    def _partial(self, result: str) -> Optional[TranscriptEvent]:
+        result = json.loads(result)
+        text = result.get("partial", "")
+        if not text or text == self._last_partial:
+            return None
+        self._last_partial = text
+        words = result.get("partial_result", [])
+        start = words[0]["start"] if words else self._segment_start
+        return TranscriptEvent(TranscriptEvent.PARTIAL, text, start, self.position, _mean_confidence(words), words)
+
+
 class VoskSTTProvider(BaseRecognitionProvider):
     """
     Speech-to-Text provider using Vosk for offline speech recognition.
@@ -21,13 +110,16 @@ class VoskSTTProvider(BaseRecognitionProvider):
     """
 
     PROVIDER_NAME = "vosk"
+    SAMPLE_RATE = 16000
     
     # Default model mappings
     DEFAULT_MODEL_MAPPINGS = {
         "english-small": "voice/voices/assets/models/vosk/vosk-model-small-en-us-0.15",
     }
     
-    def __init__(self, model_name=None, model_path=None, custom_mappings=None):
+    def __init__(self, model_name=None, model_path=None, custom_mappings=None,
+                 frame_ms: int = 20, pre_roll_ms: int = 300, capture: Optional[MicrophoneCapture] = None,
+                 pool_size: int = 4):
         """
         Initialize the Vosk STT provider.
         
@@ -35,6 +127,13 @@ class VoskSTTProvider(BaseRecognitionProvider):
             model_name (str, optional): Name of the model to use from the mapping.
             model_path (str, optional): Direct path to a model directory.
             custom_mappings (dict, optional): Custom model name to path mappings.
+            frame_ms (int): Microphone frame size; smaller frames lower latency.
+            pre_roll_ms (int): Audio from before each `listen()` call to include, so the
+                               first syllable is not lost.
+            capture (MicrophoneCapture, optional): Capture to read from. Defaults to the
+                                                   process-wide microphone capture.
+            pool_size (int): Streams that can be transcribed at the same time. Providers
+                             using the same model share one pool of this size.
             
         Raises:
             ValueError: If both model_name and model_path are provided.
@@ -52,16 +151,20 @@ class VoskSTTProvider(BaseRecognitionProvider):
         
         # Initialize Vosk model
         try:
-            self.model = Model(self.model_path)
-            self.recognizer = KaldiRecognizer(self.model, 16000)
+            # The model is loaded once per process; concurrent streams each check
+            # a recognizer out of the shared pool instead of queueing on one.
+            self.model = get_vosk_model(self.model_path)
+            self.pool = get_recognizer_pool(self.model_path, pool_size, self.SAMPLE_RATE)
             logger.info(f"Vosk model initialized from: {self.model_path}")
         except Exception as e:
             logger.error(f"Failed to initialize Vosk model: {e}")
             raise
         
-        # Initialize PyAudio
-        self.audio = pyaudio.PyAudio()
-        self.stream = None
+        # The microphone is opened once and recorded continuously; turns are
+        # positions in its ring buffer.
+        self.pre_roll_ms = pre_roll_ms
+        self.capture = capture or get_microphone_capture(self.SAMPLE_RATE, frame_ms)
+        self._consumed_until = 0
         
     def _resolve_model_path(self, model_name, model_path):
         """
@@ -107,62 +210,57 @@ class VoskSTTProvider(BaseRecognitionProvider):
             
         return resolved_path
     
-    def _start_stream(self):
-        """Start the audio stream if not already started."""
-        if self.stream is None or not self.stream.is_active():
-            try:
-                self.stream = self.audio.open(
-                    format=pyaudio.paInt16, 
-                    channels=1, 
-                    rate=16000, 
-                    input=True, 
-                    frames_per_buffer=8192
-                )
-                logger.debug("Vosk audio stream started.")
-            except Exception as e:
-                logger.error(f"Failed to open Vosk audio stream: {e}")
-                self.stream = None
-                raise
-    
-    def _stop_listening_stream(self):
-        """Stop the audio stream and release the microphone resource gently."""
-        if self.stream and self.stream.is_active():
-            try:
-                self.stream.stop_stream()
-                self.stream.close()
-                logger.debug("Vosk audio stream stopped and closed.")
-            except Exception as e:
-                logger.error(f"Error stopping/closing Vosk audio stream: {e}")
-        self.stream = None
+    def microphone_chunks(self, pre_roll_ms: Optional[int] = None) -> Generator[np.ndarray, None, None]:
+        """
+        Yield microphone audio from a turn boundary marked now, indefinitely.
 
-    
-    def _speech_to_text_generator(self, prints: bool = True) -> Generator[str, None, None]:
+        Args:
+            pre_roll_ms (Optional[int]): Audio from before the boundary to include;
+                                         defaults to the provider's `pre_roll_ms`.
         """
-        Generate transcribed text from speech.
-        
+        start = self.capture.mark(self.pre_roll_ms if pre_roll_ms is None else pre_roll_ms)
+        # Pre-roll never reaches back into audio an earlier turn already decoded.
+        start = max(start, self._consumed_until)
+        for chunk in self.capture.chunks(start):
+            start += len(chunk)
+            self._consumed_until = start
+            yield chunk
+
+    def stream_transcripts(self, source: Optional[Iterable[PCMChunk]] = None, partials: bool = True) -> TranscriptStream:
+        """
+        Transcribe continuously, emitting partial and final results as they are recognized.
+
+        Use `for event in provider.stream_transcripts()` or `async for` the same call.
+        Downstream stages can act on partials before the speaker has finished.
+
         Args:
-            prints (bool): Whether to print the transcription results.
-            
-        Yields:
-            str: The transcribed text in lowercase.
+            source (Optional[Iterable[PCMChunk]]): 16 kHz mono 16-bit PCM chunks (bytes or
+                int16 arrays), e.g. from a call transport or a file. Defaults to the microphone from
+                now, plus `pre_roll_ms` of earlier audio, until the caller stops iterating.
+            partials (bool): Emit partial events, not just finals.
+
+        Returns:
+            TranscriptStream: The events, iterable synchronously or asynchronously.
         """
-        self._start_stream()
-        
-        while True:
-            data = self.stream.read(8192)
-            if self.recognizer.AcceptWaveform(data):
-                result = self.recognizer.Result()
-                result_dict = ast.literal_eval(result)
-                if 'text' in result_dict and result_dict['text']:
-                    if prints: 
-                        print("\rTranscript: " + result_dict['text'])
-                    yield result_dict['text'].lower()
-            else:
-                if prints: 
-                    partial = self.recognizer.PartialResult()
-                    partial_text = partial.split('"')[-2] if '"' in partial else ""
-                    print("\rSpeaking: " + partial_text, end='', flush=True)
-    
+        return TranscriptStream(self.pool, source if source is not None else self.microphone_chunks(),
+                                self.SAMPLE_RATE, partials)
+
+    def transcribe_file(self, path: str) -> Dict[str, Any]:
+        """
+        Transcribe a stored recording (WAV, MP3, ...) instead of the microphone.
+
+        The file is decoded and resampled block by block, so long recordings are
+        fine. For many files use `voice.vosk_pool.BatchTranscriber` or
+        `scripts/transcribe_batch.py`.
+
+        Args:
+            path (str): Audio file.
+
+        Returns:
+            Dict[str, Any]: `text`, `words` with timings, `audio_seconds`, `rtf`, or `error`.
+        """
+        return transcribe_file(self.pool, path)
+
     def listen(self, prints: bool = False) -> Optional[str]:
         """
         Listen for speech and return the transcribed text.
@@ -174,23 +272,26 @@ class VoskSTTProvider(BaseRecognitionProvider):
             Optional[str]: The transcribed text. Returns an empty string "" for silence 
                            or no speech detected, and None if a recognition error occurred.
         """
-        recognized_text = None
+        events = iter(self.stream_transcripts(partials=prints))
         try:
-            for text_segment in self._speech_to_text_generator(prints):
-                if text_segment:
-                    recognized_text = text_segment
-                    break
-            
-            if recognized_text is None:
-                 recognized_text = ""
-
-            return recognized_text
+            for event in events:
+                if event.is_final:
+                    if prints:
+                        print("\rTranscript: " + event.text)
+                    return event.text.lower()
+                print("\rSpeaking: " + event.text, end='', flush=True)
+            return ""
         except Exception as e:
             logger.error(f"Error during Vosk speech recognition: {e}")
             return None
         finally:
-            self._stop_listening_stream()
-    
+            # Stops reading; the microphone keeps recording for the next turn.
+            events.close()
+
+    def close(self) -> None:
+        """Release the microphone."""
+        self.capture.close()
+
     def get_available_languages(self) -> Dict[str, Any]:
         """
         Get a list of available languages for this provider.
@@ -199,19 +300,3 @@ class VoskSTTProvider(BaseRecognitionProvider):
             Dict[str, Any]: Dictionary mapping language codes to their details.
         """
         return {name: path for name, path in self.model_mappings.items()}
-    
-    def __del__(self):
-        """Clean up resources when the provider is destroyed."""
-        if hasattr(self, 'stream') and self.stream:
-            try:
-                self.stream.stop_stream()
-                self.stream.close()
-            except Exception as e:
-                logger.error(f"Error closing audio stream: {e}")
-                
-        if hasattr(self, 'audio'):
-            try:
-                self.audio.terminate()
-                logger.info("PyAudio terminated successfully")
-            except Exception as e:
-                logger.error(f"Error terminating PyAudio: {e}")
@@ -0,0 +1,19 @@
+from .transport import MediaTransport, QueueTransport
+from .responders import BaseResponder, OpenAIResponder, EchoResponder
+from .session import ConversationSession
+from .runtime import SessionRuntime, SessionRejected, get_shared_tts_provider
+from .twilio import TwilioMediaTransport, serve_twilio
+
+__all__ = [
+    "MediaTransport",
+    "QueueTransport",
+    "BaseResponder",
+    "OpenAIResponder",
+    "EchoResponder",
+    "ConversationSession",
+    "SessionRuntime",
+    "SessionRejected",
+    "get_shared_tts_provider",
+    "TwilioMediaTransport",
+    "serve_twilio",
+]
@@ -0,0 +1,82 @@
+from abc import ABC, abstractmethod
+from typing import AsyncIterator, Dict, List, Optional
+
+from core.config import AppConfig
+from core.logger import get_logger
+from core.model_registry import model_registry
+
+logger = get_logger(__name__)
+
+
+class BaseResponder(ABC):
+    """Produces the assistant's reply to a conversation as a stream of text deltas."""
+
+    @abstractmethod
+    def astream(self, messages: List[Dict[str, str]]) -> AsyncIterator[str]:
+        """
+        Stream the reply to a conversation.
+
+        Args:
+            messages (List[Dict[str, str]]): Chat history as role/content dicts,
+                                             ending with the user's latest turn.
+
+        Returns:
+            AsyncIterator[str]: Text fragments in arrival order.
+        """
+        pass
+
+
+class OpenAIResponder(BaseResponder):
+    """
+    Streams replies from an OpenAI-compatible chat completions endpoint.
+
+    Every session talks through one `AsyncOpenAI` client, built once through
+    the model registry, so they share its connection pool.
+    """
+
+    def __init__(self,
+                 model: str = AppConfig.LLM_MODEL_NAME,
+                 endpoint: str = AppConfig.LLM_ENDPOINT,
+                 api_key: Optional[str] = AppConfig.LLM_API_KEY,
+                 system_prompt: Optional[str] = "You are a helpful voice assistant on a phone call. Keep replies short."):
+        """
+        Args:
+            model (str): Model name sent with each request.
+            endpoint (str): Base URL of the API.
+            api_key (Optional[str]): API key; GITHUB_TOKEN or API_TOKEN by default.
+            system_prompt (Optional[str]): Prepended to every conversation.
+        """
+        if not api_key:
+            raise ValueError("No LLM API key configured; set GITHUB_TOKEN or API_TOKEN.")
+        self.model = model
+        self.system_prompt = system_prompt
+        self.client = model_registry.get_or_create(
+            f"openai_async_client:{endpoint}", lambda: self._create_client(endpoint, api_key))
+
+    @staticmethod
+    def _create_client(endpoint: str, api_key: str):
+        from openai import AsyncOpenAI
+        return AsyncOpenAI(base_url=endpoint, api_key=api_key)
+
+    async def astream(self, messages: List[Dict[str, str]]) -> AsyncIterator[str]:
+        if self.system_prompt:
+            messages = [{"role": "system", "content": self.system_prompt}] + messages
+        response = await self.client.chat.completions.create(messages=messages, model=self.model, stream=True)
+        async for chunk in response:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if delta:
+                yield delta
+
+
+class EchoResponder(BaseResponder):
+    """Repeats the caller's last turn back, word by word. For local testing without an LLM."""
+
+    def __init__(self, prefix: str = "You said:"):
+        self.prefix = prefix
+
+    async def astream(self, messages: List[Dict[str, str]]) -> AsyncIterator[str]:
+        text = f"{self.prefix} {messages[-1]['content']}." if messages else self.prefix
+        for word in text.split(" "):
+            yield word + " "
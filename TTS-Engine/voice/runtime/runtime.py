@@ -0,0 +1,215 @@
+import asyncio
+import itertools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from core.config import AppConfig
+from core.logger import get_logger
+from core.model_registry import model_registry
+from voice.runtime.responders import BaseResponder
+from voice.runtime.session import ConversationSession
+from voice.runtime.transport import MediaTransport
+from voice.text_to_speech.base import BaseTTSProvider
+from voice.transcription import BaseTranscriber
+
+logger = get_logger(__name__)
+
+
+class SessionRejected(Exception):
+    """Raised when the runtime is at capacity or shutting down and cannot take a call."""
+    pass
+
+
+def default_transcriber_factory() -> BaseTranscriber:
+    """A Vosk transcriber per session; the model itself is loaded once through the registry."""
+    from voice.transcription import VoskTranscriber
+    return VoskTranscriber(AppConfig.VOSK_MODEL_PATH)
+
+
+def get_shared_tts_provider(provider_name: str) -> BaseTTSProvider:
+    """
+    Get the process-wide instance of a TTS provider, creating it on first use.
+
+    Sessions that use the same provider share one instance, and with it its
+    HTTP connection pool and the audio cache.
+
+    Args:
+        provider_name (str): A name from `TTSProviderManager.PROVIDERS`.
+
+    Returns:
+        BaseTTSProvider: The shared provider.
+    """
+    from voice.text_to_speech.active_provider import tts_manager
+    return model_registry.get_or_create(f"tts:{provider_name}", lambda: tts_manager.create_provider(provider_name))
+
+
+class SessionRuntime:
+    """
+    Runs many concurrent conversations on one asyncio event loop.
+
+    Each accepted call gets its own `ConversationSession`. The heavy parts are
+    shared across sessions: TTS providers (and their connection pools) come
+    from the model registry, transcription and audio decoding run on one
+    bounded thread pool, and a semaphore caps synthesis requests in flight so a
+    burst of replies cannot swamp the provider. Calls beyond `max_sessions` are
+    turned away with `SessionRejected` instead of degrading everyone else.
+
+    A session's transcriber and provider are built on the thread pool, never
+    on the event loop: building a recognizer (or loading its model on first
+    use) would otherwise stall the media of every live call. `prewarm` loads
+    the model and the default provider before the first call arrives.
+    """
+
+    def __init__(self,
+                 responder: BaseResponder,
+                 transcriber_factory: Callable[[], BaseTranscriber] = default_transcriber_factory,
+                 provider_resolver: Callable[[str], BaseTTSProvider] = get_shared_tts_provider,
+                 default_provider: str = "edge_tts",
+                 max_sessions: int = AppConfig.RUNTIME_MAX_SESSIONS,
+                 max_concurrent_synthesis: int = AppConfig.RUNTIME_MAX_CONCURRENT_SYNTHESIS,
+                 decode_workers: int = AppConfig.RUNTIME_DECODE_WORKERS,
+                 **session_options: Any):
+        """
+        Initialize the runtime.
+
+        Args:
+            responder (BaseResponder): Produces replies for every session.
+            transcriber_factory (Callable[[], BaseTranscriber]): Builds one transcriber per session.
+            provider_resolver (Callable[[str], BaseTTSProvider]): Maps a provider name to the
+                                                                  (shared) provider instance.
+            default_provider (str): Provider used when a call does not ask for one.
+            max_sessions (int): Calls served at the same time.
+            max_concurrent_synthesis (int): Synthesis requests in flight across all sessions.
+            decode_workers (int): Threads for transcription and audio decoding.
+            **session_options: Passed to every `ConversationSession`, e.g. `max_inbound_frames`.
+        """
+        self.responder = responder
+        self.transcriber_factory = transcriber_factory
+        self.provider_resolver = provider_resolver
+        self.default_provider = default_provider
+        self.max_sessions = max_sessions
+        self.session_options = session_options
+
+        self.executor = ThreadPoolExecutor(max_workers=decode_workers, thread_name_prefix="SessionDecode")
+        self.synthesis_slots = asyncio.Semaphore(max_concurrent_synthesis)
+        self.sessions: Dict[str, ConversationSession] = {}
+        self._serving: Dict[str, asyncio.Task] = {}
+        self.accepted = 0
+        self.rejected = 0
+        self._ids = itertools.count(1)
+        self._draining = False
+        # Slots reserved by calls whose components are still being built.
+        self._admitting = 0
+        self._prewarmed = False
+
+    @property
+    def active_sessions(self) -> int:
+        """Number of calls currently being served."""
+        return len(self.sessions)
+
+    async def prewarm(self) -> None:
+        """
+        Load the transcription model and the default TTS provider on the thread pool.
+
+        Call it when the server starts so the first call does not pay for the
+        loads. Later calls return at once.
+        """
+        if self._prewarmed:
+            return
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self.executor, self._build_components, None)
+        self._prewarmed = True
+
+    def _build_components(self, provider_name: Optional[str]):
+        # Runs on the executor: recognizers and providers can take a while to build.
+        return self.transcriber_factory(), self.provider_resolver(provider_name or self.default_provider)
+
+    async def admit(self, transport: MediaTransport, session_id: Optional[str] = None,
+                    provider_name: Optional[str] = None, voice: Optional[str] = None) -> ConversationSession:
+        """
+        Reserve a slot for a call and build its session off the event loop.
+
+        Args:
+            transport (MediaTransport): The call's audio connection.
+            session_id (Optional[str]): Identifier for the call; generated if omitted.
+            provider_name (Optional[str]): TTS provider for this call.
+            voice (Optional[str]): Voice for this call.
+
+        Returns:
+            ConversationSession: The session, registered but not running yet.
+
+        Raises:
+            SessionRejected: If the runtime is full or shutting down.
+        """
+        if self._draining or len(self.sessions) + self._admitting >= self.max_sessions:
+            self.rejected += 1
+            reason = "shutting down" if self._draining else f"at capacity ({self.max_sessions} sessions)"
+            logger.warning(f"Rejected call: runtime is {reason}")
+            raise SessionRejected(f"Runtime is {reason}.")
+
+        session_id = session_id or f"session-{next(self._ids)}"
+        self._admitting += 1
+        try:
+            loop = asyncio.get_running_loop()
+            transcriber, provider = await loop.run_in_executor(self.executor, self._build_components, provider_name)
+        finally:
+            self._admitting -= 1
+        session = ConversationSession(
+            session_id, transport,
+            transcriber=transcriber,
+            provider=provider,
+            responder=self.responder,
+            voice=voice,
+            executor=self.executor,
+            synthesis_slots=self.synthesis_slots,
+            **self.session_options)
+        self.sessions[session_id] = session
+        self.accepted += 1
+        logger.info(f"Admitted {session_id} ({len(self.sessions)}/{self.max_sessions} active)")
+        return session
+
+    async def serve(self, transport: MediaTransport, **admit_kwargs: Any) -> ConversationSession:
+        """
+        Admit a call and converse until it ends.
+
+        Rejected calls have their transport closed before `SessionRejected` is raised.
+
+        Returns:
+            ConversationSession: The finished session, for its stats.
+        """
+        try:
+            session = await self.admit(transport, **admit_kwargs)
+        except SessionRejected:
+            await transport.close()
+            raise
+        self._serving[session.session_id] = asyncio.current_task()
+        try:
+            await session.run()
+        finally:
+            self.sessions.pop(session.session_id, None)
+            self._serving.pop(session.session_id, None)
+        return session
+
+    def stats(self) -> Dict[str, Any]:
+        """Return runtime-wide counters and each active session's stats."""
+        return {
+            "active": len(self.sessions),
+            "max_sessions": self.max_sessions,
+            "accepted": self.accepted,
+            "rejected": self.rejected,
+            "dropped_frames": sum(session.dropped_frames for session in self.sessions.values()),
+            "sessions": [session.stats() for session in self.sessions.values()],
+        }
+
+    async def shutdown(self, grace_period: float = 5.0) -> None:
+        """
+        Stop admitting calls, give active ones `grace_period` seconds to finish, then cancel them.
+        """
+        self._draining = True
+        tasks = list(self._serving.values())
+        if tasks:
+            _, pending = await asyncio.wait(tasks, timeout=grace_period)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+        self.executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,270 @@
+import asyncio
+import time
+from concurrent.futures import Executor
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from core.logger import get_logger
+from voice.runtime.responders import BaseResponder
+from voice.runtime.transport import MediaTransport
+from voice.text_to_speech.base import BaseTTSProvider
+from voice.text_to_speech.streaming import LatencyTrace, SentenceChunker
+from voice.transcription import BaseTranscriber
+from voice.vad import Utterance, VADEndpointer
+
+logger = get_logger(__name__)
+
+# Pushed through the session queues to mark a hangup or the end of a reply.
+_END = object()
+
+
+class ConversationSession:
+    """
+    One caller's conversation, run as tasks on the runtime's event loop.
+
+    Everything that changes per turn lives here: the endpointer and its ring
+    buffer, the transcriber's decoder state, the chat history and the reply in
+    flight. Models, TTS providers, the LLM client and the worker threads are
+    passed in and shared with every other session.
+
+    A reader task moves caller audio into a bounded queue; when the session
+    falls behind, the oldest frames are dropped and counted rather than
+    letting the backlog grow without limit. Reply audio flows through a second
+    bounded queue, so synthesis never runs more than `max_pending_sentences`
+    ahead of what the transport has accepted.
+    """
+
+    def __init__(self,
+                 session_id: str,
+                 transport: MediaTransport,
+                 transcriber: BaseTranscriber,
+                 provider: BaseTTSProvider,
+                 responder: BaseResponder,
+                 voice: Optional[str] = None,
+                 executor: Optional[Executor] = None,
+                 synthesis_slots: Optional[asyncio.Semaphore] = None,
+                 max_inbound_frames: int = 250,
+                 max_pending_sentences: int = 2,
+                 feed_interval_ms: int = 100,
+                 endpointer: Optional[VADEndpointer] = None):
+        """
+        Initialize the session. Nothing runs until `run` is awaited.
+
+        Args:
+            session_id (str): Identifier used in logs and stats.
+            transport (MediaTransport): The call's audio connection.
+            transcriber (BaseTranscriber): Transcriber owned by this session.
+            provider (BaseTTSProvider): TTS provider; may be shared between sessions.
+            responder (BaseResponder): Produces the replies; may be shared between sessions.
+            voice (Optional[str]): Voice passed through to the provider.
+            executor (Optional[Executor]): Runs transcription and audio decoding.
+                                           None uses the loop's default executor.
+            synthesis_slots (Optional[asyncio.Semaphore]): Limits synthesis requests across sessions.
+            max_inbound_frames (int): Caller frames buffered before the oldest are dropped.
+            max_pending_sentences (int): Synthesized sentences waiting for the transport
+                                         before synthesis pauses.
+            feed_interval_ms (int): Audio gathered before it is handed to a streaming transcriber.
+            endpointer (Optional[VADEndpointer]): Endpointer to use; one at the transport rate by default.
+        """
+        self.session_id = session_id
+        self.transport = transport
+        self.transcriber = transcriber
+        self.provider = provider
+        self.responder = responder
+        self.voice = voice
+        self.executor = executor
+        self.synthesis_slots = synthesis_slots or asyncio.Semaphore(1)
+        self.max_pending_sentences = max_pending_sentences
+        self.endpointer = endpointer or VADEndpointer(sample_rate=transport.sample_rate)
+        self.feed_samples = self.endpointer.sample_rate * feed_interval_ms // 1000
+
+        self.history: List[Dict[str, str]] = []
+        self.traces: List[LatencyTrace] = []
+        self.started_at: Optional[float] = None
+        self.turns = 0
+        self.barge_ins = 0
+        self.dropped_frames = 0
+
+        self._inbound: "asyncio.Queue" = asyncio.Queue(maxsize=max_inbound_frames)
+        self._reply_task: Optional[asyncio.Task] = None
+        self._fed = 0
+        # Loop time at which the audio already handed to the transport will have played out.
+        self._audio_ends_at = 0.0
+
+    @property
+    def replying(self) -> bool:
+        """True while a reply is being generated or sent."""
+        return self._reply_task is not None and not self._reply_task.done()
+
+    @property
+    def speaking(self) -> bool:
+        """True while a reply is in progress or its audio is still playing at the far end."""
+        if self.replying:
+            return True
+        playing = self.transport.playing
+        if playing is not None:
+            return playing
+        return asyncio.get_running_loop().time() < self._audio_ends_at
+
+    def stats(self) -> Dict[str, Any]:
+        """Return counters and the latency of the last reply."""
+        return {
+            "session_id": self.session_id,
+            "uptime_s": time.perf_counter() - self.started_at if self.started_at else 0.0,
+            "turns": self.turns,
+            "barge_ins": self.barge_ins,
+            "dropped_frames": self.dropped_frames,
+            "inbound_backlog": self._inbound.qsize(),
+            "last_latency": self.traces[-1].summary() if self.traces else None,
+        }
+
+    async def run(self) -> None:
+        """Converse until the caller hangs up or the session is cancelled."""
+        self.started_at = time.perf_counter()
+        self.endpointer.reset()
+        reader = asyncio.create_task(self._read_loop(), name=f"{self.session_id}-reader")
+        try:
+            await self._process_loop()
+        finally:
+            reader.cancel()
+            await self._cancel_reply()
+            await self.transport.close()
+            logger.info(f"Session {self.session_id} ended: {self.stats()}")
+
+    async def _read_loop(self) -> None:
+        while True:
+            frame = await self.transport.receive()
+            self._put_inbound(_END if frame is None else frame)
+            if frame is None:
+                return
+
+    def _put_inbound(self, item: Any) -> None:
+        if self._inbound.full():
+            # Backpressure: drop the oldest audio rather than fall further behind.
+            self._inbound.get_nowait()
+            self.dropped_frames += 1
+        self._inbound.put_nowait(item)
+
+    async def _process_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            frame = await self._inbound.get()
+            if frame is _END:
+                return
+            # The endpointer does a 20 ms FFT per frame; cheap enough to run inline.
+            utterance = self.endpointer.process(frame)
+
+            if self.endpointer.in_speech and self.speaking:
+                await self._barge_in()
+
+            start = self.endpointer.utterance_start
+            if utterance is None and self.transcriber.STREAMING and start is not None:
+                end = self.endpointer.buffer.total_written
+                if end - (start + self._fed) >= self.feed_samples:
+                    chunk = self.endpointer.buffer.read(start + self._fed, end)
+                    self._fed = end - start
+                    await loop.run_in_executor(self.executor, self.transcriber.accept, chunk)
+
+            if utterance is not None:
+                await self._end_of_turn(utterance)
+
+    async def _end_of_turn(self, utterance: Utterance) -> None:
+        fed, self._fed = self._fed, 0
+        self.endpointer.reset()
+        if not utterance.has_speech and not fed:
+            return
+
+        loop = asyncio.get_running_loop()
+        try:
+            text, _ = await loop.run_in_executor(self.executor, self._transcribe, utterance.pcm, fed)
+        except Exception as e:
+            logger.error(f"Session {self.session_id}: transcription failed: {e}")
+            return
+        text = text.strip()
+        if not utterance.has_speech or not text:
+            return
+
+        logger.info(f"Session {self.session_id} heard: {text}")
+        await self._cancel_reply()
+        self.turns += 1
+        self._reply_task = asyncio.create_task(self._reply(text), name=f"{self.session_id}-reply")
+
+    def _transcribe(self, pcm: np.ndarray, fed: int) -> Tuple[str, List[Dict[str, Any]]]:
+        if self.transcriber.STREAMING and fed and fed < len(pcm):
+            self.transcriber.accept(pcm[fed:])
+        return self.transcriber.finish(pcm)
+
+    async def _barge_in(self) -> None:
+        self.barge_ins += 1
+        logger.debug(f"Session {self.session_id}: caller barged in")
+        await self._cancel_reply()
+        self._audio_ends_at = 0.0
+        await self.transport.clear()
+
+    async def _cancel_reply(self) -> None:
+        task, self._reply_task = self._reply_task, None
+        if task is None or task.done():
+            return
+        task.cancel()
+        # asyncio.wait rather than awaiting the task, so a cancellation of this
+        # task is not mistaken for the reply's and swallowed.
+        await asyncio.wait([task])
+
+    async def _reply(self, text: str) -> None:
+        trace = LatencyTrace()
+        self.traces.append(trace)
+        self.history.append({"role": "user", "content": text})
+        reply: List[str] = []
+        chunker = SentenceChunker()
+        audio_queue: "asyncio.Queue" = asyncio.Queue(maxsize=self.max_pending_sentences)
+        sender = asyncio.create_task(self._send_loop(audio_queue, trace), name=f"{self.session_id}-sender")
+        try:
+            async for fragment in self.responder.astream(list(self.history)):
+                if not fragment:
+                    continue
+                trace.mark(LatencyTrace.LLM_FIRST_TOKEN)
+                reply.append(fragment)
+                for sentence in chunker.feed(fragment):
+                    await self._synthesize_into(sentence, audio_queue, trace)
+            remainder = chunker.flush()
+            if remainder:
+                await self._synthesize_into(remainder, audio_queue, trace)
+            await audio_queue.put(_END)
+            await sender
+            logger.info(f"Session {self.session_id} latency: {trace.summary()}")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Session {self.session_id}: reply failed: {e}")
+        finally:
+            sender.cancel()
+            # A reply cut off by barge-in is kept as far as it got.
+            if reply:
+                self.history.append({"role": "assistant", "content": "".join(reply)})
+
+    async def _synthesize_into(self, sentence: str, audio_queue: "asyncio.Queue", trace: LatencyTrace) -> None:
+        loop = asyncio.get_running_loop()
+        try:
+            async with self.synthesis_slots:
+                audio = await self.provider.asynthesize(sentence, self.voice)
+            pcm, sample_rate = await loop.run_in_executor(self.executor, audio.decode)
+        except Exception as e:
+            logger.error(f"Session {self.session_id}: failed to synthesize '{sentence[:40]}': {e}")
+            return
+        if pcm.ndim > 1:
+            pcm = pcm.mean(axis=1)
+        trace.mark(LatencyTrace.FIRST_SENTENCE_SYNTHESIZED)
+        await audio_queue.put((pcm, sample_rate))
+
+    async def _send_loop(self, audio_queue: "asyncio.Queue", trace: LatencyTrace) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            item = await audio_queue.get()
+            if item is _END:
+                return
+            pcm, sample_rate = item
+            # For a call, "played" means handed to the transport.
+            trace.mark(LatencyTrace.FIRST_SAMPLE_PLAYED)
+            await self.transport.send_audio(pcm, sample_rate)
+            self._audio_ends_at = max(self._audio_ends_at, loop.time()) + len(pcm) / sample_rate
@@ -0,0 +1,93 @@
+import asyncio
+from abc import ABC, abstractmethod
+from typing import Optional, Tuple
+
+import numpy as np
+
+
+class MediaTransport(ABC):
+    """
+    The audio connection of one call, as seen by a `ConversationSession`.
+
+    Inbound audio is mono int16 PCM at `sample_rate`, delivered in frames of any
+    length. Outbound audio is mono float32 PCM at whatever rate the TTS provider
+    produced; the transport converts it to what the far end expects.
+    """
+
+    sample_rate: int = 16000
+
+    @abstractmethod
+    async def receive(self) -> Optional[np.ndarray]:
+        """
+        Wait for the next frame of caller audio.
+
+        Returns:
+            Optional[np.ndarray]: int16 samples, or None once the caller has hung up.
+        """
+        pass
+
+    @abstractmethod
+    async def send_audio(self, pcm: np.ndarray, sample_rate: int) -> None:
+        """
+        Queue reply audio for the caller.
+
+        Args:
+            pcm (np.ndarray): Mono float32 samples in [-1, 1].
+            sample_rate (int): Rate of the samples.
+        """
+        pass
+
+    @property
+    def playing(self) -> Optional[bool]:
+        """
+        Whether reply audio is still playing at the far end.
+
+        None when the transport cannot tell; the session then estimates it
+        from the duration of the audio it sent.
+        """
+        return None
+
+    @abstractmethod
+    async def clear(self) -> None:
+        """Barge-in: drop reply audio that was sent but has not been played yet."""
+        pass
+
+    async def close(self) -> None:
+        """Release the connection. Called once when the session ends."""
+        pass
+
+
+class QueueTransport(MediaTransport):
+    """
+    An in-process transport backed by asyncio queues.
+
+    The fake media-stream client pushes caller audio with `push_audio` and
+    reads what the session sent back from `outbound`, as `("audio", pcm, rate)`
+    and `("clear", None, None)` events.
+    """
+
+    def __init__(self, sample_rate: int = 16000):
+        self.sample_rate = sample_rate
+        self.outbound: "asyncio.Queue[Tuple[str, Optional[np.ndarray], Optional[int]]]" = asyncio.Queue()
+        self.closed = False
+        self._inbound: "asyncio.Queue[Optional[np.ndarray]]" = asyncio.Queue()
+
+    def push_audio(self, pcm: np.ndarray) -> None:
+        """Deliver a frame of caller audio to the session."""
+        self._inbound.put_nowait(np.asarray(pcm, dtype=np.int16))
+
+    def hangup(self) -> None:
+        """End the call from the caller's side."""
+        self._inbound.put_nowait(None)
+
+    async def receive(self) -> Optional[np.ndarray]:
+        return await self._inbound.get()
+
+    async def send_audio(self, pcm: np.ndarray, sample_rate: int) -> None:
+        await self.outbound.put(("audio", pcm, sample_rate))
+
+    async def clear(self) -> None:
+        await self.outbound.put(("clear", None, None))
+
+    async def close(self) -> None:
+        self.closed = True
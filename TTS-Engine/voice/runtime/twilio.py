@@ -0,0 +1,229 @@
+import asyncio
+import base64
+import io
+import json
+import os
+import time
+from http import HTTPStatus
+from typing import Any, Dict, Optional, Set, TextIO
+
+import numpy as np
+
+from core.logger import get_logger
+from utils.audio_codec import (MULAW_SILENCE, Upsampler2x, float_to_pcm16, mulaw_decode, mulaw_encode,
+                               resample_block)
+from voice.runtime.runtime import SessionRejected, SessionRuntime
+from voice.runtime.transport import MediaTransport
+
+logger = get_logger(__name__)
+
+TWILIO_SAMPLE_RATE = 8000
+# Twilio sends and expects 20 ms of 8 kHz mu-law per media message.
+TWILIO_FRAME_BYTES = TWILIO_SAMPLE_RATE // 50
+
+
+class TwilioMediaTransport(MediaTransport):
+    """
+    A Twilio Media Streams websocket as a `MediaTransport`.
+
+    Inbound base64 mu-law at 8 kHz is decoded and upsampled to 16 kHz for the
+    endpointer and transcribers. Reply audio is low-passed, resampled to 8 kHz,
+    mu-law encoded and sent as 20 ms media messages followed by a `mark`.
+    Twilio echoes each mark once the audio before it has played, so the
+    outstanding marks tell the session whether the caller is still hearing a
+    reply; `clear` flushes Twilio's playback buffer on barge-in.
+    """
+
+    sample_rate = 16000
+
+    def __init__(self, websocket, record: Optional[TextIO] = None):
+        """
+        Args:
+            websocket: An open websocket connection (websockets' asyncio API).
+            record (Optional[TextIO]): If given, every inbound message is written
+                                       to it as one JSON line, for replay.
+        """
+        self.websocket = websocket
+        self.record = record
+        self.stream_sid: Optional[str] = None
+        self.call_sid: Optional[str] = None
+        self.custom_parameters: Dict[str, str] = {}
+        self.frames_received = 0
+        self.frames_sent = 0
+        self._upsampler = Upsampler2x()
+        self._pending_marks: Set[str] = set()
+        self._mark_ids = 0
+        self._closed = False
+
+    @property
+    def playing(self) -> Optional[bool]:
+        return bool(self._pending_marks)
+
+    async def start(self) -> None:
+        """
+        Wait for Twilio's `start` message, which carries the stream and call ids.
+
+        Raises:
+            ConnectionError: If the stream ends before it starts.
+        """
+        while self.stream_sid is None:
+            message = await self._next_message()
+            if message is None:
+                raise ConnectionError("Media stream closed before it started.")
+            self._handle_control(message)
+
+    async def receive(self) -> Optional[np.ndarray]:
+        while True:
+            message = await self._next_message()
+            if message is None or message.get("event") == "stop":
+                return None
+            if message.get("event") != "media":
+                self._handle_control(message)
+                continue
+            media = message["media"]
+            if media.get("track", "inbound") != "inbound":
+                continue
+            self.frames_received += 1
+            return self._upsampler.process(mulaw_decode(base64.b64decode(media["payload"])))
+
+    async def send_audio(self, pcm: np.ndarray, sample_rate: int) -> None:
+        if self._closed:
+            return
+        pcm = resample_block(pcm, sample_rate, TWILIO_SAMPLE_RATE)
+        payload = mulaw_encode(float_to_pcm16(pcm))
+        padding = -len(payload) % TWILIO_FRAME_BYTES
+        payload += bytes([MULAW_SILENCE]) * padding
+
+        for offset in range(0, len(payload), TWILIO_FRAME_BYTES):
+            await self._send({
+                "event": "media",
+                "streamSid": self.stream_sid,
+                "media": {"payload": base64.b64encode(payload[offset:offset + TWILIO_FRAME_BYTES]).decode()},
+            })
+            self.frames_sent += 1
+
+        self._mark_ids += 1
+        name = f"reply-{self._mark_ids}"
+        self._pending_marks.add(name)
+        await self._send({"event": "mark", "streamSid": self.stream_sid, "mark": {"name": name}})
+
+    async def clear(self) -> None:
+        if self._closed:
+            return
+        self._pending_marks.clear()
+        await self._send({"event": "clear", "streamSid": self.stream_sid})
+
+    async def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            await self.websocket.close()
+        except Exception as e:
+            logger.debug(f"Error closing media stream {self.stream_sid}: {e}")
+
+    def _handle_control(self, message: Dict[str, Any]) -> None:
+        event = message.get("event")
+        if event == "start":
+            start = message["start"]
+            self.stream_sid = start.get("streamSid") or message.get("streamSid")
+            self.call_sid = start.get("callSid")
+            self.custom_parameters = start.get("customParameters") or {}
+            self._upsampler.reset()
+            logger.info(f"Media stream {self.stream_sid} started for call {self.call_sid}")
+        elif event == "mark":
+            self._pending_marks.discard(message.get("mark", {}).get("name"))
+
+    async def _next_message(self) -> Optional[Dict[str, Any]]:
+        from websockets.exceptions import ConnectionClosed
+
+        try:
+            raw = await self.websocket.recv()
+        except ConnectionClosed:
+            return None
+        if self.record is not None:
+            self.record.write(raw if isinstance(raw, str) else raw.decode())
+            self.record.write("\n")
+        return json.loads(raw)
+
+    async def _send(self, message: Dict[str, Any]) -> None:
+        from websockets.exceptions import ConnectionClosed
+
+        try:
+            await self.websocket.send(json.dumps(message))
+        except ConnectionClosed:
+            self._closed = True
+
+
+def twiml_for_stream(stream_url: str) -> str:
+    """Return the TwiML that connects a call to a bidirectional media stream at `stream_url`."""
+    return ('<?xml version="1.0" encoding="UTF-8"?>'
+            f'<Response><Connect><Stream url="{stream_url}"/></Connect></Response>')
+
+
+async def serve_twilio(runtime: SessionRuntime,
+                       host: str = "0.0.0.0",
+                       port: int = 5000,
+                       stream_path: str = "/media",
+                       public_host: Optional[str] = None,
+                       record_dir: Optional[str] = None) -> None:
+    """
+    Serve Twilio calls until cancelled.
+
+    Websocket connections on `stream_path` are media streams and each becomes a
+    runtime session. A plain GET on `/voice` returns the TwiML that points the
+    call at the stream, so the number's webhook can be this server too. The
+    runtime is pre-warmed before the port opens.
+
+    Args:
+        runtime (SessionRuntime): Runtime the calls are admitted to.
+        host (str): Interface to bind.
+        port (int): Port to bind.
+        stream_path (str): Path of the media stream websocket.
+        public_host (Optional[str]): Host name Twilio reaches this server at, used in
+                                     the TwiML; defaults to the request's Host header.
+        record_dir (Optional[str]): If set, each call's inbound messages are saved there
+                                    as JSON lines for `scripts/twilio_replay_client.py`.
+    """
+    from websockets.asyncio.server import serve
+
+    def process_request(connection, request):
+        path = request.path.split("?", 1)[0]
+        if path == "/voice":
+            stream_host = public_host or request.headers.get("Host", f"localhost:{port}")
+            response = connection.respond(HTTPStatus.OK, twiml_for_stream(f"wss://{stream_host}{stream_path}"))
+            response.headers["Content-Type"] = "text/xml"
+            return response
+        if path != stream_path:
+            return connection.respond(HTTPStatus.NOT_FOUND, "Not found\n")
+        return None
+
+    async def handle(websocket):
+        record = None
+        # The file is named after the stream, which is only known once it starts, so
+        # the connected and start messages are held in memory until then.
+        transport = TwilioMediaTransport(websocket, record=io.StringIO() if record_dir else None)
+        try:
+            await asyncio.wait_for(transport.start(), timeout=10.0)
+            if record_dir:
+                os.makedirs(record_dir, exist_ok=True)
+                record = open(os.path.join(record_dir, f"{transport.stream_sid or int(time.time())}.jsonl"), "w")
+                record.write(transport.record.getvalue())
+                transport.record = record
+            params = transport.custom_parameters
+            await runtime.serve(transport, session_id=transport.call_sid or transport.stream_sid,
+                                provider_name=params.get("provider"), voice=params.get("voice"))
+        except SessionRejected:
+            pass
+        except (asyncio.TimeoutError, ConnectionError) as e:
+            logger.warning(f"Media stream never started: {e}")
+            await transport.close()
+        finally:
+            if record is not None:
+                record.close()
+
+    # The first call should not wait for the recognizer model or the TTS provider to load.
+    await runtime.prewarm()
+    async with serve(handle, host, port, process_request=process_request) as server:
+        logger.info(f"Twilio media stream server listening on {host}:{port}{stream_path}")
+        await server.serve_forever()
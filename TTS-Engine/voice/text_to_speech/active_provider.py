@@ -1,6 +1,10 @@
-from typing import Optional, Dict, Type
+from typing import Optional, Dict, Type, Any, AsyncIterator, List, Sequence, Union
+from core.config import AppConfig
 from core.logger import get_logger
+from utils.async_tools import get_background_loop
+from voice.text_to_speech.audio import AudioData
 from voice.text_to_speech.base import BaseTTSProvider
+from voice.text_to_speech.cache import CachedTTSProvider, get_tts_cache
 
 from voice.text_to_speech.providers.deepgram import DeepgramTTSProvider
 from voice.text_to_speech.providers.hearling import HearlingTTSProvider
@@ -32,6 +36,23 @@ class TTSProviderManager:
             cls._instance._initialized: bool = False
         return cls._instance
     
+    def _create_provider(self, provider_name: str, **kwargs) -> BaseTTSProvider:
+        provider = self.PROVIDERS[provider_name](**kwargs)
+        if AppConfig.TTS_CACHE_ENABLED:
+            provider = CachedTTSProvider(provider, get_tts_cache())
+        return provider
+
+    def create_provider(self, provider_name: str, **kwargs) -> BaseTTSProvider:
+        """
+        Create a standalone provider instance without changing the active one.
+        
+        Used by callers that keep their own provider handles, e.g. concurrent sessions.
+        """
+        if provider_name not in self.PROVIDERS:
+            available = ", ".join(self.PROVIDERS.keys())
+            raise ValueError(f"Invalid provider '{provider_name}'. Available providers: {available}")
+        return self._create_provider(provider_name, **kwargs)
+
     def initialize(self, provider_name: str = "deepgram", **kwargs) -> None:
         """
         Initialize the TTS provider manager with a default provider.
@@ -46,7 +67,7 @@ class TTSProviderManager:
             raise ValueError(f"Invalid provider '{provider_name}'. Available providers: {available}")
         
         logger.info(f"Initializing TTS with provider: {provider_name}")
-        self._active_provider = self.PROVIDERS[provider_name](**kwargs)
+        self._active_provider = self._create_provider(provider_name, **kwargs)
         self._initialized = True
     
     def get_provider(self) -> Optional[BaseTTSProvider]:
@@ -66,7 +87,7 @@ class TTSProviderManager:
             raise ValueError(f"Invalid provider '{provider_name}'. Available providers: {available}")
             
         logger.info(f"Switching TTS provider to: {provider_name}")
-        self._active_provider = self.PROVIDERS[provider_name](**kwargs)
+        self._active_provider = self._create_provider(provider_name, **kwargs)
         self._initialized = True
     
     def list_providers(self) -> Dict[str, str]:
@@ -85,7 +106,18 @@ class TTSProviderManager:
             return
         provider.speak(text, voice)
     
-    def generate_speech(self, text: str, voice: Optional[str] = None, output_path: Optional[str] = None) -> Optional[str]:
+    def synthesize(self, text: str, voice: Optional[str] = None) -> Optional[AudioData]:
+        """
+        Synthesize speech in memory using the active provider.
+        """
+        provider = self.get_provider()
+        if not provider:
+            logger.error("Cannot synthesize: No active TTS provider.")
+            return None
+        return provider.synthesize(text, voice)
+    
+    def generate_speech(self, text: str, voice: Optional[str] = None, output_path: Optional[str] = None,
+                        in_memory: bool = False) -> Optional[Union[str, AudioData]]:
         """
         Generate speech using the active provider.
         """
@@ -93,7 +125,65 @@ class TTSProviderManager:
         if not provider:
             logger.error("Cannot generate_speech: No active TTS provider.")
             return None
-        return provider.generate_speech(text, voice, output_path)
+        return provider.generate_speech(text, voice, output_path, in_memory)
+
+    async def agenerate_speech(self, text: str, voice: Optional[str] = None, output_path: Optional[str] = None,
+                               in_memory: bool = False) -> Optional[Union[str, AudioData]]:
+        """
+        Generate speech asynchronously using the active provider.
+        """
+        provider = self.get_provider()
+        if not provider:
+            logger.error("Cannot agenerate_speech: No active TTS provider.")
+            return None
+        return await provider.agenerate_speech(text, voice, output_path, in_memory)
+    
+    async def astream_speech(self, text: str, voice: Optional[str] = None) -> AsyncIterator[bytes]:
+        """
+        Stream encoded audio chunks for the text using the active provider.
+        """
+        provider = self.get_provider()
+        if not provider:
+            logger.error("Cannot astream_speech: No active TTS provider.")
+            return
+        async for chunk in provider.astream_speech(text, voice):
+            yield chunk
+    
+    async def agenerate_batch(self, texts: Sequence[str], voice: Optional[str] = None,
+                              output_paths: Optional[Sequence[str]] = None,
+                              max_concurrency: Optional[int] = None,
+                              return_exceptions: bool = False) -> List[Any]:
+        """
+        Synthesize several texts concurrently using the active provider.
+        """
+        provider = self.get_provider()
+        if not provider:
+            logger.error("Cannot agenerate_batch: No active TTS provider.")
+            return []
+        return await provider.agenerate_batch(texts, voice, output_paths, max_concurrency, return_exceptions)
+    
+    def generate_batch(self, texts: Sequence[str], voice: Optional[str] = None,
+                       output_paths: Optional[Sequence[str]] = None,
+                       max_concurrency: Optional[int] = None,
+                       return_exceptions: bool = False) -> List[Any]:
+        """
+        Blocking shim for `agenerate_batch`. Runs on the shared background loop
+        instead of starting a new event loop per call.
+        """
+        return get_background_loop().run(
+            self.agenerate_batch(texts, voice, output_paths, max_concurrency, return_exceptions))
+    
+    def stream_speech(self, text: str, voice: Optional[str] = None):
+        """
+        Blocking shim for `astream_speech`: yields audio chunks as they arrive.
+        """
+        yield from get_background_loop().iterate(self.astream_speech(text, voice))
+    
+    def get_cache_stats(self) -> Dict[str, int]:
+        """
+        Get hit/miss/eviction counters of the shared TTS audio cache.
+        """
+        return get_tts_cache().stats()
 
 tts_manager = TTSProviderManager()
 
@@ -103,8 +193,15 @@ def speak(text: str, voice: Optional[str] = None) -> None:
     """
     tts_manager.speak(text, voice)
 
-def generate_speech(text: str, voice: Optional[str] = None, output_path: Optional[str] = None) -> Optional[str]:
+def generate_speech(text: str, voice: Optional[str] = None, output_path: Optional[str] = None,
+                    in_memory: bool = False) -> Optional[Union[str, AudioData]]:
     """
     Generate speech using the active TTS provider.
     """
-    return tts_manager.generate_speech(text, voice, output_path)
\ No newline at end of file
+    return tts_manager.generate_speech(text, voice, output_path, in_memory)
+
+def generate_batch(texts: Sequence[str], voice: Optional[str] = None, max_concurrency: Optional[int] = None) -> List[Any]:
+    """
+    Generate speech for several texts concurrently using the active TTS provider.
+    """
+    return tts_manager.generate_batch(texts, voice, max_concurrency=max_concurrency)
\ No newline at end of file
@@ -0,0 +1,130 @@
+import io
+from typing import Optional, Tuple, Union
+
+import numpy as np
+
+from core.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class AudioData:
+    """
+    Synthesized audio held in memory.
+
+    Providers return this from `synthesize` so that playback and downstream
+    stages can decode straight from memory instead of round-tripping through a
+    temp file.
+    """
+
+    PCM_FORMAT = "pcm_s16le"
+
+    def __init__(self, data: Union[bytes, bytearray, memoryview], format: str,
+                 sample_rate: Optional[int] = None, channels: int = 1):
+        """
+        Initialize the audio container.
+
+        Args:
+            data (bytes | memoryview): Encoded audio, or raw little-endian int16 samples
+                                       when format is "pcm_s16le".
+            format (str): Container/codec, e.g. "mp3", "wav" or "pcm_s16le".
+            sample_rate (Optional[int]): Sample rate, if known without decoding.
+                                         Required for "pcm_s16le".
+            channels (int): Channel count for raw PCM.
+        """
+        if format == self.PCM_FORMAT and not sample_rate:
+            raise ValueError("sample_rate is required for raw PCM audio.")
+        self.data = data
+        self.format = format
+        self.sample_rate = sample_rate
+        self.channels = channels
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __repr__(self) -> str:
+        return f"AudioData(format={self.format!r}, bytes={len(self)}, sample_rate={self.sample_rate})"
+
+    def to_bytes(self) -> bytes:
+        """Return the audio as an immutable bytes object."""
+        return self.data if isinstance(self.data, bytes) else bytes(self.data)
+
+    def open(self) -> io.BytesIO:
+        """Return a file-like object over the encoded audio."""
+        return io.BytesIO(self.data)
+
+    def save(self, path: str) -> str:
+        """
+        Write the encoded audio to a file.
+
+        Args:
+            path (str): Destination file path.
+
+        Returns:
+            str: The path written.
+        """
+        with open(path, "wb") as f:
+            f.write(self.data)
+        return path
+
+    def decode(self) -> Tuple[np.ndarray, int]:
+        """
+        Decode to float32 PCM in [-1, 1].
+
+        Returns:
+            Tuple[np.ndarray, int]: Samples shaped (frames,) for mono or
+                                    (frames, channels), and the sample rate.
+        """
+        if self.format == self.PCM_FORMAT:
+            pcm = np.frombuffer(self.data, dtype="<i2").astype(np.float32) / 32768.0
+            if self.channels > 1:
+                pcm = pcm.reshape(-1, self.channels)
+            return pcm, self.sample_rate
+
+        try:
+            import soundfile as sf
+            pcm, sample_rate = sf.read(self.open(), dtype="float32")
+        except Exception as e:
+            # libsndfile older than 1.1 cannot read MP3; fall back to ffmpeg via pydub.
+            logger.debug(f"soundfile could not decode {self.format} audio ({e}); falling back to pydub.")
+            from pydub import AudioSegment
+            segment = AudioSegment.from_file(self.open(), format=self.format)
+            pcm = np.array(segment.get_array_of_samples(), dtype=np.float32) / float(1 << (8 * segment.sample_width - 1))
+            if segment.channels > 1:
+                pcm = pcm.reshape(-1, segment.channels)
+            sample_rate = segment.frame_rate
+        self.sample_rate = sample_rate
+        return pcm, sample_rate
+
+    @classmethod
+    def from_pcm(cls, pcm: np.ndarray, sample_rate: int) -> "AudioData":
+        """
+        Wrap float32 or int16 samples as raw PCM audio.
+
+        Args:
+            pcm (np.ndarray): Samples shaped (frames,) or (frames, channels).
+            sample_rate (int): Sample rate of the samples.
+
+        Returns:
+            AudioData: Audio in "pcm_s16le" format.
+        """
+        channels = 1 if pcm.ndim == 1 else pcm.shape[1]
+        if pcm.dtype != np.int16:
+            pcm = (np.clip(pcm, -1.0, 1.0) * 32767).astype("<i2")
+        return cls(memoryview(np.ascontiguousarray(pcm)).cast("B"), cls.PCM_FORMAT, sample_rate, channels)
+
+    @classmethod
+    def from_file(cls, path: str, format: Optional[str] = None) -> "AudioData":
+        """
+        Load an encoded audio file into memory.
+
+        Args:
+            path (str): Audio file to read.
+            format (Optional[str]): Format; defaults to the file extension.
+
+        Returns:
+            AudioData: The file's contents.
+        """
+        with open(path, "rb") as f:
+            data = f.read()
+        return cls(data, format or path.rsplit(".", 1)[-1].lower())
@@ -1,5 +1,13 @@
+import asyncio
+import os
+import tempfile
 from abc import ABC, abstractmethod
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, AsyncIterator, List, Sequence, Union
+
+from core.logger import get_logger
+from voice.text_to_speech.audio import AudioData
+
+logger = get_logger(__name__)
 
 class BaseTTSProvider(ABC):
     """
@@ -7,30 +15,61 @@ class BaseTTSProvider(ABC):
     
     All TTS providers must implement this interface to ensure
     compatibility with the voice system.
+    
+    Providers implement `synthesize`, which returns the audio in memory;
+    `generate_speech` and `speak` are built on top of it, so audio only
+    touches the disk when a caller asks for a file.
+    
+    Besides the blocking methods, every provider exposes an async surface
+    (`asynthesize`, `agenerate_speech`, `astream_speech`, `agenerate_batch`).
+    The defaults below adapt the blocking implementation; providers with a
+    native async client override them.
     """
     
     PROVIDER_NAME = "base"
+    OUTPUT_FORMAT = "mp3"
+    # Upper bound on concurrent requests in agenerate_batch when none is given.
+    MAX_BATCH_CONCURRENCY = 4
+    # Chunk size used when the default astream_speech replays finished audio.
+    STREAM_CHUNK_SIZE = 16384
     
     def __init__(self):
         """Initialize the TTS provider."""
         pass
     
     @abstractmethod
-    def generate_speech(self, text: str, voice: Optional[str] = None, output_path: Optional[str] = None) -> str:
+    def synthesize(self, text: str, voice: Optional[str] = None) -> AudioData:
         """
-        Convert text to speech and return the path to the audio file.
+        Convert text to speech and return the audio in memory.
         
         Args:
             text (str): The text to convert to speech.
             voice (Optional[str]): The voice to use for speech generation.
-            output_path (Optional[str]): Path to save the audio file.
         
         Returns:
-            str: Path to the generated audio file.
+            AudioData: The encoded audio.
         """
         pass
     
-    @abstractmethod
+    def generate_speech(self, text: str, voice: Optional[str] = None, output_path: Optional[str] = None,
+                        in_memory: bool = False) -> Union[str, AudioData]:
+        """
+        Convert text to speech and return the path to the audio file.
+        
+        Args:
+            text (str): The text to convert to speech.
+            voice (Optional[str]): The voice to use for speech generation.
+            output_path (Optional[str]): Path to save the audio file. If None, a
+                                         unique temporary file is created.
+            in_memory (bool): Return the AudioData instead of writing a file.
+        
+        Returns:
+            Union[str, AudioData]: Path to the generated audio file, or the audio
+                                   itself when in_memory is True.
+        """
+        audio = self.synthesize(text, voice)
+        return self._deliver(audio, output_path, in_memory)
+    
     def speak(self, text: str, voice: Optional[str] = None) -> None:
         """
         Convert text to speech and play it immediately.
@@ -39,7 +78,13 @@ class BaseTTSProvider(ABC):
             text (str): The text to speak.
             voice (Optional[str]): The voice to use for speech generation.
         """
-        pass
+        try:
+            audio = self.synthesize(text, voice)
+            # Import here to avoid circular imports
+            from utils.helpers import play_audio
+            play_audio(audio)
+        except Exception as e:
+            logger.error(f"Failed to speak text with {self.PROVIDER_NAME}: {e}")
     
     @abstractmethod
     def list_available_voices(self) -> Dict[str, Any]:
@@ -58,4 +103,111 @@ class BaseTTSProvider(ABC):
         Returns:
             str: Provider name.
         """
-        return self.PROVIDER_NAME
\ No newline at end of file
+        return self.PROVIDER_NAME
+
+    def new_output_path(self) -> str:
+        """
+        Create a unique temporary file for one utterance.
+
+        Returns:
+            str: Path of an empty file the caller is responsible for removing.
+        """
+        fd, path = tempfile.mkstemp(prefix=f"{self.PROVIDER_NAME}_", suffix=f".{self.OUTPUT_FORMAT}")
+        os.close(fd)
+        return path
+
+    def _deliver(self, audio: AudioData, output_path: Optional[str], in_memory: bool) -> Union[str, AudioData]:
+        if in_memory:
+            return audio
+        return audio.save(output_path or self.new_output_path())
+
+    async def asynthesize(self, text: str, voice: Optional[str] = None) -> AudioData:
+        """
+        Async version of `synthesize`.
+
+        The default runs the blocking implementation in a worker thread.
+
+        Args:
+            text (str): The text to convert to speech.
+            voice (Optional[str]): The voice to use for speech generation.
+
+        Returns:
+            AudioData: The encoded audio.
+        """
+        return await asyncio.to_thread(self.synthesize, text, voice)
+
+    async def agenerate_speech(self, text: str, voice: Optional[str] = None, output_path: Optional[str] = None,
+                               in_memory: bool = False) -> Union[str, AudioData]:
+        """
+        Async version of `generate_speech`.
+
+        Args:
+            text (str): The text to convert to speech.
+            voice (Optional[str]): The voice to use for speech generation.
+            output_path (Optional[str]): Path to save the audio file.
+            in_memory (bool): Return the AudioData instead of writing a file.
+
+        Returns:
+            Union[str, AudioData]: Path to the generated audio file, or the audio itself.
+        """
+        audio = await self.asynthesize(text, voice)
+        if in_memory:
+            return audio
+        return await asyncio.to_thread(self._deliver, audio, output_path, False)
+
+    async def astream_speech(self, text: str, voice: Optional[str] = None) -> AsyncIterator[bytes]:
+        """
+        Convert text to speech and yield encoded audio chunks.
+
+        The default synthesizes the whole utterance first and then yields it in
+        chunks; providers that receive audio incrementally override this.
+
+        Args:
+            text (str): The text to convert to speech.
+            voice (Optional[str]): The voice to use for speech generation.
+
+        Yields:
+            bytes: Consecutive chunks of audio in OUTPUT_FORMAT.
+        """
+        audio = await self.asynthesize(text, voice)
+        data = memoryview(audio.data)
+        for start in range(0, len(data), self.STREAM_CHUNK_SIZE):
+            yield bytes(data[start:start + self.STREAM_CHUNK_SIZE])
+
+    async def agenerate_batch(self,
+                              texts: Sequence[str],
+                              voice: Optional[str] = None,
+                              output_paths: Optional[Sequence[str]] = None,
+                              max_concurrency: Optional[int] = None,
+                              return_exceptions: bool = False) -> List[Any]:
+        """
+        Synthesize several texts concurrently.
+
+        Args:
+            texts (Sequence[str]): Texts to convert, e.g. the sentences of a reply.
+            voice (Optional[str]): The voice to use for every text.
+            output_paths (Optional[Sequence[str]]): One path per text. If None, the
+                results are returned in memory as AudioData.
+            max_concurrency (Optional[int]): Maximum requests in flight.
+                Defaults to MAX_BATCH_CONCURRENCY.
+            return_exceptions (bool): Return failures in place of their path instead
+                of raising the first one.
+
+        Returns:
+            List[Any]: Audio file paths or AudioData (or exceptions) in the order of `texts`.
+        """
+        if output_paths is not None and len(output_paths) != len(texts):
+            raise ValueError("output_paths must contain exactly one path per text.")
+        in_memory = output_paths is None
+        paths = list(output_paths) if output_paths is not None else [None] * len(texts)
+        semaphore = asyncio.Semaphore(max_concurrency or self.MAX_BATCH_CONCURRENCY)
+
+        async def generate_one(text: str, path: Optional[str]) -> Union[str, AudioData]:
+            async with semaphore:
+                return await self.agenerate_speech(text, voice, path, in_memory)
+
+        return await asyncio.gather(
+            *(generate_one(text, path) for text, path in zip(texts, paths)),
+            return_exceptions=return_exceptions,
+        )
+
@@ -0,0 +1,466 @@
+import asyncio
+import atexit
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Optional, Dict, Any, AsyncIterator, Union
+
+from core.config import AppConfig
+from core.logger import get_logger
+from utils.security import hash_string
+from voice.text_to_speech.audio import AudioData
+from voice.text_to_speech.base import BaseTTSProvider
+
+logger = get_logger(__name__)
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normalize text for cache keys so trivially different strings share an entry.
+
+    Args:
+        text (str): The text to normalize.
+
+    Returns:
+        str: NFC-normalized text with runs of whitespace collapsed.
+    """
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+class TTSAudioCache:
+    """
+    Content-addressed, size-bounded disk cache for synthesized audio.
+
+    Entries are keyed on (provider, voice, normalized text, output format). The
+    index is persisted as JSON next to the audio files and least recently used
+    entries are evicted once the byte budget is exceeded. Audio files and the
+    index are written to a temporary file first and moved into place, so a
+    crash never leaves a half-written entry behind.
+    """
+
+    INDEX_FILE = "index.json"
+    # Hits only update access times, so the index is flushed at most this often
+    # for them; puts and evictions are always flushed immediately.
+    INDEX_FLUSH_INTERVAL = 30.0
+
+    def __init__(self, cache_dir: str = AppConfig.TTS_CACHE_DIR, max_bytes: int = AppConfig.TTS_CACHE_MAX_BYTES):
+        """
+        Initialize the cache and load any existing index.
+
+        Args:
+            cache_dir (str): Directory holding the audio files and index.
+            max_bytes (int): Total size of cached audio before eviction kicks in.
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.index_path = os.path.join(cache_dir, self.INDEX_FILE)
+        os.makedirs(cache_dir, exist_ok=True)
+
+        self._lock = threading.RLock()
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._total_bytes = 0
+        self._last_flush = 0.0
+        self._dirty = False
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._load_index()
+
+    @staticmethod
+    def make_key(provider: str, voice: Optional[str], text: str, output_format: str) -> str:
+        """
+        Build the content address for a synthesis request.
+
+        Returns:
+            str: Hex digest identifying the request.
+        """
+        return hash_string("\x1f".join([provider, voice or "", normalize_text(text), output_format]))
+
+    def _load_index(self) -> None:
+        if not os.path.exists(self.index_path):
+            return
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                entries = json.load(f)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable TTS cache index {self.index_path}: {e}")
+            return
+
+        for key, entry in sorted(entries.items(), key=lambda item: item[1].get("last_access", 0)):
+            path = os.path.join(self.cache_dir, entry.get("file", ""))
+            if not os.path.isfile(path):
+                continue
+            self._entries[key] = entry
+            self._total_bytes += entry.get("size", 0)
+        logger.info(f"Loaded TTS cache index with {len(self._entries)} entries ({self._total_bytes} bytes).")
+        self._evict()
+
+    def _flush_index(self, force: bool = False) -> None:
+        now = time.time()
+        if not force and (not self._dirty or now - self._last_flush < self.INDEX_FLUSH_INTERVAL):
+            return
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, prefix=".index-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(self._entries, f)
+            os.replace(tmp_path, self.index_path)
+            self._dirty = False
+            self._last_flush = now
+        except Exception as e:
+            logger.error(f"Failed to write TTS cache index: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def _evict(self) -> None:
+        evicted = False
+        # The newest entry is always kept, even if it alone exceeds the budget.
+        while self._total_bytes > self.max_bytes and len(self._entries) > 1:
+            key, entry = self._entries.popitem(last=False)
+            self._total_bytes -= entry.get("size", 0)
+            self.evictions += 1
+            evicted = True
+            try:
+                os.remove(os.path.join(self.cache_dir, entry["file"]))
+            except OSError as e:
+                logger.warning(f"Failed to remove evicted TTS cache file {entry['file']}: {e}")
+        if evicted:
+            self._dirty = True
+            self._flush_index(force=True)
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Look up a cached audio file.
+
+        Args:
+            key (str): Key from `make_key`.
+
+        Returns:
+            Optional[str]: Path of the cached audio file, or None on a miss.
+        """
+        with self._lock:
+            return self._lookup(key)
+
+    def read(self, key: str) -> Optional[bytes]:
+        """
+        Read a cached audio file.
+
+        Unlike opening the path from `get`, the file is read under the cache
+        lock, so a concurrent `put_bytes` cannot evict it halfway.
+
+        Args:
+            key (str): Key from `make_key`.
+
+        Returns:
+            Optional[bytes]: The encoded audio, or None on a miss.
+        """
+        with self._lock:
+            path = self._lookup(key)
+            if path is None:
+                return None
+            with open(path, "rb") as f:
+                return f.read()
+
+    def _lookup(self, key: str) -> Optional[str]:
+        entry = self._entries.get(key)
+        path = os.path.join(self.cache_dir, entry["file"]) if entry else None
+        if entry is None or not os.path.isfile(path):
+            if entry is not None:
+                # The file was removed behind the cache's back: forget the entry.
+                logger.warning(f"TTS cache file {entry['file']} is missing; dropping its entry")
+                self._entries.pop(key)
+                self._total_bytes -= entry.get("size", 0)
+                self._dirty = True
+                self._flush_index(force=True)
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        entry["last_access"] = time.time()
+        self._entries.move_to_end(key)
+        self._dirty = True
+        self._flush_index()
+        return path
+
+    def new_temp_path(self, suffix: str = "") -> str:
+        """
+        Reserve a temporary file inside the cache directory.
+
+        Writing audio here and then calling `put_file` lets the entry be moved
+        into place atomically instead of being copied.
+        """
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, prefix=".pending-", suffix=suffix)
+        os.close(fd)
+        return tmp_path
+
+    def put_file(self, key: str, source_path: str, output_format: str, move: bool = False) -> str:
+        """
+        Store an audio file in the cache.
+
+        Args:
+            key (str): Key from `make_key`.
+            source_path (str): Audio file to store.
+            output_format (str): File extension for the cached entry.
+            move (bool): Move `source_path` into the cache instead of copying it.
+
+        Returns:
+            str: Path of the cached audio file.
+        """
+        filename = f"{key}.{output_format}"
+        final_path = os.path.join(self.cache_dir, filename)
+
+        if move:
+            tmp_path = source_path
+        else:
+            tmp_path = self.new_temp_path(suffix=f".{output_format}")
+            shutil.copyfile(source_path, tmp_path)
+
+        # The file is moved into place under the lock, so a concurrent put of the
+        # same key cannot leave the index recording the other writer's size, and
+        # an eviction cannot delete the file between the move and the index update.
+        with self._lock:
+            try:
+                os.replace(tmp_path, final_path)
+            except OSError:
+                if not move and os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+            size = os.path.getsize(final_path)
+            previous = self._entries.pop(key, None)
+            if previous:
+                self._total_bytes -= previous.get("size", 0)
+            self._entries[key] = {"file": filename, "size": size, "last_access": time.time()}
+            self._total_bytes += size
+            self._dirty = True
+            self._flush_index(force=True)
+            self._evict()
+        return final_path
+
+    def put_bytes(self, key: str, data: bytes, output_format: str) -> str:
+        """
+        Store in-memory audio in the cache.
+
+        Args:
+            key (str): Key from `make_key`.
+            data (bytes): Encoded audio.
+            output_format (str): File extension for the cached entry.
+
+        Returns:
+            str: Path of the cached audio file.
+        """
+        tmp_path = self.new_temp_path(suffix=f".{output_format}")
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            return self.put_file(key, tmp_path, output_format, move=True)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def clear(self) -> None:
+        """Remove every cached entry."""
+        with self._lock:
+            for entry in self._entries.values():
+                try:
+                    os.remove(os.path.join(self.cache_dir, entry["file"]))
+                except OSError:
+                    pass
+            self._entries.clear()
+            self._total_bytes = 0
+            self._dirty = True
+            self._flush_index(force=True)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get cache counters.
+
+        Returns:
+            Dict[str, int]: Hits, misses, evictions, entry count and stored bytes.
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+    def close(self) -> None:
+        """Persist any pending index updates."""
+        with self._lock:
+            self._flush_index(force=self._dirty)
+
+
+class CachedTTSProvider(BaseTTSProvider):
+    """
+    Wraps any TTS provider with a shared `TTSAudioCache`.
+
+    Repeated phrases (greetings, confirmations, error prompts) are served from
+    disk instead of going back to the provider's remote endpoint.
+    """
+
+    def __init__(self, provider: BaseTTSProvider, cache: Optional[TTSAudioCache] = None):
+        """
+        Initialize the caching wrapper.
+
+        Args:
+            provider (BaseTTSProvider): The provider to wrap.
+            cache (Optional[TTSAudioCache]): Cache to use. Defaults to the shared cache.
+        """
+        super().__init__()
+        self.provider = provider
+        self.cache = cache or get_tts_cache()
+        self.PROVIDER_NAME = provider.PROVIDER_NAME
+        self.OUTPUT_FORMAT = provider.OUTPUT_FORMAT
+
+    def _cache_key(self, text: str, voice: Optional[str]) -> str:
+        resolved_voice = voice or getattr(self.provider, "default_voice", None)
+        return self.cache.make_key(self.PROVIDER_NAME, resolved_voice, text, self.OUTPUT_FORMAT)
+
+    def synthesize(self, text: str, voice: Optional[str] = None) -> AudioData:
+        """
+        Return cached audio when available, otherwise synthesize and cache it.
+
+        Args:
+            text (str): The text to convert to speech.
+            voice (Optional[str]): The voice to use for speech generation.
+
+        Returns:
+            AudioData: The encoded audio.
+        """
+        key = self._cache_key(text, voice)
+        cached = self.cache.read(key)
+        if cached is not None:
+            logger.debug(f"TTS cache hit for '{text[:40]}'")
+            return AudioData(cached, self.OUTPUT_FORMAT)
+
+        audio = self._check_audio(self.provider.synthesize(text, voice), text)
+        self.cache.put_bytes(key, audio.data, self.OUTPUT_FORMAT)
+        return audio
+
+    async def asynthesize(self, text: str, voice: Optional[str] = None) -> AudioData:
+        """
+        Async version of `synthesize` that uses the wrapped provider's async path on a miss.
+        """
+        key = self._cache_key(text, voice)
+        cached = await asyncio.to_thread(self.cache.read, key)
+        if cached is not None:
+            return AudioData(cached, self.OUTPUT_FORMAT)
+
+        audio = self._check_audio(await self.provider.asynthesize(text, voice), text)
+        await asyncio.to_thread(self.cache.put_bytes, key, audio.data, self.OUTPUT_FORMAT)
+        return audio
+
+    def generate_speech(self, text: str, voice: Optional[str] = None, output_path: Optional[str] = None,
+                        in_memory: bool = False) -> Union[str, AudioData]:
+        """
+        Return cached audio when available, otherwise synthesize and cache it.
+
+        Args:
+            text (str): The text to convert to speech.
+            voice (Optional[str]): The voice to use for speech generation.
+            output_path (Optional[str]): Path to save the audio file. If None, the
+                                         path of the cache entry itself is returned.
+            in_memory (bool): Return the AudioData instead of a path.
+
+        Returns:
+            Union[str, AudioData]: Path to the generated audio file, or the audio itself.
+        """
+        if in_memory:
+            return self.synthesize(text, voice)
+
+        key = self._cache_key(text, voice)
+        cached_path = self.cache.get(key)
+        if cached_path:
+            logger.debug(f"TTS cache hit for '{text[:40]}'")
+            if output_path:
+                shutil.copyfile(cached_path, output_path)
+                return output_path
+            return cached_path
+
+        audio = self._check_audio(self.provider.synthesize(text, voice), text)
+        cached_path = self.cache.put_bytes(key, audio.data, self.OUTPUT_FORMAT)
+        return audio.save(output_path) if output_path else cached_path
+
+    async def agenerate_speech(self, text: str, voice: Optional[str] = None, output_path: Optional[str] = None,
+                               in_memory: bool = False) -> Union[str, AudioData]:
+        """
+        Async version of `generate_speech` that uses the wrapped provider's async path on a miss.
+        """
+        if in_memory:
+            return await self.asynthesize(text, voice)
+
+        key = self._cache_key(text, voice)
+        cached_path = self.cache.get(key)
+        if cached_path:
+            if output_path:
+                await asyncio.to_thread(shutil.copyfile, cached_path, output_path)
+                return output_path
+            return cached_path
+
+        audio = self._check_audio(await self.provider.asynthesize(text, voice), text)
+        cached_path = await asyncio.to_thread(self.cache.put_bytes, key, audio.data, self.OUTPUT_FORMAT)
+        if output_path:
+            return await asyncio.to_thread(audio.save, output_path)
+        return cached_path
+
+    async def astream_speech(self, text: str, voice: Optional[str] = None) -> AsyncIterator[bytes]:
+        """
+        Stream cached audio, or stream from the wrapped provider and cache the result.
+        """
+        key = self._cache_key(text, voice)
+        cached = await asyncio.to_thread(self.cache.read, key)
+        if cached is not None:
+            data = memoryview(cached)
+            for start in range(0, len(data), self.STREAM_CHUNK_SIZE):
+                yield bytes(data[start:start + self.STREAM_CHUNK_SIZE])
+            return
+
+        chunks = []
+        async for chunk in self.provider.astream_speech(text, voice):
+            chunks.append(chunk)
+            yield chunk
+        if chunks:
+            await asyncio.to_thread(self.cache.put_bytes, key, b"".join(chunks), self.OUTPUT_FORMAT)
+
+    def _check_audio(self, audio: AudioData, text: str) -> AudioData:
+        if not len(audio):
+            raise Exception(f"{self.PROVIDER_NAME} produced no audio for '{text[:40]}'")
+        return audio
+
+    def list_available_voices(self) -> Dict[str, Any]:
+        """Return the wrapped provider's voices."""
+        return self.provider.list_available_voices()
+
+    def __getattr__(self, name: str):
+        # Delegate provider-specific attributes (default_voice, variant, ...).
+        if name == "provider":
+            raise AttributeError(name)
+        return getattr(self.provider, name)
+
+
+_shared_cache: Optional[TTSAudioCache] = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_tts_cache() -> TTSAudioCache:
+    """
+    Get the process-wide TTS audio cache, creating it on first use.
+
+    Returns:
+        TTSAudioCache: The shared cache configured from AppConfig.
+    """
+    global _shared_cache
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            _shared_cache = TTSAudioCache()
+            atexit.register(_shared_cache.close)
+        return _shared_cache
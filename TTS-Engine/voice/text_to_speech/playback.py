@@ -0,0 +1,363 @@
+import asyncio
+import atexit
+import queue
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, Iterable, List, Optional, Union
+
+import numpy as np
+
+from core.config import AppConfig
+from core.logger import get_logger
+from voice.text_to_speech.audio import AudioData
+
+logger = get_logger(__name__)
+
+
+def resample(pcm: np.ndarray, src_rate: int, dst_rate: int) -> np.ndarray:
+    """
+    Linearly resample mono float32 PCM.
+
+    Args:
+        pcm (np.ndarray): Samples shaped (frames,).
+        src_rate (int): Rate of the input.
+        dst_rate (int): Desired rate.
+
+    Returns:
+        np.ndarray: Resampled float32 samples.
+    """
+    if src_rate == dst_rate or len(pcm) == 0:
+        return pcm
+    target_length = int(round(len(pcm) * dst_rate / src_rate))
+    positions = np.linspace(0, len(pcm) - 1, num=target_length)
+    return np.interp(positions, np.arange(len(pcm)), pcm).astype(np.float32)
+
+
+def _default_output_stream(samplerate: int, channels: int, blocksize: int, callback: Callable):
+    # Played through the process-wide device manager, so playback shares its PortAudio
+    # context with the microphone; the manager's period sets the block size. Imported
+    # lazily so the engine can be driven with a fake output stream on machines without
+    # PortAudio.
+    from voice.audio_devices import ManagedOutputStream, get_audio_device_manager
+    return ManagedOutputStream(get_audio_device_manager(), samplerate, channels, callback)
+
+
+class PlaybackHandle:
+    """
+    Tracks one buffer queued on a `PlaybackEngine`.
+
+    Wait on it with `wait()`, register `add_done_callback`, or `await` it from
+    a coroutine. The result is True when the buffer played to the end and False
+    when it was cut off by `PlaybackEngine.stop()`.
+    """
+
+    def __init__(self, pcm: np.ndarray, samplerate: int, on_start: Optional[Callable[["PlaybackHandle"], None]] = None):
+        self.pcm = pcm
+        self.samplerate = samplerate
+        self.offset = 0
+        self.cancelled = False
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self._on_start = on_start
+        self._done = threading.Event()
+        self._callbacks: List[Callable[["PlaybackHandle"], None]] = []
+        self._lock = threading.Lock()
+
+    @property
+    def duration(self) -> float:
+        """Length of the buffer in seconds."""
+        return len(self.pcm) / float(self.samplerate)
+
+    def done(self) -> bool:
+        """Return True once the buffer has finished playing or was cancelled."""
+        return self._done.is_set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until the buffer has played or was cancelled.
+
+        Args:
+            timeout (Optional[float]): Seconds to wait; None waits indefinitely.
+
+        Returns:
+            bool: True if the buffer played to the end.
+        """
+        self._done.wait(timeout)
+        return self._done.is_set() and not self.cancelled
+
+    def add_done_callback(self, callback: Callable[["PlaybackHandle"], None]) -> None:
+        """
+        Call `callback(handle)` when playback ends. Runs immediately if it already has.
+
+        Callbacks run on the engine's notifier thread, never on the audio thread.
+        """
+        with self._lock:
+            if not self._done.is_set():
+                self._callbacks.append(callback)
+                return
+        callback(self)
+
+    def __await__(self):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        def resolve(handle: "PlaybackHandle") -> None:
+            loop.call_soon_threadsafe(lambda: future.done() or future.set_result(not handle.cancelled))
+
+        self.add_done_callback(resolve)
+        return future.__await__()
+
+    def _run_start_callback(self) -> None:
+        if self._on_start is not None:
+            self._on_start(self)
+
+    def _finish(self) -> None:
+        with self._lock:
+            self.finished_at = time.perf_counter()
+            self._done.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            try:
+                callback(self)
+            except Exception as e:
+                logger.error(f"Error in playback callback: {e}")
+
+
+class PlaybackEngine:
+    """
+    A long-lived audio output shared by everything that speaks.
+
+    One output stream is opened once and kept running; PCM buffers are queued
+    and pulled by the device callback back to back, so consecutive sentences
+    play without a gap and nothing re-opens the device per utterance. When the
+    queue is empty the callback plays silence.
+    """
+
+    def __init__(self,
+                 samplerate: int = AppConfig.PLAYBACK_SAMPLE_RATE,
+                 channels: int = 1,
+                 block_ms: int = AppConfig.PLAYBACK_BLOCK_MS,
+                 output_stream_factory: Optional[Callable] = None):
+        """
+        Initialize the engine. The device is opened by `start()` or the first `enqueue`.
+
+        Args:
+            samplerate (int): Rate the device runs at; buffers are resampled to it.
+            channels (int): Device channel count; mono buffers are copied to every channel.
+            block_ms (int): Device callback period in milliseconds.
+            output_stream_factory (Optional[Callable]): Called with
+                (samplerate, channels, blocksize, callback) to open the output stream.
+                Defaults to a stream on the shared `AudioDeviceManager`.
+        """
+        self.samplerate = samplerate
+        self.channels = channels
+        self.blocksize = max(1, samplerate * block_ms // 1000)
+        self.output_stream_factory = output_stream_factory or _default_output_stream
+
+        self._stream = None
+        self._pending: Deque[PlaybackHandle] = deque()
+        self._current: Optional[PlaybackHandle] = None
+        self._lock = threading.Lock()
+        self._idle = threading.Event()
+        self._idle.set()
+        self.underflows = 0
+
+        # Completion callbacks are handed off so the audio thread never blocks on user code.
+        self._notifications: "queue.Queue" = queue.Queue()
+        self._notifier = threading.Thread(target=self._notify_loop, name="PlaybackNotifier", daemon=True)
+        self._notifier.start()
+
+    @property
+    def is_playing(self) -> bool:
+        """True while any buffer is playing or queued."""
+        return not self._idle.is_set()
+
+    def start(self) -> None:
+        """Open and start the output stream if it is not running yet."""
+        with self._lock:
+            if self._stream is not None:
+                return
+            self._stream = self.output_stream_factory(self.samplerate, self.channels, self.blocksize, self._callback)
+        self._stream.start()
+        logger.info(f"Playback engine started at {self.samplerate} Hz, {self.blocksize}-frame blocks")
+
+    def enqueue(self, pcm: np.ndarray, samplerate: int,
+                on_start: Optional[Callable[[PlaybackHandle], None]] = None,
+                on_done: Optional[Callable[[PlaybackHandle], None]] = None) -> PlaybackHandle:
+        """
+        Queue float32 PCM to play after everything already queued.
+
+        Args:
+            pcm (np.ndarray): Samples in [-1, 1], shaped (frames,) or (frames, channels).
+            samplerate (int): Rate of the samples.
+            on_start (Optional[Callable]): Called with the handle when its first block is played.
+            on_done (Optional[Callable]): Called with the handle when it finishes or is cancelled.
+
+        Returns:
+            PlaybackHandle: Handle to wait on.
+        """
+        if pcm.ndim > 1:
+            pcm = pcm.mean(axis=1)
+        pcm = resample(np.asarray(pcm, dtype=np.float32), samplerate, self.samplerate)
+        handle = PlaybackHandle(pcm, self.samplerate, on_start)
+        if on_done is not None:
+            handle.add_done_callback(on_done)
+
+        if self._stream is None:
+            self.start()
+        with self._lock:
+            self._pending.append(handle)
+            self._idle.clear()
+        return handle
+
+    def play(self, audio: Union[AudioData, str],
+             on_done: Optional[Callable[[PlaybackHandle], None]] = None) -> PlaybackHandle:
+        """
+        Decode audio and queue it.
+
+        Args:
+            audio (AudioData | str): In-memory audio or a path to an audio file.
+            on_done (Optional[Callable]): Called with the handle when playback ends.
+
+        Returns:
+            PlaybackHandle: Handle to wait on.
+        """
+        if isinstance(audio, str):
+            audio = AudioData.from_file(audio)
+        pcm, samplerate = audio.decode()
+        return self.enqueue(pcm, samplerate, on_done=on_done)
+
+    async def aplay(self, audio: Union[AudioData, str]) -> bool:
+        """
+        Decode audio off the event loop, queue it, and wait until it has played.
+
+        Returns:
+            bool: True if it played to the end, False if it was stopped.
+        """
+        pcm, samplerate = await asyncio.to_thread(
+            lambda: (AudioData.from_file(audio) if isinstance(audio, str) else audio).decode())
+        return await self.enqueue(pcm, samplerate)
+
+    def stop(self) -> int:
+        """
+        Barge-in: cut off the current buffer and drop everything queued.
+
+        Returns:
+            int: Number of buffers that were cancelled.
+        """
+        with self._lock:
+            cancelled = list(self._pending)
+            self._pending.clear()
+            if self._current is not None:
+                cancelled.insert(0, self._current)
+                self._current = None
+            self._idle.set()
+        for handle in cancelled:
+            handle.cancelled = True
+            self._notifications.put(handle._finish)
+        if cancelled:
+            logger.debug(f"Playback stopped; cancelled {len(cancelled)} buffer(s)")
+        return len(cancelled)
+
+    def cancel(self, handles: Iterable[PlaybackHandle]) -> int:
+        """
+        Cut off the given buffers if they are playing or queued; everything else keeps playing.
+
+        Args:
+            handles (Iterable[PlaybackHandle]): Buffers queued by `enqueue` or `play`.
+
+        Returns:
+            int: Number of buffers that were cancelled.
+        """
+        targets = set(map(id, handles))
+        with self._lock:
+            cancelled = [handle for handle in self._pending if id(handle) in targets]
+            if cancelled:
+                self._pending = deque(handle for handle in self._pending if id(handle) not in targets)
+            if self._current is not None and id(self._current) in targets:
+                cancelled.insert(0, self._current)
+                self._current = None
+            if self._current is None and not self._pending:
+                self._idle.set()
+        for handle in cancelled:
+            handle.cancelled = True
+            self._notifications.put(handle._finish)
+        if cancelled:
+            logger.debug(f"Playback cancelled {len(cancelled)} buffer(s)")
+        return len(cancelled)
+
+    def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until nothing is playing or queued.
+
+        Returns:
+            bool: True if the engine became idle within the timeout.
+        """
+        return self._idle.wait(timeout)
+
+    def close(self) -> None:
+        """Stop playback and close the output stream."""
+        self.stop()
+        with self._lock:
+            stream, self._stream = self._stream, None
+        if stream is not None:
+            try:
+                stream.stop()
+                stream.close()
+            except Exception as e:
+                logger.error(f"Error closing playback stream: {e}")
+
+    def _callback(self, outdata: np.ndarray, frames: int, time_info, status) -> None:
+        if status and status.output_underflow:
+            self.underflows += 1
+        written = 0
+        with self._lock:
+            while written < frames:
+                handle = self._current
+                if handle is None:
+                    if not self._pending:
+                        break
+                    handle = self._current = self._pending.popleft()
+                    handle.started_at = time.perf_counter()
+                    self._notifications.put(handle._run_start_callback)
+
+                count = min(frames - written, len(handle.pcm) - handle.offset)
+                outdata[written:written + count] = handle.pcm[handle.offset:handle.offset + count, None]
+                handle.offset += count
+                written += count
+                if handle.offset >= len(handle.pcm):
+                    self._current = None
+                    self._notifications.put(handle._finish)
+
+            if self._current is None and not self._pending:
+                self._idle.set()
+        if written < frames:
+            outdata[written:] = 0
+
+    def _notify_loop(self) -> None:
+        while True:
+            notify = self._notifications.get()
+            try:
+                notify()
+            except Exception as e:
+                logger.error(f"Error dispatching playback notification: {e}")
+
+
+_shared_engine: Optional[PlaybackEngine] = None
+_shared_engine_lock = threading.Lock()
+
+
+def get_playback_engine() -> PlaybackEngine:
+    """
+    Get the process-wide playback engine, creating it on first use.
+
+    Returns:
+        PlaybackEngine: The shared engine.
+    """
+    global _shared_engine
+    with _shared_engine_lock:
+        if _shared_engine is None:
+            _shared_engine = PlaybackEngine()
+            atexit.register(_shared_engine.close)
+        return _shared_engine
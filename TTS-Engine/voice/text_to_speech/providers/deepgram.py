@@ -1,9 +1,9 @@
-import os
 import base64
-import requests
 from typing import Optional
 
 from core.logger import get_logger
+from utils.http_session import PooledHTTPSession, HTTP_ERRORS
+from voice.text_to_speech.audio import AudioData
 from voice.text_to_speech.base import BaseTTSProvider
 
 logger = get_logger(__name__)
@@ -26,13 +26,18 @@ class DeepgramTTSProvider(BaseTTSProvider):
         "aura_zeus": "aura-zeus-en"
     }
     
-    def __init__(self, default_voice: str = "aura_arcas"):
+    def __init__(self, default_voice: str = "aura_arcas", connect_timeout: float = 3.05,
+                 read_timeout: float = 20.0, max_retries: int = 2, http2: bool = False):
         """
         Initialize the Deepgram TTS provider.
         
         Args:
             default_voice (str): The default voice model to use.
                                  Must be one of the keys in VOICE_MODELS.
+            connect_timeout (float): Seconds to wait for a connection to the API.
+            read_timeout (float): Seconds to wait for the API to respond.
+            max_retries (int): Retries on 5xx responses and connection errors.
+            http2 (bool): Use HTTP/2 when httpx[http2] is installed.
         """
         super().__init__()
         self.api_url = "https://deepgram.com/api/ttsAudioGeneration"
@@ -42,11 +47,9 @@ class DeepgramTTSProvider(BaseTTSProvider):
             default_voice = "aura_arcas"
             
         self.default_voice = default_voice
-        self.temp_audio_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 
-                                           "../../../../data/cache/temp_audio.mp3")
-        
-        # Ensure cache directory exists
-        os.makedirs(os.path.dirname(self.temp_audio_path), exist_ok=True)
+        # One pooled session per provider keeps the TLS connection alive between replies
+        self.session = PooledHTTPSession(connect_timeout=connect_timeout, read_timeout=read_timeout,
+                                         max_retries=max_retries, http2=http2, headers=self._get_headers())
         
         logger.info(f"Initialized Deepgram TTS provider with default voice: {self.VOICE_MODELS[default_voice]}")
     
@@ -78,7 +81,7 @@ class DeepgramTTSProvider(BaseTTSProvider):
             "dnt": "1"
         }
     
-    def generate_speech(self, text: str, voice: Optional[str] = None, output_path: Optional[str] = None) -> str:
+    def synthesize(self, text: str, voice: Optional[str] = None) -> AudioData:
         """
         Convert text to speech using Deepgram's API.
         
@@ -86,11 +89,9 @@ class DeepgramTTSProvider(BaseTTSProvider):
             text (str): The text to convert to speech.
             voice (str, optional): Voice model to use (one of the keys in VOICE_MODELS).
                                   If None, uses the default voice.
-            output_path (str, optional): Path to save the audio file.
-                                        If None, uses a temporary file.
         
         Returns:
-            str: Path to the generated audio file.
+            AudioData: The generated MP3 audio, held in memory.
             
         Raises:
             Exception: If the API request fails.
@@ -99,62 +100,21 @@ class DeepgramTTSProvider(BaseTTSProvider):
         voice_key = voice if voice in self.VOICE_MODELS else self.default_voice
         voice_model = self.VOICE_MODELS[voice_key]
         
-        # Determine output file path
-        file_path = output_path if output_path else self.temp_audio_path
-        
-        # Clean up any existing file
-        try:
-            if os.path.exists(file_path):
-                os.remove(file_path)
-        except Exception as e:
-            logger.warning(f"Failed to remove existing audio file: {e}")
-        
         # Prepare the request
-        headers = self._get_headers()
         payload = {"text": text, "model": voice_model}
         
         try:
             logger.debug(f"Sending request to Deepgram TTS API with voice model: {voice_model}")
-            response = requests.post(self.api_url, headers=headers, json=payload)
+            response = self.session.post(self.api_url, json=payload)
             response.raise_for_status()
             
-            # Save the audio file
-            with open(file_path, 'wb') as audio_file:
-                audio_file.write(base64.b64decode(response.json()['data']))
+            audio = AudioData(base64.b64decode(response.json()['data']), self.OUTPUT_FORMAT)
+            logger.debug(f"Successfully generated speech ({len(audio)} bytes)")
+            return audio
             
-            logger.debug(f"Successfully generated speech, saved to: {file_path}")
-            return file_path
-            
-        except requests.exceptions.RequestException as e:
+        except HTTP_ERRORS as e:
             logger.error(f"Failed to generate speech with Deepgram: {e}")
             raise Exception(f"Deepgram TTS API request failed: {e}")
-    
-    def speak(self, text: str, voice: Optional[str] = None) -> None:
-        """
-        Convert text to speech and play it.
-        
-        Args:
-            text (str): The text to speak.
-            voice (str, optional): Voice model to use.
-                                  If None, uses the default voice.
-        """
-        try:
-            # Generate speech
-            audio_path = self.generate_speech(text, voice)
-            
-            # Import here to avoid circular imports
-            from utils.helpers import play_audio
-            
-            # Play the audio
-            logger.debug(f"Playing audio: {audio_path}")
-            play_audio(audio_path)
-            
-            # Clean up the temporary file
-            if os.path.exists(audio_path) and audio_path == self.temp_audio_path:
-                os.remove(audio_path)
-                
-        except Exception as e:
-            logger.error(f"Failed to speak text: {e}")
             
     def list_available_voices(self) -> dict:
         """
@@ -1,17 +1,24 @@
+import contextlib
 import os
-import re
+import subprocess
+import aiofiles
+import edge_tts
 from core.logger import get_logger
+from utils.async_tools import get_background_loop
+from voice.text_to_speech.audio import AudioData
 from voice.text_to_speech.base import BaseTTSProvider
-from typing import Optional, Dict, Any
-from utils.helpers import play_audio
+from typing import Optional, Dict, Any, AsyncIterator, Iterator, Union
 
 logger = get_logger(__name__)
 
 class EdgeTTSProvider(BaseTTSProvider):
     """
-    Text-to-Speech provider that uses the Edge TTS command-line tool.
+    Text-to-Speech provider backed by Microsoft Edge's online TTS service.
     
-    This provider runs the edge-tts system command with the appropriate parameters.
+    By default the edge_tts library is driven in-process on the shared
+    background event loop, so each utterance costs one websocket request
+    rather than a new interpreter. Set use_cli=True to fall back to running
+    the edge-tts command-line tool.
     Available voices include (but are not limited to):
       • en-US-JennyNeural
       • en-SG-LunaNeural
@@ -29,12 +36,13 @@ class EdgeTTSProvider(BaseTTSProvider):
         "en-CA-LiamNeural": "en-CA-LiamNeural",
     }
 
-    def __init__(self, default_voice: str = "en-US-JennyNeural"):
+    def __init__(self, default_voice: str = "en-US-JennyNeural", use_cli: bool = False):
         """
         Initialize the EdgeTTSProvider.
         
         Args:
             default_voice (str): The default voice to use.
+            use_cli (bool): Run the edge-tts command-line tool instead of the in-process client.
         """
         super().__init__()
         if default_voice not in self.VOICE_OPTIONS:
@@ -45,60 +53,142 @@ class EdgeTTSProvider(BaseTTSProvider):
         # Create cache directory with absolute path
         self.cache_dir = os.path.abspath(os.path.join("data", "cache"))
         os.makedirs(self.cache_dir, exist_ok=True)
+
+        self.use_cli = use_cli
+        self.loop = None if use_cli else get_background_loop()
+
+    def _resolve_voice(self, voice: Optional[str]) -> str:
+        return voice if (voice and voice in self.VOICE_OPTIONS) else self.default_voice
+
+    async def _astream_audio(self, text: str, voice: str) -> AsyncIterator[bytes]:
+        """Yield MP3 chunks from the Edge TTS service as they arrive."""
+        communicate = edge_tts.Communicate(text, voice)
+        async for chunk in communicate.stream():
+            if chunk["type"] == "audio" and chunk["data"]:
+                yield chunk["data"]
+
+    async def _asynthesize(self, text: str, voice: str) -> bytes:
+        return b"".join([chunk async for chunk in self._astream_audio(text, voice)])
+
+    def stream_speech(self, text: str, voice: Optional[str] = None) -> Iterator[bytes]:
+        """
+        Synthesize speech in-process and yield MP3 chunks as they arrive.
         
-        # Create paths for audio and subtitle files
-        self.subtitle_file = os.path.join(self.cache_dir, "subtitles.srt")
+        Args:
+            text (str): The text to synthesize.
+            voice (Optional[str]): The voice to use.
+            
+        Yields:
+            bytes: Consecutive chunks of the MP3 stream.
+        """
+        voice = self._resolve_voice(voice)
+        loop = self.loop or get_background_loop()
+        yield from loop.iterate(self._astream_audio(text, voice))
 
-    def generate_speech(self, text: str, voice: Optional[str] = None, output_path: Optional[str] = None) -> str:
+    def synthesize(self, text: str, voice: Optional[str] = None) -> AudioData:
         """
-        Generate speech using the edge-tts command.
+        Synthesize speech and return the complete MP3 audio in memory.
         
         Args:
             text (str): The text to synthesize.
             voice (Optional[str]): The voice to use.
-            output_path (Optional[str]): The file path to save the generated audio.
             
         Returns:
-            str: The path to the generated audio file.
+            AudioData: The MP3 audio.
         """
-        voice = voice if (voice and voice in self.VOICE_OPTIONS) else self.default_voice
-        
-        # --- THIS IS THE FIX ---
-        # Create a unique and safe filename from the first 5 words of the text
-        # This prevents the app from playing old, cached audio files.
-        first_five_words = "".join(text.split()[:5])
-        safe_filename = re.sub(r'[^a-zA-Z0-9]', '', first_five_words)
-        
-        # Use the provided output_path or create a unique one in the cache
-        output_file = output_path if output_path else os.path.join(self.cache_dir, f"{safe_filename}.mp3")
+        voice = self._resolve_voice(voice)
+        if self.use_cli:
+            return self._synthesize_cli(text, voice)
+
+        loop = self.loop or get_background_loop()
+        return AudioData(loop.run(self._asynthesize(text, voice)), self.OUTPUT_FORMAT)
+
+    async def asynthesize(self, text: str, voice: Optional[str] = None) -> AudioData:
+        """
+        Synthesize speech natively on the caller's event loop.
         
-        # Create a simple command just like the sample code
-        command = f'edge-tts --voice "{voice}" --text "{text}" --write-media "{output_file}" --write-subtitles "{self.subtitle_file}"'
+        Args:
+            text (str): The text to synthesize.
+            voice (Optional[str]): The voice to use.
+            
+        Returns:
+            AudioData: The MP3 audio.
+        """
+        if self.use_cli:
+            return await super().asynthesize(text, voice)
+        return AudioData(await self._asynthesize(text, self._resolve_voice(voice)), self.OUTPUT_FORMAT)
+
+    def _run_cli(self, text: str, voice: str, output_file: str) -> None:
+        # Arguments are passed as a list so quotes in the text cannot break the command.
+        # Each call writes its subtitles next to its own output, so concurrent calls
+        # never share (or remove) each other's file.
+        subtitle_file = os.path.splitext(output_file)[0] + ".srt"
+        command = [
+            "edge-tts", "--voice", voice, "--text", text,
+            "--write-media", output_file, "--write-subtitles", subtitle_file,
+        ]
+        logger.debug(f"Executing edge-tts for voice {voice}")
+        try:
+            subprocess.run(command, check=True, capture_output=True)
+        finally:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(subtitle_file)
+
+    def _synthesize_cli(self, text: str, voice: str) -> AudioData:
+        # The command-line tool can only write to a file, so read it back and remove it.
+        output_file = self.new_output_path()
+        try:
+            self._run_cli(text, voice, output_file)
+            return AudioData.from_file(output_file, self.OUTPUT_FORMAT)
+        finally:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(output_file)
+
+    async def agenerate_speech(self, text: str, voice: Optional[str] = None, output_path: Optional[str] = None,
+                               in_memory: bool = False) -> Union[str, AudioData]:
+        """
+        Async version of `generate_speech`; the file is written with aiofiles.
+
+        Without an `output_path` the audio goes to a new temporary file, which
+        the caller owns and removes. Wrap the provider in `CachedTTSProvider` to
+        keep repeated phrases on disk.
         
-        logger.debug(f"Executing command: {command}")
-        os.system(command)
+        Args:
+            text (str): The text to synthesize.
+            voice (Optional[str]): The voice to use.
+            output_path (Optional[str]): The file path to save the generated audio.
+            in_memory (bool): Return the AudioData instead of writing a file.
+            
+        Returns:
+            Union[str, AudioData]: The path to the generated audio file, or the audio itself.
+        """
+        audio = await self.asynthesize(text, voice)
+        if in_memory:
+            return audio
+
+        output_file = output_path or self.new_output_path()
+        async with aiofiles.open(output_file, "wb") as audio_file:
+            await audio_file.write(audio.data)
         return output_file
 
-    def speak(self, text: str, voice: Optional[str] = None) -> None:
+    async def astream_speech(self, text: str, voice: Optional[str] = None) -> AsyncIterator[bytes]:
         """
-        Generate and immediately play synthesized speech.
+        Yield MP3 chunks as the Edge TTS service sends them.
         
         Args:
-            text (str): The text to speak.
+            text (str): The text to synthesize.
             voice (Optional[str]): The voice to use.
-        """
-        try:
-            audio_path = self.generate_speech(text, voice)
-            # Use the play_audio helper function
-            play_audio(audio_path)
             
-            # Cleanup: remove the subtitle file and audio file after playing
-            if os.path.exists(self.subtitle_file):
-                os.remove(self.subtitle_file)
-            if os.path.exists(audio_path):
-                os.remove(audio_path)
-        except Exception as e:
-            logger.error(f"Failed in EdgeTTSProvider speak: {e}")
+        Yields:
+            bytes: Consecutive chunks of the MP3 stream.
+        """
+        if self.use_cli:
+            async for chunk in super().astream_speech(text, voice):
+                yield chunk
+            return
+
+        async for chunk in self._astream_audio(text, self._resolve_voice(voice)):
+            yield chunk
 
     def list_available_voices(self) -> Dict[str, Any]:
         """
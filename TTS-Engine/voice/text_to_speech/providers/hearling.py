@@ -1,14 +1,11 @@
 import aiohttp
-import asyncio
-import aiofiles
-import os
 import random
-import threading
-from typing import Optional, List
+from typing import Optional, List, AsyncIterator
 
 from core.logger import get_logger
+from utils.async_tools import get_background_loop
+from voice.text_to_speech.audio import AudioData
 from voice.text_to_speech.base import BaseTTSProvider
-from utils.helpers import play_audio
 
 logger = get_logger(__name__)
 
@@ -33,43 +30,26 @@ class HearlingTTSProvider(BaseTTSProvider):
         self.max_pool_size = max_pool_size
         self.is_closing = False
 
-        # Create a temporary audio file path under data/cache
-        self.temp_audio_path = os.path.join(
-            os.path.dirname(os.path.abspath(__file__)),
-            "../../../../data/cache/temp_audio.mp3"
-        )
-        os.makedirs(os.path.dirname(self.temp_audio_path), exist_ok=True)
-
-        # Create a new event loop running in its own thread.
-        self.loop = asyncio.new_event_loop()
-        self.loop_thread = threading.Thread(target=self._run_loop, args=(self.loop,), daemon=True)
-        self.loop_thread.start()
-        # Ensure the provider is initialized
-        future = asyncio.run_coroutine_threadsafe(self.initialize(), self.loop)
+        # The aiohttp session lives on the shared background loop, so sync and
+        # async callers (from any loop) share one session and token pool.
+        self.session = None
+        self.loop = get_background_loop()
         try:
-            future.result()  # Block until initialization completes.
+            self.loop.run(self.initialize())  # Block until initialization completes.
         except Exception as e:
             logger.error(f"Initialization error in Hearling provider: {e}")
         logger.info("Initialized Hearling TTS provider")
 
-    def _run_loop(self, loop: asyncio.AbstractEventLoop) -> None:
-        """Utility function: run the provided loop forever in a dedicated thread."""
-        asyncio.set_event_loop(loop)
-        loop.run_forever()
-
     async def initialize(self) -> None:
         """Initialize the async session and prefill the token pool."""
         self.session = aiohttp.ClientSession()
         await self.refill_token_pool()
 
     async def cleanup(self) -> None:
-        """Cleanup asynchronous resources and stop the dedicated event loop."""
+        """Close the aiohttp session. The shared loop keeps running for other users."""
         self.is_closing = True
         if self.session and not self.session.closed:
             await self.session.close()
-        # Stop the loop and wait for the thread to finish.
-        self.loop.call_soon_threadsafe(self.loop.stop)
-        self.loop_thread.join()
 
     async def refill_token_pool(self) -> None:
         """Asynchronously prefill the token pool with account tokens."""
@@ -105,68 +85,67 @@ class HearlingTTSProvider(BaseTTSProvider):
             await self.refill_token_pool()
         return self.token_pool.pop() if self.token_pool else None
 
-    async def download_audio(self, url: str, filename: str) -> None:
-        """Download an audio file from the URL asynchronously."""
+    async def download_audio(self, url: str) -> bytes:
+        """Download an audio clip from the URL into memory."""
         async with self.session.get(url) as response:
-            async with aiofiles.open(filename, 'wb') as f:
-                await f.write(await response.read())
+            response.raise_for_status()
+            return await response.read()
 
-    async def _async_generate_speech(self, text: str, voice: Optional[str], output_path: str) -> None:
-        """The asynchronous implementation of speech generation via Hearling API."""
-        try:
-            token = await self.get_token()
-            if not token:
-                raise Exception("Failed to get token")
-            headers = {"Authorization": f"Bearer {token}"}
+    async def _request_clip_url(self, text: str, voice: Optional[str]) -> str:
+        """Ask the Hearling API to synthesize a clip and return its download URL."""
+        token = await self.get_token()
+        if not token:
+            raise Exception("Failed to get token")
+        headers = {"Authorization": f"Bearer {token}"}
 
-            # Choose the provided voice if valid; otherwise, use the first voice.
-            selected_voice = voice if (voice in self.AVAILABLE_VOICES) else self.AVAILABLE_VOICES[0]
-            payload = {"text": text, "voice": selected_voice}
+        # Choose the provided voice if valid; otherwise, use the first voice.
+        selected_voice = voice if (voice in self.AVAILABLE_VOICES) else self.AVAILABLE_VOICES[0]
+        payload = {"text": text, "voice": selected_voice}
 
-            async with self.session.post(self.url_clips, headers=headers, json=payload) as response:
-                response.raise_for_status()
-                data = await response.json()
-                audio_url = data['clip']['location']
+        async with self.session.post(self.url_clips, headers=headers, json=payload) as response:
+            response.raise_for_status()
+            data = await response.json()
+            audio_url = data['clip']['location']
 
-            await self.download_audio(audio_url, output_path)
+        # Refill token pool asynchronously.
+        if not self.is_closing:
+            self.loop.submit(self.refill_token_pool())
+        return audio_url
 
-            # Refill token pool asynchronously.
-            if not self.is_closing:
-                asyncio.run_coroutine_threadsafe(self.refill_token_pool(), self.loop)
+    async def _async_synthesize(self, text: str, voice: Optional[str]) -> AudioData:
+        """The asynchronous implementation of speech generation via Hearling API."""
+        try:
+            audio_url = await self._request_clip_url(text, voice)
+            return AudioData(await self.download_audio(audio_url), self.OUTPUT_FORMAT)
         except Exception as e:
             logger.error(f"Error generating speech: {e}")
             raise
 
-    def generate_speech(self, text: str, voice: Optional[str] = None, output_path: Optional[str] = None) -> str:
+    async def _async_stream_speech(self, text: str, voice: Optional[str]) -> AsyncIterator[bytes]:
+        audio_url = await self._request_clip_url(text, voice)
+        async with self.session.get(audio_url) as response:
+            response.raise_for_status()
+            async for chunk in response.content.iter_chunked(self.STREAM_CHUNK_SIZE):
+                yield chunk
+
+    def synthesize(self, text: str, voice: Optional[str] = None) -> AudioData:
         """
         A synchronous wrapper that triggers asynchronous speech generation.
-        Returns the path to the generated audio file.
+        Returns the clip's audio in memory.
         """
-        file_path = output_path if output_path else self.temp_audio_path
-        future = asyncio.run_coroutine_threadsafe(
-            self._async_generate_speech(text, voice, file_path), self.loop
-        )
-        try:
-            future.result()  # Block until the coroutine completes.
-        except Exception as e:
-            logger.error(f"Error in generate_speech: {e}")
-            raise
-        return file_path
+        return self.loop.run(self._async_synthesize(text, voice))
 
-    def speak(self, text: str, voice: Optional[str] = None) -> None:
+    async def asynthesize(self, text: str, voice: Optional[str] = None) -> AudioData:
         """
-        Convert text to speech and play the generated audio.
-        After playback, cleans up the temporary audio file.
-        
-        This method handles the async operations internally, providing a 
-        synchronous interface to match other providers.
+        Synthesize speech without blocking the caller's event loop.
+        Returns the clip's audio in memory.
         """
-        try:
-            audio_path = self.generate_speech(text, voice)
-            play_audio(audio_path)
-            # Don't remove the file here as play_audio now handles cleanup
-        except Exception as e:
-            logger.error(f"Failed to speak text: {e}")
+        return await self.loop.run_async(self._async_synthesize(text, voice))
+
+    async def astream_speech(self, text: str, voice: Optional[str] = None) -> AsyncIterator[bytes]:
+        """Yield the clip's audio chunks as they are downloaded."""
+        async for chunk in self.loop.aiterate(self._async_stream_speech(text, voice)):
+            yield chunk
 
     def list_available_voices(self) -> List[str]:
         """Return the list of available voices."""
@@ -178,7 +157,7 @@ class HearlingTTSProvider(BaseTTSProvider):
         Note that errors during __del__ are logged.
         """
         try:
-            if hasattr(self, 'loop') and self.loop.is_running():
-                asyncio.run_coroutine_threadsafe(self.cleanup(), self.loop).result()
+            if hasattr(self, 'loop') and self.loop.loop.is_running() and not self.loop.in_loop_thread():
+                self.loop.run(self.cleanup(), timeout=5)
         except Exception as e:
             logger.error(f"Error during cleanup in __del__: {e}")
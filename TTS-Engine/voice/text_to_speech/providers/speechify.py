@@ -1,11 +1,10 @@
-import os
-import requests
 import base64
 from typing import Optional, Dict, Any
 
 from core.logger import get_logger
+from utils.http_session import PooledHTTPSession
+from voice.text_to_speech.audio import AudioData
 from voice.text_to_speech.base import BaseTTSProvider
-from utils.helpers import play_audio
 
 logger = get_logger(__name__)
 
@@ -29,45 +28,39 @@ class SpeechifyTTSProvider(BaseTTSProvider):
         "narrator": "narrator"
     }
     
-    def __init__(self, default_voice: str = "mrbeast"):
+    def __init__(self, default_voice: str = "mrbeast", connect_timeout: float = 3.05,
+                 read_timeout: float = 20.0, max_retries: int = 2, http2: bool = False):
         """
         Initialize the Speechify TTS provider.
         
         Args:
             default_voice (str): Default voice to use
+            connect_timeout (float): Seconds to wait for a connection to the API
+            read_timeout (float): Seconds to wait for the API to respond
+            max_retries (int): Retries on 5xx responses and connection errors
+            http2 (bool): Use HTTP/2 when httpx[http2] is installed
         """
         super().__init__()
         self.api_url = "https://audio.api.speechify.com/generateAudioFiles"
         self.default_voice = default_voice
-        self.temp_audio_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 
-                                           "../../../../data/cache/temp_audio.mp3")
-        
-        # Ensure cache directory exists
-        os.makedirs(os.path.dirname(self.temp_audio_path), exist_ok=True)
+        # One pooled session per provider keeps the TLS connection alive between replies
+        self.session = PooledHTTPSession(connect_timeout=connect_timeout, read_timeout=read_timeout,
+                                         max_retries=max_retries, http2=http2)
         
         logger.info(f"Initialized Speechify TTS provider with default voice: {default_voice}")
 
-    def generate_speech(self, text: str, voice: Optional[str] = None, output_path: Optional[str] = None) -> str:
+    def synthesize(self, text: str, voice: Optional[str] = None) -> AudioData:
         """
         Generate speech using Speechify's API.
         
         Args:
             text (str): Text to convert to speech
             voice (Optional[str]): Voice model to use
-            output_path (Optional[str]): Path to save audio file
             
         Returns:
-            str: Path to generated audio file
+            AudioData: Generated MP3 audio, held in memory
         """
         voice_name = voice if voice in self.VOICE_MODELS else self.default_voice
-        file_path = output_path if output_path else self.temp_audio_path
-        
-        # Clean up existing file
-        try:
-            if os.path.exists(file_path):
-                os.remove(file_path)
-        except Exception as e:
-            logger.warning(f"Failed to remove existing audio file: {e}")
         
         # Prepare request
         payload = {
@@ -81,39 +74,15 @@ class SpeechifyTTSProvider(BaseTTSProvider):
         }
         
         try:
-            response = requests.post(self.api_url, json=payload)
+            response = self.session.post(self.api_url, json=payload)
             response.raise_for_status()
             
-            # Save audio file
-            audio_data = base64.b64decode(response.json()['audioStream'])
-            with open(file_path, 'wb') as audio_file:
-                audio_file.write(audio_data)
-            
-            return file_path
+            return AudioData(base64.b64decode(response.json()['audioStream']), self.OUTPUT_FORMAT)
             
         except Exception as e:
             logger.error(f"Failed to generate speech with Speechify: {e}")
             raise
 
-    def speak(self, text: str, voice: Optional[str] = None) -> None:
-        """
-        Convert text to speech and play it.
-        
-        Args:
-            text (str): Text to speak
-            voice (Optional[str]): Voice to use
-        """
-        try:
-            audio_path = self.generate_speech(text, voice)
-            play_audio(audio_path)
-            
-            # Cleanup
-            if os.path.exists(audio_path) and audio_path == self.temp_audio_path:
-                os.remove(audio_path)
-                
-        except Exception as e:
-            logger.error(f"Failed to speak text: {e}")
-
     def list_available_voices(self) -> Dict[str, Any]:
         """
         Get available voice models.
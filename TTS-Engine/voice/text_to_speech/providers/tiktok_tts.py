@@ -1,9 +1,8 @@
-import os
-import json
 import base64
-import requests
 from typing import Optional, Dict, Any
 from core.logger import get_logger
+from utils.http_session import PooledHTTPSession, HTTP_ERRORS
+from voice.text_to_speech.audio import AudioData
 from voice.text_to_speech.base import BaseTTSProvider
 
 logger = get_logger(__name__)
@@ -46,13 +45,18 @@ class TikTokTTSProvider(BaseTTSProvider):
         "weilbyte": "data",
     }
 
-    def __init__(self, variant: str = "gesserit", default_voice: str = "en_us_rocket"):
+    def __init__(self, variant: str = "gesserit", default_voice: str = "en_us_rocket", connect_timeout: float = 3.05,
+                 read_timeout: float = 20.0, max_retries: int = 2, http2: bool = False):
         """
         Initialize the tiktok API TTS provider.
         
         Args:
             variant (str): Which underlying API variant to use ("gesserit" or "weilbyte").
             default_voice (str): The default voice to use.
+            connect_timeout (float): Seconds to wait for a connection to the API.
+            read_timeout (float): Seconds to wait for the API to respond.
+            max_retries (int): Retries on 5xx responses and connection errors.
+            http2 (bool): Use HTTP/2 when httpx[http2] is installed.
         """
         super().__init__()
         if variant not in self.API_ENDPOINTS:
@@ -64,75 +68,41 @@ class TikTokTTSProvider(BaseTTSProvider):
         self.default_voice = default_voice
         self.api_endpoint = self.API_ENDPOINTS[variant]
         self.request_data_key = self.REQUEST_DATA_KEYS[variant]
-        self.temp_audio_path = os.path.join(
-            os.path.dirname(os.path.abspath(__file__)),
-            "../../../../data/cache/temp_audio.mp3"
-        )
-        os.makedirs(os.path.dirname(self.temp_audio_path), exist_ok=True)
+        # One pooled session per provider keeps the TLS connection alive between replies
+        self.session = PooledHTTPSession(connect_timeout=connect_timeout, read_timeout=read_timeout,
+                                         max_retries=max_retries, http2=http2,
+                                         headers={"Content-Type": "application/json"})
         logger.info(f"Initialized tiktokAPITTSProvider using variant '{variant}' with default voice: {default_voice}")
 
-    def generate_speech(self, text: str, voice: Optional[str] = None, output_path: Optional[str] = None) -> str:
+    def synthesize(self, text: str, voice: Optional[str] = None) -> AudioData:
         """
         Convert text to speech using the selected API.
         
         Args:
             text (str): Text to synthesize.
             voice (Optional[str]): Voice to use; if not provided or invalid, uses the default.
-            output_path (Optional[str]): Where to save the generated audio.
             
         Returns:
-            str: Path to the generated audio file.
+            AudioData: The generated MP3 audio, held in memory.
         """
         # Use default voice if none provided or if the voice is not valid.
         voice = voice if (voice and voice in self.voice_options) else self.default_voice
-        file_path = output_path if output_path else self.temp_audio_path
 
-        # Clean up an existing file if needed.
-        if os.path.exists(file_path):
-            try:
-                os.remove(file_path)
-            except Exception as e:
-                logger.warning(f"Couldn't remove existing temporary file: {e}")
-
-        headers = {"Content-Type": "application/json"}
         payload = {"text": text, "voice": voice}
 
         try:
-            response = requests.post(self.api_endpoint, headers=headers, data=json.dumps(payload))
+            response = self.session.post(self.api_endpoint, json=payload)
             response.raise_for_status()
-        except requests.RequestException as e:
+        except HTTP_ERRORS as e:
             logger.error(f"Request to {self.api_endpoint} failed: {e}")
             raise
 
         try:
-            audio_data = base64.b64decode(response.json()[self.request_data_key])
-            with open(file_path, "wb") as f:
-                f.write(audio_data)
+            return AudioData(base64.b64decode(response.json()[self.request_data_key]), self.OUTPUT_FORMAT)
         except Exception as e:
-            logger.error(f"Error saving audio data: {e}")
+            logger.error(f"Error decoding audio data: {e}")
             raise
 
-        return file_path
-
-    def speak(self, text: str, voice: Optional[str] = None) -> None:
-        """
-        Convert text to speech and play it immediately.
-        
-        Args:
-            text (str): Text to speak.
-            voice (Optional[str]): Voice to be used.
-        """
-        try:
-            audio_path = self.generate_speech(text, voice)
-            # Using our centralized play_audio helper.
-            from utils.helpers import play_audio
-            play_audio(audio_path)
-            # Clean up the temp file
-            if os.path.exists(audio_path) and audio_path == self.temp_audio_path:
-                os.remove(audio_path)
-        except Exception as e:
-            logger.error(f"Failed to speak text in tiktokAPITTSProvider: {e}")
-
     def list_available_voices(self) -> Dict[str, Any]:
         """
         Get a dictionary of available voices.
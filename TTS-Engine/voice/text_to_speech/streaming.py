@@ -0,0 +1,273 @@
+import queue
+import re
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from core.logger import get_logger
+from voice.text_to_speech.base import BaseTTSProvider
+from voice.text_to_speech.playback import PlaybackEngine, PlaybackHandle, get_playback_engine
+
+logger = get_logger(__name__)
+
+# A sentence ends at terminal punctuation (optionally followed by closing quotes
+# or brackets) that is followed by whitespace, or at a line break. Requiring the
+# trailing whitespace keeps "3." in "3.5" from being treated as a boundary.
+_SENTENCE_BOUNDARY = re.compile(r'[.!?…]+["\'”’)\]]*\s+|\n+')
+
+_ABBREVIATIONS = {"mr.", "mrs.", "ms.", "dr.", "prof.", "sr.", "jr.", "st.", "vs.", "e.g.", "i.e.", "no."}
+
+# Sentinel pushed through the worker queues to signal the end of a reply.
+_END_OF_STREAM = object()
+
+
+class SentenceChunker:
+    """
+    Incrementally splits streamed text into sentences.
+
+    Tokens are fed as they arrive from the language model; complete sentences
+    are returned as soon as their boundary is seen, and the remainder is kept
+    until more text (or `flush`) arrives.
+    """
+
+    def __init__(self, min_chars: int = 8, max_chars: int = 240):
+        """
+        Initialize the chunker.
+
+        Args:
+            min_chars (int): Sentences shorter than this are merged with the next one
+                             so that tiny fragments are not synthesized on their own.
+            max_chars (int): Run-on text longer than this is split at the last comma
+                             or space so a single long sentence cannot stall playback.
+        """
+        self.min_chars = min_chars
+        self.max_chars = max_chars
+        self._buffer = ""
+
+    def feed(self, text: str) -> List[str]:
+        """
+        Add streamed text and return any sentences it completed.
+
+        Args:
+            text (str): The next fragment of the streamed reply.
+
+        Returns:
+            List[str]: Complete sentences, in order. May be empty.
+        """
+        if not text:
+            return []
+        self._buffer += text
+
+        sentences = []
+        start = 0
+        for match in _SENTENCE_BOUNDARY.finditer(self._buffer):
+            candidate = self._buffer[start:match.end()].strip()
+            if len(candidate) < self.min_chars or self._ends_with_abbreviation(candidate):
+                continue
+            sentences.append(candidate)
+            start = match.end()
+        self._buffer = self._buffer[start:]
+
+        while len(self._buffer) > self.max_chars:
+            split_at = self._buffer.rfind(", ", 0, self.max_chars)
+            if split_at == -1:
+                split_at = self._buffer.rfind(" ", 0, self.max_chars)
+            if split_at <= 0:
+                break
+            sentences.append(self._buffer[:split_at + 1].strip())
+            self._buffer = self._buffer[split_at + 1:].lstrip()
+
+        return sentences
+
+    def flush(self) -> Optional[str]:
+        """
+        Return whatever text is left once the stream has ended.
+
+        Returns:
+            Optional[str]: The trailing sentence, or None if nothing is buffered.
+        """
+        remainder = self._buffer.strip()
+        self._buffer = ""
+        return remainder or None
+
+    @staticmethod
+    def _ends_with_abbreviation(candidate: str) -> bool:
+        last_word = candidate.rsplit(None, 1)[-1].lower()
+        return last_word in _ABBREVIATIONS
+
+
+class LatencyTrace:
+    """
+    Records when the milestones of a spoken reply were reached.
+
+    All marks are seconds relative to the moment the trace was created, which
+    is normally when the request was sent to the language model.
+    """
+
+    LLM_FIRST_TOKEN = "llm_first_token"
+    FIRST_SENTENCE_SYNTHESIZED = "first_sentence_synthesized"
+    FIRST_SAMPLE_PLAYED = "first_sample_played"
+
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self.marks: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def mark(self, name: str) -> None:
+        """Record a milestone. Only the first occurrence of each name is kept."""
+        elapsed = time.perf_counter() - self.started_at
+        with self._lock:
+            self.marks.setdefault(name, elapsed)
+
+    def get(self, name: str) -> Optional[float]:
+        """Return the elapsed seconds for a milestone, or None if it was never reached."""
+        with self._lock:
+            return self.marks.get(name)
+
+    def summary(self) -> str:
+        """Return the recorded milestones as a single human-readable line."""
+        with self._lock:
+            items = sorted(self.marks.items(), key=lambda item: item[1])
+        if not items:
+            return "no latency marks recorded"
+        return ", ".join(f"{name}={elapsed * 1000:.0f}ms" for name, elapsed in items)
+
+
+class StreamingSpeechPipeline:
+    """
+    Speaks a streamed reply sentence by sentence.
+
+    The caller's thread consumes the text stream and splits it into sentences.
+    A synthesis worker turns each sentence into PCM while the previous sentence
+    is still playing and queues it on the shared `PlaybackEngine`, which plays
+    the sentences back to back, so audio starts after the first sentence
+    instead of after the whole reply.
+    """
+
+    def __init__(self,
+                 provider: BaseTTSProvider,
+                 voice: Optional[str] = None,
+                 max_pending_sentences: int = 2,
+                 chunker: Optional[SentenceChunker] = None,
+                 engine: Optional[PlaybackEngine] = None):
+        """
+        Initialize the pipeline.
+
+        Args:
+            provider (BaseTTSProvider): Provider used to synthesize each sentence.
+            voice (Optional[str]): Voice passed through to the provider.
+            max_pending_sentences (int): How many synthesized sentences may wait for
+                                         playback before synthesis pauses.
+            chunker (Optional[SentenceChunker]): Sentence splitter to use.
+            engine (Optional[PlaybackEngine]): Engine to play through. Defaults to the
+                                               process-wide engine.
+        """
+        self.provider = provider
+        self.voice = voice
+        self.max_pending_sentences = max_pending_sentences
+        self.chunker = chunker or SentenceChunker()
+        self.engine = engine or get_playback_engine()
+        self._stopped = threading.Event()
+        # Sentences this pipeline queued on the engine and that have not finished. The engine is
+        # shared, so barge-in cancels only these.
+        self._queued: List[PlaybackHandle] = []
+        self._queued_lock = threading.Lock()
+
+    def speak_stream(self, text_stream: Iterable[str], trace: Optional[LatencyTrace] = None) -> LatencyTrace:
+        """
+        Speak a reply as it streams in and block until playback has finished.
+
+        Args:
+            text_stream (Iterable[str]): Text fragments in arrival order, e.g. LLM deltas.
+            trace (Optional[LatencyTrace]): Trace to record into. Pass one created before
+                                            the LLM request to include request latency.
+
+        Returns:
+            LatencyTrace: The milestones reached while speaking this reply.
+        """
+        trace = trace or LatencyTrace()
+        self._stopped.clear()
+        sentence_queue: "queue.Queue" = queue.Queue()
+
+        synth_thread = threading.Thread(
+            target=self._synthesis_worker, args=(sentence_queue, trace),
+            name="TTSSynthesisWorker", daemon=True)
+        synth_thread.start()
+
+        try:
+            for fragment in text_stream:
+                if self._stopped.is_set():
+                    break
+                if not fragment:
+                    continue
+                trace.mark(LatencyTrace.LLM_FIRST_TOKEN)
+                for sentence in self.chunker.feed(fragment):
+                    sentence_queue.put(sentence)
+            remainder = self.chunker.flush()
+            if remainder:
+                sentence_queue.put(remainder)
+        finally:
+            sentence_queue.put(_END_OF_STREAM)
+            synth_thread.join()
+
+        logger.info(f"Streaming TTS latency: {trace.summary()}")
+        return trace
+
+    def _synthesize(self, sentence: str) -> Tuple[np.ndarray, int]:
+        # Decoded straight from memory; no per-sentence file is written.
+        pcm, samplerate = self.provider.synthesize(sentence, self.voice).decode()
+        if pcm.ndim > 1:
+            pcm = pcm.mean(axis=1)
+        return pcm, samplerate
+
+    def stop(self) -> None:
+        """
+        Barge-in: stop speaking the current reply.
+
+        This pipeline's queued and playing sentences are cut off and
+        `speak_stream` returns without consuming the rest of the text stream.
+        Audio others queued on the shared engine keeps playing.
+        """
+        self._stopped.set()
+        with self._queued_lock:
+            queued, self._queued = self._queued, []
+        self.engine.cancel(queued)
+
+    def _forget(self, handle: PlaybackHandle) -> None:
+        with self._queued_lock:
+            if handle in self._queued:
+                self._queued.remove(handle)
+
+    def _synthesis_worker(self, sentence_queue: "queue.Queue", trace: LatencyTrace) -> None:
+        # Handles of sentences queued on the engine but not finished yet. Waiting on
+        # the oldest keeps synthesis at most max_pending_sentences ahead of playback.
+        pending: Deque[PlaybackHandle] = deque()
+        on_start = lambda handle: trace.mark(LatencyTrace.FIRST_SAMPLE_PLAYED)
+        try:
+            while True:
+                sentence = sentence_queue.get()
+                if sentence is _END_OF_STREAM or self._stopped.is_set():
+                    break
+                try:
+                    pcm, samplerate = self._synthesize(sentence)
+                except Exception as e:
+                    logger.error(f"Failed to synthesize sentence '{sentence[:40]}': {e}")
+                    continue
+                trace.mark(LatencyTrace.FIRST_SENTENCE_SYNTHESIZED)
+                with self._queued_lock:
+                    if self._stopped.is_set():
+                        break
+                    handle = self.engine.enqueue(pcm, samplerate, on_start=on_start, on_done=self._forget)
+                    self._queued.append(handle)
+                pending.append(handle)
+                while len(pending) > self.max_pending_sentences:
+                    pending.popleft().wait()
+        except Exception as e:
+            logger.error(f"Error in streaming playback: {e}")
+        finally:
+            # Return only once the reply has been heard (or cut off by stop()).
+            for handle in pending:
+                handle.wait()
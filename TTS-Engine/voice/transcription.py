@@ -0,0 +1,199 @@
+import json
+import threading
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from core.logger import get_logger
+from voice.vad import Utterance, VADEndpointer
+from voice.vosk_pool import get_vosk_model
+
+logger = get_logger(__name__)
+
+
+class BaseTranscriber(ABC):
+    """
+    Turns captured int16 PCM into text without touching the disk.
+
+    Batch backends only implement `finish`. Streaming backends set
+    STREAMING = True and also implement `accept`, which is fed audio while the
+    user is still talking, so that only the tail is left to decode at the
+    endpoint.
+    """
+
+    NAME = "base"
+    STREAMING = False
+
+    def accept(self, pcm: np.ndarray) -> None:
+        """
+        Decode the next chunk of audio. Only called on streaming backends.
+
+        Args:
+            pcm (np.ndarray): Mono int16 samples that follow the previous chunk.
+        """
+        raise NotImplementedError(f"{self.NAME} does not decode incrementally.")
+
+    def partial(self) -> str:
+        """Return the best hypothesis so far, or "" if the backend has none."""
+        return ""
+
+    @abstractmethod
+    def finish(self, utterance_pcm: np.ndarray) -> Tuple[str, List[Dict[str, Any]]]:
+        """
+        Return the final transcript for the utterance and prepare for the next one.
+
+        Args:
+            utterance_pcm (np.ndarray): The complete utterance. Streaming backends
+                have already consumed it through `accept`.
+
+        Returns:
+            Tuple[str, List[Dict[str, Any]]]: The transcript and per-word details.
+        """
+        pass
+
+
+class LeopardTranscriber(BaseTranscriber):
+    """Picovoice Leopard over an in-memory buffer (`Leopard.process`)."""
+
+    NAME = "leopard"
+
+    def __init__(self, leopard):
+        """
+        Args:
+            leopard: A `pvleopard.Leopard` instance. Its sample rate must match the capture rate.
+        """
+        self.leopard = leopard
+
+    def finish(self, utterance_pcm: np.ndarray) -> Tuple[str, List[Dict[str, Any]]]:
+        transcript, words = self.leopard.process(utterance_pcm)
+        return transcript.strip(), [
+            {"word": w.word, "start": w.start_sec, "end": w.end_sec, "conf": w.confidence} for w in words
+        ]
+
+
+class VoskTranscriber(BaseTranscriber):
+    """
+    Vosk `KaldiRecognizer` fed incrementally as audio is captured.
+
+    The recognizer is created once and reused across utterances.
+    """
+
+    NAME = "vosk"
+    STREAMING = True
+
+    def __init__(self, model, sample_rate: int = 16000):
+        """
+        Args:
+            model: A `vosk.Model`, or the path of a model directory (loaded once per process).
+            sample_rate (int): Rate of the audio that will be fed.
+        """
+        from vosk import KaldiRecognizer
+
+        # The Vosk provider and the recognizer pools share the same loaded model.
+        self.model = get_vosk_model(model) if isinstance(model, str) else model
+        self.recognizer = KaldiRecognizer(self.model, sample_rate)
+        self.recognizer.SetWords(True)
+        self._segments: List[Dict[str, Any]] = []
+        self._fed = 0
+
+    def accept(self, pcm: np.ndarray) -> None:
+        self._fed += len(pcm)
+        # AcceptWaveform returns True when Kaldi closed a segment at an internal pause.
+        if self.recognizer.AcceptWaveform(np.ascontiguousarray(pcm, dtype="<i2").tobytes()):
+            self._segments.append(json.loads(self.recognizer.Result()))
+
+    def partial(self) -> str:
+        texts = [segment.get("text", "") for segment in self._segments]
+        texts.append(json.loads(self.recognizer.PartialResult()).get("partial", ""))
+        return " ".join(text for text in texts if text)
+
+    def finish(self, utterance_pcm: np.ndarray) -> Tuple[str, List[Dict[str, Any]]]:
+        if self._fed == 0 and len(utterance_pcm):
+            self.accept(utterance_pcm)
+        segments = self._segments + [json.loads(self.recognizer.FinalResult())]
+        self._segments = []
+        self._fed = 0
+        text = " ".join(segment.get("text", "") for segment in segments if segment.get("text"))
+        words = [word for segment in segments for word in segment.get("result", [])]
+        return text, words
+
+
+class UtteranceTranscription:
+    """
+    Transcribes the utterance an endpointer is capturing, starting while it is captured.
+
+    A worker thread follows the endpointer's ring buffer from the speech onset
+    and feeds new audio to a streaming transcriber every `poll_interval`
+    seconds. When the endpointer closes the utterance, only the audio captured
+    since the last poll remains to decode. Batch transcribers simply get the
+    whole utterance at the end.
+    """
+
+    def __init__(self, transcriber: BaseTranscriber, endpointer: VADEndpointer, poll_interval: float = 0.1,
+                 on_partial: Optional[Callable[[str], None]] = None):
+        """
+        Args:
+            transcriber (BaseTranscriber): Backend to use.
+            endpointer (VADEndpointer): Endpointer that is (or is about to be) capturing.
+            poll_interval (float): Seconds between incremental feeds.
+            on_partial (Optional[Callable[[str], None]]): Called when the partial hypothesis changes.
+        """
+        self.transcriber = transcriber
+        self.endpointer = endpointer
+        self.poll_interval = poll_interval
+        self.on_partial = on_partial
+        self.utterance: Optional[Utterance] = None
+        self._result: Tuple[str, List[Dict[str, Any]]] = ("", [])
+        self._error: Optional[BaseException] = None
+        self._thread = threading.Thread(target=self._run, name="UtteranceTranscription", daemon=True)
+        self._thread.start()
+
+    def result(self, timeout: Optional[float] = None) -> Tuple[str, List[Dict[str, Any]]]:
+        """
+        Wait for the utterance to end and be transcribed.
+
+        Returns:
+            Tuple[str, List[Dict[str, Any]]]: The transcript and per-word details.
+
+        Raises:
+            TimeoutError: If the transcript is not ready within the timeout.
+            Exception: Whatever the transcriber raised.
+        """
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            raise TimeoutError("Transcription did not finish in time.")
+        if self._error is not None:
+            raise self._error
+        return self._result
+
+    def _feed(self, cursor: Optional[int], end: int) -> Optional[int]:
+        start = self.endpointer.utterance_start
+        if start is None:
+            return cursor
+        cursor = start if cursor is None else cursor
+        if end > cursor:
+            self.transcriber.accept(self.endpointer.buffer.read(cursor, end))
+            if self.on_partial:
+                self.on_partial(self.transcriber.partial())
+        return end
+
+    def _run(self) -> None:
+        try:
+            cursor = None
+            if self.transcriber.STREAMING:
+                while self.endpointer.wait(self.poll_interval) is None:
+                    cursor = self._feed(cursor, self.endpointer.buffer.total_written)
+
+            self.utterance = self.endpointer.wait()
+            if not self.utterance.has_speech:
+                if cursor is not None:
+                    self.transcriber.finish(self.utterance.pcm)  # discard what was fed
+                return
+            if self.transcriber.STREAMING:
+                # Feed the tail up to where the utterance was closed.
+                self._feed(cursor, self.endpointer.utterance_start + len(self.utterance.pcm))
+            self._result = self.transcriber.finish(self.utterance.pcm)
+        except BaseException as e:
+            logger.error(f"Transcription failed: {e}")
+            self._error = e
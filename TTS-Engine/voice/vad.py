@@ -0,0 +1,392 @@
+import threading
+from typing import Optional
+
+import numpy as np
+
+from core.logger import get_logger
+from utils.ring_buffer import PCMRingBuffer
+
+logger = get_logger(__name__)
+
+
+class Utterance:
+    """
+    A captured utterance handed from the endpointer to the transcriber.
+
+    Attributes:
+        pcm (np.ndarray): Mono int16 samples, including a short pre-roll before speech onset.
+        sample_rate (int): Sample rate of `pcm`.
+        reason (str): Why the utterance was closed: "end_of_speech", "max_duration"
+                      or "no_speech".
+        speech_ms (float): Milliseconds of frames classified as speech.
+        endpoint_latency_ms (float): Time from the last speech frame to the endpoint decision.
+    """
+
+    END_OF_SPEECH = "end_of_speech"
+    MAX_DURATION = "max_duration"
+    NO_SPEECH = "no_speech"
+
+    def __init__(self, pcm: np.ndarray, sample_rate: int, reason: str, speech_ms: float, endpoint_latency_ms: float):
+        self.pcm = pcm
+        self.sample_rate = sample_rate
+        self.reason = reason
+        self.speech_ms = speech_ms
+        self.endpoint_latency_ms = endpoint_latency_ms
+
+    @property
+    def duration(self) -> float:
+        """Length of the captured audio in seconds."""
+        return len(self.pcm) / float(self.sample_rate)
+
+    @property
+    def has_speech(self) -> bool:
+        """True unless the endpointer gave up without hearing speech."""
+        return self.reason != self.NO_SPEECH and len(self.pcm) > 0
+
+    def __repr__(self) -> str:
+        return (f"Utterance(reason={self.reason!r}, duration={self.duration:.2f}s, "
+                f"speech_ms={self.speech_ms:.0f}, endpoint_latency_ms={self.endpoint_latency_ms:.0f})")
+
+
+class VADEndpointer:
+    """
+    Streaming voice-activity detector that decides when an utterance has ended.
+
+    Audio is fed in arbitrarily sized blocks (e.g. from a sounddevice callback)
+    and re-framed into fixed frames. Each frame is classified from its energy
+    against an adaptive noise floor plus two spectral features: spectral
+    flatness (speech is harmonic, broadband noise is flat) and the share of
+    energy in the 250-4000 Hz speech band (rejects hum and rumble).
+
+    Speech starts once `min_speech_ms` of speech frames have been seen, allowing
+    gaps up to `hangover_ms`; it ends after `trailing_silence_ms` without speech
+    or when `max_duration_s` is reached. If nothing is heard for
+    `no_speech_timeout_s`, the utterance is closed empty.
+
+    Every frame is written to a preallocated int16 `PCMRingBuffer`, exposed as
+    `buffer`; once speech has started, `utterance_start` is the buffer position
+    where the utterance begins, so a streaming transcriber can consume the audio
+    while the user is still talking.
+    """
+
+    SPEECH_BAND_HZ = (250.0, 4000.0)
+
+    def __init__(self,
+                 sample_rate: int = 16000,
+                 frame_ms: int = 20,
+                 min_speech_ms: int = 200,
+                 hangover_ms: int = 200,
+                 trailing_silence_ms: int = 600,
+                 max_duration_s: float = 15.0,
+                 no_speech_timeout_s: float = 5.0,
+                 pre_roll_ms: int = 300,
+                 energy_margin_db: float = 10.0,
+                 min_energy_db: float = -50.0,
+                 max_flatness: float = 0.35,
+                 min_band_ratio: float = 0.4,
+                 buffer: Optional[PCMRingBuffer] = None):
+        """
+        Initialize the endpointer.
+
+        Args:
+            sample_rate (int): Rate of the incoming audio.
+            frame_ms (int): Analysis frame length.
+            min_speech_ms (int): Speech needed before an utterance is considered started.
+            hangover_ms (int): Gaps this short do not interrupt speech onset.
+            trailing_silence_ms (int): Silence after speech that closes the utterance.
+            max_duration_s (float): Hard cap on the utterance length.
+            no_speech_timeout_s (float): Give up if no speech starts within this time.
+            pre_roll_ms (int): Audio kept from before speech onset so the first
+                               syllable is not clipped.
+            energy_margin_db (float): How far above the noise floor a frame must be.
+            min_energy_db (float): Absolute floor in dBFS below which nothing is speech.
+            max_flatness (float): Frames flatter than this are treated as noise.
+            min_band_ratio (float): Minimum share of energy in the speech band.
+            buffer (Optional[PCMRingBuffer]): Where captured audio is stored. Defaults to
+                one sized for max_duration_s plus onset and pre-roll.
+        """
+        self.sample_rate = sample_rate
+        self.frame_length = sample_rate * frame_ms // 1000
+        self.frame_ms = 1000.0 * self.frame_length / sample_rate
+        self.min_speech_ms = min_speech_ms
+        self.hangover_ms = hangover_ms
+        self.trailing_silence_ms = trailing_silence_ms
+        self.max_duration_s = max_duration_s
+        self.no_speech_timeout_s = no_speech_timeout_s
+        self.energy_margin_db = energy_margin_db
+        self.min_energy_db = min_energy_db
+        self.max_flatness = max_flatness
+        self.min_band_ratio = min_band_ratio
+
+        self._window = np.hanning(self.frame_length).astype(np.float32)
+        freqs = np.fft.rfftfreq(self.frame_length, 1.0 / sample_rate)
+        self._band = (freqs >= self.SPEECH_BAND_HZ[0]) & (freqs <= self.SPEECH_BAND_HZ[1])
+        self._pre_roll_frames = max(1, int(round(pre_roll_ms / self.frame_ms)))
+        # Head room beyond max_duration_s for the pre-roll and a hesitant onset.
+        self.buffer = buffer or PCMRingBuffer(int((max_duration_s + 3.0) * sample_rate))
+
+        self._done = threading.Event()
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Prepare for a new utterance. The noise floor estimate is kept."""
+        with self._lock:
+            self._pending = np.zeros(0, dtype=np.int16)
+            self.buffer.clear()
+            self._candidate_start: Optional[int] = None
+            self._utterance_start: Optional[int] = None
+            self._started = False
+            self._frames_seen = 0
+            self._speech_ms = 0.0
+            self._onset_speech_ms = 0.0
+            self._silence_ms = 0.0
+            self._utterance: Optional[Utterance] = None
+            if not hasattr(self, "_noise_floor_db"):
+                self._noise_floor_db: Optional[float] = None
+            self._done.clear()
+
+    @property
+    def done(self) -> bool:
+        """True once the current utterance has been closed."""
+        return self._done.is_set()
+
+    @property
+    def utterance_start(self) -> Optional[int]:
+        """Buffer position where the utterance (with pre-roll) begins, once speech has started."""
+        return self._utterance_start
+
+    @property
+    def in_speech(self) -> bool:
+        """True after speech onset and before the utterance is closed."""
+        return self._started and not self._done.is_set()
+
+    def process(self, block: np.ndarray) -> Optional[Utterance]:
+        """
+        Feed captured audio.
+
+        Args:
+            block (np.ndarray): Mono samples, int16 or float32 in [-1, 1], of any length.
+
+        Returns:
+            Optional[Utterance]: The utterance if this block closed it, else None.
+        """
+        if self._done.is_set():
+            return None
+        block = np.asarray(block).reshape(-1)
+        if block.dtype != np.int16:
+            block = (np.clip(block, -1.0, 1.0) * 32767).astype(np.int16)
+
+        with self._lock:
+            pending = np.concatenate((self._pending, block)) if len(self._pending) else block
+            offset = 0
+            while offset + self.frame_length <= len(pending):
+                self._process_frame(pending[offset:offset + self.frame_length].copy())
+                offset += self.frame_length
+                if self._utterance is not None:
+                    break
+            self._pending = pending[offset:].copy()
+            utterance = self._utterance
+
+        if utterance is not None:
+            self._done.set()
+        return utterance
+
+    def wait(self, timeout: Optional[float] = None) -> Optional[Utterance]:
+        """
+        Block until the current utterance is closed.
+
+        Args:
+            timeout (Optional[float]): Seconds to wait; None waits indefinitely.
+
+        Returns:
+            Optional[Utterance]: The utterance, or None on timeout.
+        """
+        if not self._done.wait(timeout):
+            return None
+        return self._utterance
+
+    def is_speech_frame(self, frame: np.ndarray) -> bool:
+        """
+        Classify one frame of float32 samples and update the noise floor.
+
+        Args:
+            frame (np.ndarray): `frame_length` samples in [-1, 1].
+
+        Returns:
+            bool: True if the frame looks like speech.
+        """
+        energy_db = 10.0 * np.log10(float(np.mean(frame * frame)) + 1e-10)
+        if self._noise_floor_db is None:
+            self._noise_floor_db = energy_db
+
+        threshold_db = max(self._noise_floor_db + self.energy_margin_db, self.min_energy_db)
+        is_speech = False
+        if energy_db > threshold_db:
+            power = np.abs(np.fft.rfft(frame * self._window)) ** 2 + 1e-12
+            flatness = float(np.exp(np.mean(np.log(power))) / np.mean(power))
+            band_ratio = float(power[self._band].sum() / power.sum())
+            is_speech = flatness <= self.max_flatness and band_ratio >= self.min_band_ratio
+
+        # Track the floor quickly downwards and slowly upwards, and only on non-speech
+        # frames, so a long utterance cannot raise its own threshold.
+        if energy_db < self._noise_floor_db:
+            self._noise_floor_db = energy_db
+        elif not is_speech:
+            self._noise_floor_db += 0.05 * (energy_db - self._noise_floor_db)
+        return is_speech
+
+    def _process_frame(self, frame: np.ndarray) -> None:
+        self._frames_seen += 1
+        position = self.buffer.total_written
+        self.buffer.write(frame)
+        is_speech = self.is_speech_frame(frame.astype(np.float32) / 32768.0)
+
+        if not self._started:
+            if is_speech:
+                if self._candidate_start is None:
+                    self._candidate_start = position
+                self._onset_speech_ms += self.frame_ms
+                self._silence_ms = 0.0
+            else:
+                self._silence_ms += self.frame_ms
+                if self._silence_ms > self.hangover_ms:
+                    # The candidate onset was a blip.
+                    self._onset_speech_ms = 0.0
+                    self._candidate_start = None
+
+            if self._onset_speech_ms >= self.min_speech_ms:
+                self._started = True
+                self._speech_ms = self._onset_speech_ms
+                pre_roll = self._pre_roll_frames * self.frame_length
+                self._utterance_start = max(self.buffer.oldest, self._candidate_start - pre_roll)
+                logger.debug(f"Speech onset after {self._frames_seen * self.frame_ms:.0f} ms")
+            elif self._frames_seen * self.frame_ms >= self.no_speech_timeout_s * 1000.0:
+                self._close(Utterance.NO_SPEECH, keep_audio=False)
+            return
+
+        if is_speech:
+            self._speech_ms += self.frame_ms
+            self._silence_ms = 0.0
+        else:
+            self._silence_ms += self.frame_ms
+
+        captured = self.buffer.total_written - self._utterance_start
+        if self._silence_ms >= self.trailing_silence_ms:
+            self._close(Utterance.END_OF_SPEECH)
+        elif captured >= self.max_duration_s * self.sample_rate:
+            self._close(Utterance.MAX_DURATION)
+
+    def _close(self, reason: str, keep_audio: bool = True) -> None:
+        if keep_audio and self._utterance_start is not None:
+            pcm = self.buffer.read(self._utterance_start)
+        else:
+            pcm = np.zeros(0, dtype=np.int16)
+        latency_ms = self._silence_ms if reason == Utterance.END_OF_SPEECH else 0.0
+        self._utterance = Utterance(pcm, self.sample_rate, reason, self._speech_ms, latency_ms)
+        logger.debug(f"Endpoint: {self._utterance}")
+
+
+class SpeechGate:
+    """
+    Decides which stretches of an endless microphone stream carry speech.
+
+    Unlike `VADEndpointer`, which closes one utterance and stops, the gate
+    runs for a whole session: it opens once `min_speech_ms` of speech frames
+    have been seen and closes after `hangover_ms` without speech, over and
+    over. Frames are classified with the endpointer's detector.
+
+    The gate counts absolute sample positions from `reset`, so a caller
+    reading from a `PCMRingBuffer` can use the same positions: when the gate
+    opens, `open_from` is where forwarding should start, `pre_roll_ms` before
+    the first speech frame so the onset is not clipped.
+    """
+
+    OPENED = "opened"
+    CLOSED = "closed"
+
+    def __init__(self,
+                 sample_rate: int = 16000,
+                 frame_ms: int = 20,
+                 min_speech_ms: int = 60,
+                 hangover_ms: int = 500,
+                 pre_roll_ms: int = 300,
+                 **detector_options):
+        """
+        Args:
+            sample_rate (int): Rate of the incoming audio.
+            frame_ms (int): Analysis frame length.
+            min_speech_ms (int): Speech needed before the gate opens.
+            hangover_ms (int): Silence after speech that closes the gate.
+            pre_roll_ms (int): Audio before the first speech frame included when the gate opens.
+            **detector_options: Thresholds passed on to `VADEndpointer`
+                                (energy_margin_db, min_energy_db, max_flatness, min_band_ratio).
+        """
+        # Only the endpointer's frame classifier is used, so its audio buffer is kept tiny.
+        self._detector = VADEndpointer(sample_rate, frame_ms, buffer=PCMRingBuffer(1), **detector_options)
+        self.sample_rate = sample_rate
+        self.frame_length = self._detector.frame_length
+        self.frame_ms = self._detector.frame_ms
+        self.min_speech_ms = min_speech_ms
+        self.hangover_ms = hangover_ms
+        self.pre_roll = sample_rate * pre_roll_ms // 1000
+        self.opened = 0
+        self.speech_frames = 0
+        self.reset()
+
+    def reset(self, position: int = 0) -> None:
+        """
+        Close the gate and restart counting at `position`. The noise floor estimate is kept.
+
+        Args:
+            position (int): Absolute position of the next frame, e.g. a ring buffer's `total_written`.
+        """
+        self.position = position
+        self.is_open = False
+        self.open_from = position
+        self._candidate_start: Optional[int] = None
+        self._onset_ms = 0.0
+        self._silence_ms = 0.0
+
+    def process(self, frame: np.ndarray) -> Optional[str]:
+        """
+        Classify the next frame and update the gate.
+
+        Args:
+            frame (np.ndarray): `frame_length` int16 samples.
+
+        Returns:
+            Optional[str]: `OPENED` or `CLOSED` if this frame changed the gate, else None.
+        """
+        start = self.position
+        self.position += len(frame)
+        is_speech = self._detector.is_speech_frame(frame.astype(np.float32) / 32768.0)
+        if is_speech:
+            self.speech_frames += 1
+            self._silence_ms = 0.0
+        else:
+            self._silence_ms += self.frame_ms
+
+        if self.is_open:
+            if self._silence_ms >= self.hangover_ms:
+                self.is_open = False
+                self._candidate_start = None
+                self._onset_ms = 0.0
+                return self.CLOSED
+            return None
+
+        if is_speech:
+            if self._candidate_start is None:
+                self._candidate_start = start
+            self._onset_ms += self.frame_ms
+        elif self._silence_ms > self.min_speech_ms:
+            # The candidate onset was a blip.
+            self._candidate_start = None
+            self._onset_ms = 0.0
+
+        if self._onset_ms >= self.min_speech_ms:
+            self.is_open = True
+            self.opened += 1
+            self.open_from = max(0, self._candidate_start - self.pre_roll)
+            return self.OPENED
+        return None
@@ -0,0 +1,302 @@
+import json
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+
+from core.logger import get_logger
+from core.model_registry import model_registry
+from utils.audio_codec import StreamResampler, float_to_pcm16
+from voice.text_to_speech.audio import AudioData
+
+logger = get_logger(__name__)
+
+
+def get_vosk_model(model_path: str):
+    """
+    Get the shared Vosk model for a model directory, loading it on first use.
+
+    Uses the same registry key as the Vosk provider and transcriber, so the
+    model is loaded once per process whoever asks first.
+    """
+    from vosk import Model
+
+    model_path = os.path.abspath(model_path)
+    return model_registry.get_or_create(f"vosk:{model_path}", lambda: Model(model_path))
+
+
+class RecognizerPool:
+    """
+    A fixed number of KaldiRecognizers sharing one Vosk model.
+
+    The model (the large part) is loaded once; each recognizer only holds its
+    own decoder state. Streams check a recognizer out for their duration and
+    it is reset when it comes back, so memory stays flat however many callers
+    there are and at most `size` decodes run at once. Vosk releases the GIL
+    while decoding, so threads holding different recognizers run in parallel.
+    """
+
+    def __init__(self, model, size: int = 4, sample_rate: int = 16000, words: bool = True):
+        """
+        Args:
+            model: A `vosk.Model`, or the path of a model directory.
+            size (int): Maximum number of recognizers; they are created on demand.
+            sample_rate (int): Rate of the audio the recognizers are fed.
+            words (bool): Include per-word timings and confidences in results (and in
+                          partial results, where the Vosk build supports it).
+        """
+        if size <= 0:
+            raise ValueError("size must be positive.")
+        self.model = get_vosk_model(model) if isinstance(model, str) else model
+        self.size = size
+        self.sample_rate = sample_rate
+        self.words = words
+        self._idle: "queue.LifoQueue" = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+
+    @property
+    def created(self) -> int:
+        """Number of recognizers built so far."""
+        return self._created
+
+    @property
+    def available(self) -> int:
+        """Recognizers that could be checked out right now without waiting."""
+        with self._lock:
+            return self._idle.qsize() + self.size - self._created
+
+    def acquire(self, timeout: Optional[float] = None):
+        """
+        Check out a recognizer, building one if the pool is not full yet.
+
+        Args:
+            timeout (Optional[float]): Seconds to wait for one to be returned.
+
+        Returns:
+            KaldiRecognizer: A reset recognizer. Hand it back with `release`.
+
+        Raises:
+            TimeoutError: If none became free in time.
+        """
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            build = self._created < self.size
+            if build:
+                self._created += 1
+        if build:
+            return self._create_recognizer()
+        try:
+            return self._idle.get(timeout=timeout)
+        except queue.Empty:
+            raise TimeoutError(f"No recognizer free after {timeout} s (pool size {self.size}).")
+
+    def release(self, recognizer) -> None:
+        """Reset a recognizer and return it to the pool."""
+        recognizer.Reset()
+        self._idle.put(recognizer)
+
+    @contextmanager
+    def recognizer(self, timeout: Optional[float] = None):
+        """Check out a recognizer for the duration of a `with` block."""
+        recognizer = self.acquire(timeout)
+        try:
+            yield recognizer
+        finally:
+            self.release(recognizer)
+
+    def _create_recognizer(self):
+        from vosk import KaldiRecognizer
+
+        recognizer = KaldiRecognizer(self.model, self.sample_rate)
+        if self.words:
+            recognizer.SetWords(True)
+            if hasattr(recognizer, "SetPartialWords"):
+                recognizer.SetPartialWords(True)
+        return recognizer
+
+
+_pools: Dict[str, RecognizerPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_recognizer_pool(model_path: str, size: int = 4, sample_rate: int = 16000) -> RecognizerPool:
+    """
+    Get the process-wide recognizer pool for a model directory, creating it on first use.
+
+    The size only applies when the pool is created.
+    """
+    key = f"{os.path.abspath(model_path)}@{sample_rate}"
+    with _pools_lock:
+        if key not in _pools:
+            _pools[key] = RecognizerPool(model_path, size, sample_rate)
+        return _pools[key]
+
+
+def iter_pcm16(path: str, sample_rate: int = 16000, block_seconds: float = 1.0) -> Iterator[np.ndarray]:
+    """
+    Read an audio file (WAV, MP3, ...) as mono int16 PCM at `sample_rate`, block by block.
+
+    Files are decoded and resampled a block at a time, so memory does not grow
+    with the length of the recording. Formats libsndfile cannot stream (MP3
+    with libsndfile older than 1.1) are decoded whole through `AudioData`.
+
+    Args:
+        path (str): Audio file.
+        sample_rate (int): Rate to resample to.
+        block_seconds (float): Audio decoded per block, at the file's rate.
+
+    Yields:
+        np.ndarray: int16 samples.
+    """
+    try:
+        import soundfile as sf
+        audio = sf.SoundFile(path)
+    except Exception as e:
+        logger.debug(f"Cannot stream {path} ({e}); decoding it whole.")
+        audio = None
+        pcm, file_rate = AudioData.from_file(path).decode()
+        blocks: Iterable[np.ndarray] = [pcm]
+    else:
+        file_rate = audio.samplerate
+        blocks = audio.blocks(blocksize=max(1, int(file_rate * block_seconds)), dtype="float32", always_2d=True)
+
+    resampler = StreamResampler(file_rate, sample_rate)
+    try:
+        for block in blocks:
+            if block.ndim > 1:
+                block = block.mean(axis=1)
+            yield float_to_pcm16(resampler.process(block))
+        yield float_to_pcm16(resampler.flush())
+    finally:
+        if audio is not None:
+            audio.close()
+
+
+def decode_chunks(recognizer, chunks: Iterable[np.ndarray], chunk_samples: int = 8000) -> Dict[str, Any]:
+    """
+    Transcribe a complete stream of audio with a checked-out recognizer.
+
+    Args:
+        recognizer (KaldiRecognizer): A recognizer from a `RecognizerPool`.
+        chunks (Iterable[np.ndarray]): Mono int16 samples at the recognizer's rate.
+        chunk_samples (int): Largest piece fed per AcceptWaveform call.
+
+    Returns:
+        Dict[str, Any]: `text`, `words` (word, start, end, conf) and `samples` fed.
+    """
+    segments: List[Dict[str, Any]] = []
+    samples = 0
+    for chunk in chunks:
+        samples += len(chunk)
+        data = np.ascontiguousarray(chunk, dtype="<i2").tobytes()
+        for offset in range(0, len(data), 2 * chunk_samples):
+            if recognizer.AcceptWaveform(data[offset:offset + 2 * chunk_samples]):
+                segments.append(json.loads(recognizer.Result()))
+    segments.append(json.loads(recognizer.FinalResult()))
+    return {
+        "text": " ".join(segment["text"] for segment in segments if segment.get("text")),
+        "words": [word for segment in segments for word in segment.get("result", [])],
+        "samples": samples,
+    }
+
+
+def transcribe_file(pool: RecognizerPool, path: str) -> Dict[str, Any]:
+    """
+    Stream one audio file through a recognizer from `pool`.
+
+    Returns:
+        Dict[str, Any]: `path`, `text`, `words`, `audio_seconds`, `decode_seconds`,
+                        `rtf` (decode time over audio time), `worker`, and `error`
+                        if the file could not be transcribed.
+    """
+    worker = f"{os.getpid()}:{threading.current_thread().name}"
+    start = time.perf_counter()
+    try:
+        with pool.recognizer() as recognizer:
+            result = decode_chunks(recognizer, iter_pcm16(path, pool.sample_rate))
+    except Exception as e:
+        logger.error(f"Failed to transcribe {path}: {e}")
+        return {"path": path, "error": str(e), "worker": worker}
+    elapsed = time.perf_counter() - start
+    audio_seconds = result.pop("samples") / float(pool.sample_rate)
+    return {"path": path, **result, "audio_seconds": audio_seconds, "decode_seconds": elapsed,
+            "rtf": elapsed / audio_seconds if audio_seconds else None, "worker": worker}
+
+
+# Per-process state of the process-pool workers.
+_worker_pool: Optional[RecognizerPool] = None
+
+
+def _init_process_worker(model_path: str, sample_rate: int) -> None:
+    global _worker_pool
+    _worker_pool = RecognizerPool(model_path, size=1, sample_rate=sample_rate)
+
+
+def _transcribe_in_process(path: str) -> Dict[str, Any]:
+    return transcribe_file(_worker_pool, path)
+
+
+class BatchTranscriber:
+    """
+    Transcribes many audio files in parallel.
+
+    Thread mode shares one loaded model and a `RecognizerPool` of `workers`
+    recognizers, so memory hardly grows with the worker count. Process mode
+    loads the model once per worker process; it costs a model per worker but
+    also parallelizes the file decoding and resampling done in Python.
+    """
+
+    def __init__(self, model_path: str, workers: int = os.cpu_count() or 1, mode: str = "thread",
+                 sample_rate: int = 16000):
+        """
+        Args:
+            model_path (str): Vosk model directory.
+            workers (int): Files transcribed at the same time.
+            mode (str): "thread" or "process".
+            sample_rate (int): Rate audio is resampled to before decoding.
+        """
+        if mode not in ("thread", "process"):
+            raise ValueError(f"Invalid mode '{mode}'. Use 'thread' or 'process'.")
+        self.model_path = model_path
+        self.workers = workers
+        self.mode = mode
+        self.sample_rate = sample_rate
+
+    def _executor(self) -> Executor:
+        if self.mode == "process":
+            return ProcessPoolExecutor(max_workers=self.workers, initializer=_init_process_worker,
+                                       initargs=(self.model_path, self.sample_rate))
+        return ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="VoskDecode")
+
+    def transcribe(self, paths: Iterable[str]) -> Iterator[Dict[str, Any]]:
+        """
+        Transcribe files, yielding each result as soon as it is ready (not in input order).
+
+        Args:
+            paths (Iterable[str]): Audio files.
+
+        Yields:
+            Dict[str, Any]: One `transcribe_file` result per path.
+        """
+        with self._executor() as executor:
+            if self.mode == "process":
+                futures = [executor.submit(_transcribe_in_process, path) for path in paths]
+            else:
+                pool = RecognizerPool(self.model_path, size=self.workers, sample_rate=self.sample_rate)
+                futures = [executor.submit(transcribe_file, pool, path) for path in paths]
+            try:
+                for future in as_completed(futures):
+                    yield future.result()
+            finally:
+                # Stopped early (Ctrl-C, or the caller broke off): do not decode the rest.
+                for future in futures:
+                    future.cancel()
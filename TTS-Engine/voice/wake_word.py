@@ -1,8 +1,9 @@
 import pvporcupine
-import pyaudio
 import struct
 from core.logger import get_logger
 from core.config import AppConfig
+from core.model_registry import model_registry
+from voice.audio_devices import get_audio_device_manager
 
 class WakeWordDetector:
     def __init__(self, access_key, keywords=None, keyword_paths=None, sensitivities=None):
@@ -18,13 +19,9 @@ class WakeWordDetector:
 
         self.porcupine = None
         self.audio_stream = None
-        try:
-            self.pa = pyaudio.PyAudio()
-            self.logger.info("PyAudio initialized for WakeWordDetector.")
-        except Exception as e:
-            self.logger.error(f"Failed to initialize PyAudio: {e}")
-            self.pa = None
-            raise
+        # The microphone is shared with the rest of the process; starting and stopping the
+        # detector adds and removes a tap on it instead of opening the device.
+        self.devices = get_audio_device_manager()
         self.logger.info("WakeWordDetector initialized.")
 
     def start_detector(self):
@@ -33,22 +30,19 @@ class WakeWordDetector:
             return
 
         try:
-            self.porcupine = pvporcupine.create(
-                access_key=self.access_key,
-                keywords=self.keywords,
-                keyword_paths=self.keyword_paths,
-                sensitivities=self.sensitivities
-            )
-            if not self.pa:
-                self.logger.error("PyAudio instance not available. Cannot start detector.")
-                raise RuntimeError("PyAudio not initialized. Cannot start Porcupine.")
-            self.audio_stream = self.pa.open(
-                rate=self.porcupine.sample_rate,
-                channels=1,
-                format=pyaudio.paInt16,
-                input=True,
-                frames_per_buffer=self.porcupine.frame_length
+            # Porcupine is shared through the model registry, so restarting the
+            # detector (or a second detector with the same settings) does not reload it.
+            self.porcupine = model_registry.get_or_create(
+                self._model_key(),
+                lambda: pvporcupine.create(
+                    access_key=self.access_key,
+                    keywords=self.keywords,
+                    keyword_paths=self.keyword_paths,
+                    sensitivities=self.sensitivities
+                ),
+                closer=lambda porcupine: porcupine.delete()
             )
+            self.audio_stream = self.devices.open_input(self.porcupine.sample_rate)
             self.logger.info("Porcupine wake word detector started successfully.")
             self.logger.info(f"Listening for: {self.keywords}")
         except pvporcupine.PorcupineError as e:
@@ -59,6 +53,9 @@ class WakeWordDetector:
             self.stop_detector()
             raise
 
+    def _model_key(self):
+        return f"porcupine:{self.keywords}:{self.keyword_paths}:{self.sensitivities}"
+
     def listen_for_wake_word(self):
         if self.porcupine is None or self.audio_stream is None:
             self.logger.error("Detector not started. Call start_detector() first.")
@@ -66,7 +63,7 @@ class WakeWordDetector:
 
         try:
             while True:
-                pcm = self.audio_stream.read(self.porcupine.frame_length, exception_on_overflow=False)
+                pcm = self.audio_stream.read(self.porcupine.frame_length)
                 pcm = struct.unpack_from("h" * self.porcupine.frame_length, pcm)
                 result = self.porcupine.process(pcm)
 
@@ -80,51 +77,27 @@ class WakeWordDetector:
     def stop_detector(self):
         if self.audio_stream is not None:
             try:
-                if self.audio_stream.is_active():
-                    self.audio_stream.stop_stream()
                 self.audio_stream.close()
             except Exception as e:
                 self.logger.error(f"Error closing audio stream: {e}")
             finally:
                 self.audio_stream = None
 
-        if self.porcupine is not None:
-            try:
-                self.porcupine.delete()
-            except Exception as e:
-                self.logger.error(f"Error deleting Porcupine instance: {e}")
-            finally:
-                self.porcupine = None
+        # The Porcupine instance belongs to the model registry; only drop our reference.
+        self.porcupine = None
         self.logger.info("Wake word detector stopped and resources released.")
 
     def __del__(self):
         self.logger.debug("WakeWordDetector being deleted, ensuring all resources are released.")
         if self.audio_stream is not None:
             try:
-                if self.audio_stream.is_active():
-                    self.audio_stream.stop_stream()
                 self.audio_stream.close()
             except Exception as e:
                 self.logger.error(f"Error closing audio stream during __del__: {e}")
             finally:
                 self.audio_stream = None
 
-        if self.porcupine is not None:
-            try:
-                self.porcupine.delete()
-            except Exception as e:
-                self.logger.error(f"Error deleting Porcupine instance during __del__: {e}")
-            finally:
-                self.porcupine = None
-        
-        if self.pa is not None:
-            try:
-                self.pa.terminate()
-                self.logger.info("PyAudio instance terminated in WakeWordDetector.__del__.")
-            except Exception as e:
-                self.logger.error(f"Error terminating PyAudio during __del__: {e}")
-            finally:
-                self.pa = None
+        self.porcupine = None
         
         self.logger.info("Wake word detector fully stopped and resources released from __del__.")
 
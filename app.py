@@ -4,8 +4,6 @@ import pvleopard
 import pvporcupine  # <-- ADD: Import Porcupine
 import struct      # <-- ADD: Needed for audio processing
 import numpy as np
-import sounddevice as sd
-import soundfile as sf
 from openai import OpenAI
 import importlib
 
@@ -17,11 +15,22 @@ WAKE_WORD = "jarvis" # Options: computer, jarvis, hey siri, etc.
 # --- END ADD ---
 SAMPLE_RATE = 16000
 CHANNELS = 1
+STT_BACKEND = "leopard" # Options: leopard, vosk (vosk transcribes while you are still talking)
 
 # --- PATH SETUP ---
 engine_path = os.path.join(os.getcwd(), 'TTS-Engine')
 sys.path.append(engine_path)
 
+from voice.text_to_speech.streaming import StreamingSpeechPipeline, LatencyTrace
+from voice.text_to_speech.cache import CachedTTSProvider
+from voice.text_to_speech.playback import get_playback_engine
+from voice.audio_devices import get_audio_device_manager
+from voice.vad import VADEndpointer
+from voice.transcription import LeopardTranscriber, VoskTranscriber, UtteranceTranscription
+from core.model_registry import model_registry
+
+VOSK_MODEL_PATH = os.path.join(engine_path, "voice", "voices", "assets", "models", "vosk", "vosk-model-small-en-us-0.15")
+
 PROVIDER_CLASS_MAP = {
     "edge_tts": "EdgeTTSProvider",
     "speechify": "SpeechifyTTSProvider",
@@ -30,92 +39,138 @@ PROVIDER_CLASS_MAP = {
 }
 
 # --- MODEL LOADING ---
-print("🔥 Loading AI models...")
-try:
-    leopard = pvleopard.create(access_key=PICOVOICE_ACCESS_KEY)
-    # --- ADD: Load Porcupine Wake Word Engine ---
-    porcupine = pvporcupine.create(
-        access_key=PICOVOICE_ACCESS_KEY,
-        keywords=[WAKE_WORD]
-    )
-    # --- END ADD ---
-    print("✅ Picovoice Leopard & Porcupine loaded!")
-except Exception as e:
-    print(f"💀 Error loading Picovoice: {e}")
-    sys.exit(1)
+# Every heavy model and client is built once through the registry. With
+# PREWARM_MODELS they are all loaded in parallel at startup; otherwise each one
+# loads the first time it is needed.
+PREWARM_MODELS = True
+OPENAI_ENDPOINT = "https://models.github.ai/inference"
+OPENAI_MODEL_NAME = "openai/gpt-5-nano"
+
+
+def build_tts_provider():
+    provider_module = importlib.import_module(f"voice.text_to_speech.providers.{TTS_PROVIDER_TO_USE}")
+    ProviderClass = getattr(provider_module, PROVIDER_CLASS_MAP[TTS_PROVIDER_TO_USE])
+    return CachedTTSProvider(ProviderClass())
+
+
+def build_transcriber():
+    if STT_BACKEND == "vosk":
+        return VoskTranscriber(model_registry.get("vosk_model"), sample_rate=SAMPLE_RATE)
+    return LeopardTranscriber(model_registry.get("leopard"))
+
+
+def build_openai_client():
+    token = os.environ.get("GITHUB_TOKEN") or os.environ.get("API_TOKEN")
+    return OpenAI(base_url=OPENAI_ENDPOINT, api_key=token)
+
+
+model_registry.register("porcupine", lambda: pvporcupine.create(access_key=PICOVOICE_ACCESS_KEY, keywords=[WAKE_WORD]),
+                        closer=lambda porcupine: porcupine.delete())
+if STT_BACKEND == "vosk":
+    from vosk import Model as VoskModel
+    model_registry.register("vosk_model", lambda: VoskModel(VOSK_MODEL_PATH))
+else:
+    model_registry.register("leopard", lambda: pvleopard.create(access_key=PICOVOICE_ACCESS_KEY),
+                            closer=lambda leopard: leopard.delete())
+model_registry.register("transcriber", build_transcriber)
+model_registry.register("tts_provider", build_tts_provider)
+model_registry.register("openai_client", build_openai_client)
+
+if PREWARM_MODELS:
+    print("🔥 Loading AI models...")
+    try:
+        prewarm = ["porcupine", "transcriber", "tts_provider"]
+        if os.environ.get("GITHUB_TOKEN") or os.environ.get("API_TOKEN"):
+            prewarm.append("openai_client")
+        model_registry.prewarm(prewarm)
+        print(f"✅ Models loaded: {model_registry.report()}")
+    except Exception as e:
+        print(f"💀 Error loading models: {e}")
+        sys.exit(1)
+
+# One output stream for the whole session; every reply is queued on it.
+playback = get_playback_engine()
+playback.start()
+
+
+def stream_reply_text(response):
+    """Yield the text deltas of a streamed chat completion, echoing them as they arrive."""
+    for chunk in response:
+        if not chunk.choices:
+            continue
+        delta = chunk.choices[0].delta.content
+        if delta:
+            print(delta, end="", flush=True)
+            yield delta
+    print()
 
 
 def main():
     # --- CHANGE: Main logic is now a continuous listen/record/respond loop ---
     
     # --- WAKE WORD LISTENING LOOP ---
+    porcupine = model_registry.get("porcupine")
+    pipeline = StreamingSpeechPipeline(model_registry.get("tts_provider"), engine=playback)
+
+    # The endpointer's ring buffer is allocated once and reused for every command.
+    endpointer = VADEndpointer(sample_rate=SAMPLE_RATE)
+
     print(f"\n🚀 Aura Voice is listening for the wake word '{WAKE_WORD}'...")
     
-    audio_stream = sd.InputStream(
-        samplerate=porcupine.sample_rate,
-        channels=1,
-        dtype='int16',
-        blocksize=porcupine.frame_length
-    )
-    audio_stream.start()
+    # The microphone stays open for the whole session; wake word detection and the
+    # command recording are two taps on the same shared stream, so handing over
+    # between them never reopens the device.
+    devices = get_audio_device_manager()
+    wake_tap = devices.open_input(porcupine.sample_rate)
+    # The command tap starts one Porcupine frame back, so it also holds the audio
+    # captured since the frame the wake word was detected in.
+    handover_ms = 1000 * porcupine.frame_length // porcupine.sample_rate
 
     while True:
-        pcm = audio_stream.read(porcupine.frame_length)[0]
+        pcm = wake_tap.read_array(porcupine.frame_length)
         keyword_index = porcupine.process(pcm)
 
         if keyword_index >= 0:
             print(f"🎤 Wake word '{WAKE_WORD}' detected!")
-            audio_stream.stop() # Stop listening for wake word
 
             # --- RECORDING AFTER WAKE WORD ---
             print("🔴 Recording... Speak your command.")
-            recorded_frames = []
-
-            def audio_callback(indata, frames, time, status):
-                recorded_frames.append(indata.copy())
-
-            # Start a new stream for recording the actual command
-            record_stream = sd.InputStream(
-                samplerate=SAMPLE_RATE, 
-                channels=CHANNELS, 
-                dtype='float32', 
-                callback=audio_callback
-            )
-            
-            # This part is still a bit manual. A better version would have automatic silence detection.
-            # For now, we'll use a manual stop after a few seconds of recording.
-            with record_stream:
-                print("Listening for your command... (Press Enter to stop for now)")
-                input() # We'll replace this with silence detection later
+            endpointer.reset()
+            # Streaming backends start decoding from the ring buffer while you talk.
+            transcription = UtteranceTranscription(model_registry.get("transcriber"), endpointer)
 
-            print("✅ Recording finished.")
+            # The VAD closes the utterance once the user stops talking.
+            record_tap = devices.open_input(SAMPLE_RATE, pre_roll_ms=handover_ms)
+            try:
+                print("Listening for your command...")
+                utterance = None
+                while utterance is None:
+                    utterance = endpointer.process(record_tap.read_array(endpointer.frame_length))
+            finally:
+                record_tap.close()
+
+            print(f"✅ Recording finished ({utterance.reason}, {utterance.duration:.1f}s).")
             
-            if not recorded_frames:
+            if not utterance.has_speech:
                 print("No audio recorded.")
-                audio_stream.start() # Restart wake word listening
+                wake_tap.discard() # Listen for the wake word from now on
                 continue
 
             # --- PROCESSING AND RESPONDING (Same as before) ---
-            audio_data = np.concatenate(recorded_frames, axis=0)
-            audio_filepath = "temp_recording.wav"
-            audio_data_int16 = (audio_data * 32767).astype(np.int16)
-            sf.write(audio_filepath, audio_data_int16, SAMPLE_RATE)
-
+            # The captured int16 buffer goes straight to the recognizer; no WAV round trip.
             print("🤫 Transcribing audio...")
             try:
-                transcript, words = leopard.process_file(audio_filepath)
+                transcript, words = transcription.result()
                 user_text = transcript.strip()
                 print(f"👂 You said: {user_text}")
             except Exception as e:
-                print(f"💀 Picovoice Error: {e}")
-                os.remove(audio_filepath)
-                audio_stream.start()
+                print(f"💀 Transcription Error: {e}")
+                wake_tap.discard()
                 continue
             
             if not user_text:
                 print("No speech detected.")
-                os.remove(audio_filepath)
-                audio_stream.start()
+                wake_tap.discard()
                 continue
 
             print("🧠 Accessing the Brain...")
@@ -123,41 +178,32 @@ def main():
                 token = os.environ.get("GITHUB_TOKEN") or os.environ.get("API_TOKEN")
                 if not token:
                     print("💀 Error: GITHUB_TOKEN or API_TOKEN not found in environment variables.")
-                    audio_stream.start()
+                    wake_tap.discard()
                     continue
 
-                endpoint = "https://models.github.ai/inference"
-                model_name = "openai/gpt-5-nano"
-                client = OpenAI(base_url=endpoint, api_key=token)
+                client = model_registry.get("openai_client")
 
+                # Stream the reply and speak it sentence by sentence as it arrives.
+                trace = LatencyTrace()
                 response = client.chat.completions.create(
-                    messages=[{"role": "user", "content": user_text}], model=model_name
+                    messages=[{"role": "user", "content": user_text}], model=OPENAI_MODEL_NAME, stream=True
                 )
-                ai_response_text = response.choices[0].message.content
-                print(f"🤖 AI responded: {ai_response_text}")
-
-                print("🗣️ Accessing the Voice...")
-                try:
-                    provider_module = importlib.import_module(f"voice.text_to_speech.providers.{TTS_PROVIDER_TO_USE}")
-                    ProviderClass = getattr(provider_module, PROVIDER_CLASS_MAP[TTS_PROVIDER_TO_USE])
-                    active_provider = ProviderClass()
-                    audio_path = active_provider.generate_speech(ai_response_text)
-                    data, fs = sf.read(audio_path, dtype='float32')
-                    sd.play(data, fs)
-                    sd.wait()
-                except Exception as e:
-                    print(f"💀 Voice Error: {e}")
+                print("🤖 AI responded: ", end="", flush=True)
+                pipeline.speak_stream(stream_reply_text(response), trace)
+                print(f"⏱️ Latency: {trace.summary()}")
 
             except Exception as e:
                 print(f"💀 Brain Error: {e}")
 
-            os.remove(audio_filepath)
             print("\n-----------------------------------")
             print(f"👂 Listening for '{WAKE_WORD}' again...")
-            audio_stream.start() # Restart listening for the wake word
+            wake_tap.discard() # Skip what was said while answering
 
 if __name__ == "__main__":
     try:
         main()
     except KeyboardInterrupt:
-        print("\n\nExiting Aura Voice. Peace out! ✌️")
\ No newline at end of file
+        print("\n\nExiting Aura Voice. Peace out! ✌️")
+    finally:
+        playback.close()
+        model_registry.close()
\ No newline at end of file
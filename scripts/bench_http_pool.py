@@ -0,0 +1,117 @@
+"""
+Compare cold vs. warm request latency of PooledHTTPSession against a local stub server.
+
+The stub mimics a TTS endpoint (JSON in, base64 audio out). "Cold" opens a new
+session for every request, which is what the providers used to do with bare
+requests.post; "warm" reuses one pooled session.
+
+Usage:
+    python scripts/bench_http_pool.py --requests 200 --payload-kb 32
+    python scripts/bench_http_pool.py --tls-cert cert.pem --tls-key key.pem
+"""
+import argparse
+import base64
+import json
+import os
+import socket
+import ssl
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+engine_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'TTS-Engine')
+sys.path.append(engine_path)
+
+from utils.http_session import PooledHTTPSession
+
+
+def make_handler(payload: bytes, delay: float):
+    body = json.dumps({"data": base64.b64encode(payload).decode()}).encode()
+
+    class StubTTSHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive
+
+        def setup(self):
+            super().setup()
+            # Headers and body go out in separate writes; without this, Nagle's
+            # algorithm plus delayed ACKs add ~40 ms to every keep-alive response.
+            self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length", 0))
+            self.rfile.read(length)
+            if delay:
+                time.sleep(delay)
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return StubTTSHandler
+
+
+def start_server(args) -> str:
+    handler = make_handler(os.urandom(args.payload_kb * 1024), args.delay_ms / 1000.0)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    scheme = "http"
+    if args.tls_cert and args.tls_key:
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        context.load_cert_chain(args.tls_cert, args.tls_key)
+        server.socket = context.wrap_socket(server.socket, server_side=True)
+        scheme = "https"
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"{scheme}://127.0.0.1:{server.server_address[1]}/api/tts"
+
+
+def timed_post(session: PooledHTTPSession, url: str, verify) -> float:
+    start = time.perf_counter()
+    response = session.post(url, json={"text": "Hello there, how can I help?", "voice": "bench"}, verify=verify)
+    response.raise_for_status()
+    base64.b64decode(response.json()["data"])
+    return time.perf_counter() - start
+
+
+def summarize(label: str, samples) -> None:
+    samples = sorted(samples)
+    p95 = samples[int(len(samples) * 0.95) - 1]
+    print(f"{label:>5}: median {statistics.median(samples) * 1000:7.2f} ms   "
+          f"p95 {p95 * 1000:7.2f} ms   mean {statistics.mean(samples) * 1000:7.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=100, help="requests per mode")
+    parser.add_argument("--payload-kb", type=int, default=32, help="size of the fake audio payload")
+    parser.add_argument("--delay-ms", type=float, default=0.0, help="simulated server processing time")
+    parser.add_argument("--tls-cert", help="certificate to serve HTTPS with (measures TLS handshakes)")
+    parser.add_argument("--tls-key", help="private key for --tls-cert")
+    args = parser.parse_args()
+
+    url = start_server(args)
+    verify = False if url.startswith("https") else True
+
+    cold = []
+    for _ in range(args.requests):
+        session = PooledHTTPSession(max_retries=0)
+        cold.append(timed_post(session, url, verify))
+        session.close()
+
+    session = PooledHTTPSession(max_retries=0)
+    timed_post(session, url, verify)  # establish the connection
+    warm = [timed_post(session, url, verify) for _ in range(args.requests)]
+    session.close()
+
+    print(f"{args.requests} requests, {args.payload_kb} KiB payload, {url}")
+    summarize("cold", cold)
+    summarize("warm", warm)
+    print(f"warm/cold median ratio: {statistics.median(warm) / statistics.median(cold):.2f}")
+
+
+if __name__ == "__main__":
+    main()
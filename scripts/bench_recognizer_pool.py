@@ -0,0 +1,94 @@
+"""
+Measure batch transcription throughput and memory at different recognizer pool sizes.
+
+Every WAV in --dir is transcribed once per pool size. Thread mode shares one
+loaded Vosk model between all recognizers; process mode loads it once per
+worker. For each run the script reports audio seconds transcribed per wall
+second, the mean and worst real-time factor of each worker, and the resident
+memory of this process (process mode also lists the workers' memory, which is
+where its extra models live).
+
+Usage:
+    python scripts/bench_recognizer_pool.py --dir recordings/
+    python scripts/bench_recognizer_pool.py --dir recordings/ --sizes 1,2,4,8 --mode process
+"""
+import argparse
+import glob
+import os
+import statistics
+import sys
+import time
+from collections import defaultdict
+
+engine_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'TTS-Engine')
+sys.path.append(engine_path)
+
+from core.config import AppConfig
+from voice.vosk_pool import BatchTranscriber, get_vosk_model
+
+
+def rss_mb(pid: str = "self") -> float:
+    """Resident memory of a process in MB (Linux only; 0 elsewhere)."""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return 0.0
+
+
+def run(paths, model_path: str, size: int, mode: str) -> None:
+    transcriber = BatchTranscriber(model_path, workers=size, mode=mode)
+    per_worker = defaultdict(list)
+    worker_rss = {}
+    audio_seconds = 0.0
+    errors = 0
+
+    start = time.perf_counter()
+    for result in transcriber.transcribe(paths):
+        if "error" in result:
+            errors += 1
+            continue
+        audio_seconds += result["audio_seconds"]
+        per_worker[result["worker"]].append(result["rtf"])
+        pid = result["worker"].split(":", 1)[0]
+        worker_rss[pid] = max(worker_rss.get(pid, 0.0), rss_mb(pid))
+    elapsed = time.perf_counter() - start
+
+    print(f"\n{mode} pool of {size}: {len(paths) - errors} files, {audio_seconds:.1f}s of audio "
+          f"in {elapsed:.2f}s -> {audio_seconds / elapsed:.1f} audio s / wall s"
+          + (f", {errors} failed" if errors else ""))
+    for worker, rtfs in sorted(per_worker.items()):
+        print(f"  {worker:<28} {len(rtfs):4d} files  RTF mean {statistics.mean(rtfs):.3f}  worst {max(rtfs):.3f}")
+    print(f"  RSS: this process {rss_mb():.0f} MB", end="")
+    if mode == "process":
+        print(", workers " + ", ".join(f"{mb:.0f}" for mb in worker_rss.values()) + " MB")
+    else:
+        print()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dir", required=True, help="directory of WAV files to transcribe")
+    parser.add_argument("--model", default=AppConfig.VOSK_MODEL_PATH, help="Vosk model directory")
+    parser.add_argument("--sizes", default="1,2,4", help="comma-separated pool sizes to try")
+    parser.add_argument("--mode", choices=("thread", "process"), default="thread")
+    args = parser.parse_args()
+
+    paths = sorted(glob.glob(os.path.join(args.dir, "**", "*.wav"), recursive=True))
+    if not paths:
+        sys.exit(f"No WAV files under {args.dir}")
+
+    print(f"{len(paths)} files, {os.cpu_count()} CPUs, RSS before loading the model: {rss_mb():.0f} MB")
+    if args.mode == "thread":
+        get_vosk_model(args.model)
+        print(f"RSS with the model loaded: {rss_mb():.0f} MB")
+
+    for size in (int(s) for s in args.sizes.split(",")):
+        run(paths, args.model, size, args.mode)
+
+
+if __name__ == "__main__":
+    main()
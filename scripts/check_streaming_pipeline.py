@@ -0,0 +1,174 @@
+"""
+Check StreamingSpeechPipeline against a scripted LLM stream, a stub TTS provider and a fake audio device.
+
+The LLM stream yields a reply token by token with a short delay per token.
+The stub provider synthesizes each sentence as a short tone whose level
+encodes the sentence's position, and the playback engine plays into a fake
+output stream in real time. The script asserts that:
+
+- every sentence is synthesized and queued on the engine in reply order,
+- the latency trace records the first LLM token, the first synthesized
+  sentence and the first played sample, in that order,
+- `stop()` in the middle of a reply makes `speak_stream` return promptly
+  without consuming the rest of the text stream, and leaves audio that
+  something else queued on the same engine playing.
+
+It exits non-zero on the first failed check.
+
+Usage:
+    python scripts/check_streaming_pipeline.py
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+
+engine_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'TTS-Engine')
+sys.path.append(engine_path)
+
+import numpy as np
+
+from voice.text_to_speech.audio import AudioData
+from voice.text_to_speech.playback import PlaybackEngine
+from voice.text_to_speech.streaming import LatencyTrace, StreamingSpeechPipeline
+
+SAMPLE_RATE = 16000
+SENTENCES = [
+    "The first sentence is here.",
+    "Then a second one follows.",
+    "A third sentence ends the paragraph!",
+    "Is the fourth one a question?",
+    "And the last one has no final punctuation",
+]
+
+
+class FakeOutputStream:
+    """Pulls one block every block period from the engine callback, like a sounddevice stream."""
+
+    def __init__(self, samplerate, channels, blocksize, callback):
+        self.period = blocksize / samplerate
+        self.block = np.zeros((blocksize, channels), dtype=np.float32)
+        self.callback = callback
+        self._stop = threading.Event()
+
+    def start(self):
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def _run(self):
+        while not self._stop.wait(self.period):
+            self.callback(self.block, len(self.block), None, None)
+
+    def stop(self):
+        self._stop.set()
+
+    def close(self):
+        self._stop.set()
+
+
+class StubProvider:
+    """Synthesizes sentence n as `seconds` of a constant level (n + 1) / 100, and records the calls."""
+
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+        self.synthesized = []
+
+    def synthesize(self, text, voice=None):
+        index = len(self.synthesized)
+        self.synthesized.append(text)
+        return AudioData.from_pcm(np.full(int(self.seconds * SAMPLE_RATE), (index + 1) / 100, dtype=np.float32),
+                                  SAMPLE_RATE)
+
+
+class RecordingEngine(PlaybackEngine):
+    """A playback engine that remembers the level of every buffer it was given."""
+
+    def __init__(self):
+        super().__init__(samplerate=SAMPLE_RATE, output_stream_factory=FakeOutputStream)
+        self.queued_levels = []
+
+    def enqueue(self, pcm, samplerate, on_start=None, on_done=None):
+        self.queued_levels.append(round(float(pcm[0]) * 100) - 1)
+        return super().enqueue(pcm, samplerate, on_start=on_start, on_done=on_done)
+
+
+def token_stream(sentences, delay: float, consumed: list):
+    """Yield the reply word by word, like streamed LLM deltas."""
+    for sentence in sentences:
+        for word in sentence.split(" "):
+            time.sleep(delay)
+            consumed.append(word)
+            yield word + " "
+
+
+def check(condition: bool, message: str) -> None:
+    if not condition:
+        print(f"FAIL: {message}")
+        sys.exit(1)
+    print(f"ok:   {message}")
+
+
+def check_order_and_trace(args) -> None:
+    provider = StubProvider(seconds=0.2)
+    engine = RecordingEngine()
+    pipeline = StreamingSpeechPipeline(provider, engine=engine)
+    trace = pipeline.speak_stream(token_stream(SENTENCES, args.token_delay, []), LatencyTrace())
+
+    check(provider.synthesized == SENTENCES, "every sentence synthesized, in reply order")
+    check(engine.queued_levels == list(range(len(SENTENCES))), "sentences queued on the engine in reply order")
+    marks = [trace.get(name) for name in (LatencyTrace.LLM_FIRST_TOKEN, LatencyTrace.FIRST_SENTENCE_SYNTHESIZED,
+                                          LatencyTrace.FIRST_SAMPLE_PLAYED)]
+    check(all(mark is not None for mark in marks), f"all three latency marks recorded ({trace.summary()})")
+    check(marks == sorted(marks), "first token, first synthesized sentence and first sample in that order")
+    engine.close()
+
+
+def check_stop(args) -> None:
+    provider = StubProvider(seconds=0.5)
+    engine = RecordingEngine()
+    pipeline = StreamingSpeechPipeline(provider, engine=engine)
+    reply = SENTENCES * 20
+    total_words = sum(len(sentence.split(" ")) for sentence in reply)
+    consumed = []
+
+    stopped_at = []
+
+    def barge_in():
+        while trace.get(LatencyTrace.FIRST_SAMPLE_PLAYED) is None:
+            time.sleep(0.01)
+        stopped_at.append(time.perf_counter())
+        pipeline.stop()
+
+    trace = LatencyTrace()
+    threading.Thread(target=barge_in, daemon=True).start()
+    other = None
+
+    # Something else speaking through the same engine, queued behind the reply's first sentence.
+    def queue_other():
+        nonlocal other
+        while not engine.queued_levels:
+            time.sleep(0.005)
+        other = engine.enqueue(np.full(int(0.3 * SAMPLE_RATE), 0.5, dtype=np.float32), SAMPLE_RATE)
+
+    threading.Thread(target=queue_other, daemon=True).start()
+    pipeline.speak_stream(token_stream(reply, args.token_delay, consumed), trace)
+    returned = time.perf_counter() - stopped_at[0]
+
+    check(returned < 0.5, f"speak_stream returned {1000 * returned:.0f} ms after stop()")
+    check(len(consumed) < total_words, f"rest of the text stream left unconsumed ({len(consumed)} of {total_words} words)")
+    check(other is not None and other.wait(5), "audio queued by another user of the engine still played to the end")
+    engine.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--token-delay", type=float, default=0.01, help="seconds between streamed tokens")
+    args = parser.parse_args()
+
+    check_order_and_trace(args)
+    check_stop(args)
+    print("all checks passed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Check VADEndpointer on synthetic audio with known speech boundaries.
+
+Each case is fed through a fresh endpointer in 10 ms blocks, the way a
+sounddevice callback delivers it, and the script asserts how the
+utterance was closed:
+
+- silence, white noise, 60 Hz hum and a tone shorter than `min_speech_ms`
+  give no_speech;
+- a tone burst and speech-like audio (including speech with a short pause)
+  give end_of_speech, with the last speech frame within --tolerance-ms of
+  the real offset;
+- speech that never stops gives max_duration at `max_duration_s`.
+
+It exits non-zero on the first failed check.
+
+Usage:
+    python scripts/check_vad.py
+    python scripts/check_vad.py --tolerance-ms 60
+"""
+import argparse
+import os
+import sys
+import time
+
+engine_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'TTS-Engine')
+sys.path.append(engine_path)
+
+import numpy as np
+
+from synthetic_audio import synthetic_speech
+from voice.vad import Utterance, VADEndpointer
+
+RATE = 16000
+BLOCK = RATE // 100
+
+
+def build_cases(rng: np.random.Generator):
+    """Return (name, audio, expected reason, seconds where speech really ends or None)."""
+    def noise(seconds, level=0.002):
+        return rng.normal(0, level, int(RATE * seconds)).astype(np.float32)
+
+    def tone(seconds, freq=440.0):
+        return (0.3 * np.sin(2 * np.pi * freq * np.arange(int(RATE * seconds)) / RATE)).astype(np.float32)
+
+    def speech(seconds):
+        return synthetic_speech(RATE, seconds, rng)
+
+    return [
+        ("silence only", noise(8), Utterance.NO_SPEECH, None),
+        ("short tone burst (below min speech)", np.concatenate([noise(1), tone(0.1), noise(7)]),
+         Utterance.NO_SPEECH, None),
+        ("white noise burst", np.concatenate([noise(1), noise(1, level=0.1), noise(6)]), Utterance.NO_SPEECH, None),
+        ("60 Hz hum", np.concatenate([noise(1), tone(1, freq=60), noise(6)]), Utterance.NO_SPEECH, None),
+        ("tone burst", np.concatenate([noise(1), tone(0.8), noise(2)]), Utterance.END_OF_SPEECH, 1.8),
+        ("speech-like, then silence", np.concatenate([noise(1), speech(1.5), noise(2)]), Utterance.END_OF_SPEECH, 2.5),
+        ("speech with a pause", np.concatenate([noise(0.5), speech(0.8), noise(0.3), speech(0.8), noise(2)]),
+         Utterance.END_OF_SPEECH, 2.4),
+        ("endless speech", np.concatenate([noise(0.5), speech(20)]), Utterance.MAX_DURATION, None),
+    ]
+
+
+def run_case(audio: np.ndarray):
+    """Feed the audio until the endpointer closes the utterance; return it and the seconds fed."""
+    endpointer = VADEndpointer(sample_rate=RATE)
+    for offset in range(0, len(audio), BLOCK):
+        utterance = endpointer.process(audio[offset:offset + BLOCK])
+        if utterance:
+            return endpointer, utterance, (offset + BLOCK) / RATE
+    return endpointer, None, len(audio) / RATE
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tolerance-ms", type=float, default=100.0,
+                        help="allowed distance between the detected and the real end of speech")
+    args = parser.parse_args()
+
+    failures = 0
+    for name, audio, expected, speech_end in build_cases(np.random.default_rng(0)):
+        started = time.perf_counter()
+        endpointer, utterance, fed = run_case(audio)
+        elapsed_ms = 1000 * (time.perf_counter() - started)
+        problems = []
+        if utterance is None:
+            problems.append("utterance never closed")
+        elif utterance.reason != expected:
+            problems.append(f"reason {utterance.reason!r}, expected {expected!r}")
+        elif expected == Utterance.END_OF_SPEECH:
+            # The endpoint is decided `endpoint_latency_ms` after the last speech frame.
+            detected_end = fed - utterance.endpoint_latency_ms / 1000
+            if abs(detected_end - speech_end) * 1000 > args.tolerance_ms:
+                problems.append(f"speech ended at {detected_end:.2f}s, really at {speech_end:.2f}s")
+        elif expected == Utterance.MAX_DURATION:
+            if abs(utterance.duration - endpointer.max_duration_s) * 1000 > args.tolerance_ms:
+                problems.append(f"capped at {utterance.duration:.2f}s, expected {endpointer.max_duration_s:.2f}s")
+        status = "FAIL" if problems else "ok"
+        failures += bool(problems)
+        print(f"{status:<4} {name:<38} -> {utterance!r} after {fed:.2f}s of audio "
+              f"(processed in {elapsed_ms:.1f} ms){'; ' + '; '.join(problems) if problems else ''}")
+
+    if failures:
+        print(f"{failures} case(s) failed")
+        sys.exit(1)
+    print("all checks passed")
+
+
+if __name__ == "__main__":
+    main()
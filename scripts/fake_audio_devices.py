@@ -0,0 +1,191 @@
+"""
+Measure microphone handover through the shared audio device manager against a fake PortAudio.
+
+The fake `pyaudio` module takes --init-ms to initialize (PortAudio probing
+every host API and device) and --open-ms to open a stream, and its streams
+call back with 20 ms of audio in real time. The script hands the
+microphone from wake word detection to speech recognition and back
+--turns times, once the old way (each consumer with its own PyAudio
+instance, opened on start and terminated on stop) and once through
+`AudioDeviceManager` taps, and reports the handover times. It then
+unplugs the fake microphone and reports how long the manager took to
+notice and to have audio flowing again. Last it removes the microphone for
+good and checks that the reading tap ends with EOFError and that the
+watchdog stops re-enumerating the devices.
+
+Usage:
+    python scripts/fake_audio_devices.py
+    python scripts/fake_audio_devices.py --turns 20 --init-ms 300 --open-ms 80
+"""
+import argparse
+import os
+import statistics
+import sys
+import threading
+import time
+
+engine_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'TTS-Engine')
+sys.path.append(engine_path)
+
+from types import SimpleNamespace
+
+from voice.audio_devices import AudioDeviceManager
+
+FRAME_LENGTH = 512  # Porcupine's frame
+
+
+class FakeStream:
+    """A callback stream that delivers one period every period, until closed or unplugged."""
+
+    def __init__(self, backend, rate, frames_per_buffer, stream_callback, input):
+        self.backend = backend
+        self.rate = rate
+        self.frames = frames_per_buffer
+        self.callback = stream_callback
+        self.input = input
+        self._stop = threading.Event()
+        if stream_callback is not None:
+            threading.Thread(target=self._run, daemon=True).start()
+
+    def _run(self):
+        period = self.frames / self.rate
+        silence = bytes(2 * self.frames)
+        next_at = time.perf_counter()
+        while not self._stop.is_set() and not self.backend.unplugged:
+            next_at += period
+            if self._stop.wait(max(0.0, next_at - time.perf_counter())):
+                return
+            if self.input:
+                self.callback(silence, self.frames, None, 0)
+            else:
+                self.callback(None, self.frames, None, 0)
+
+    def read(self, frames, exception_on_overflow=True):
+        # Blocking mode, as the old per-consumer code used it.
+        time.sleep(frames / self.rate)
+        return bytes(2 * frames)
+
+    def is_active(self):
+        return not self._stop.is_set()
+
+    def stop_stream(self):
+        self._stop.set()
+
+    def close(self):
+        self._stop.set()
+
+
+class FakePyAudio:
+    """Takes `init_s` to create, as PortAudio does probing devices, and `open_s` per stream."""
+
+    def __init__(self, backend):
+        self.backend = backend
+        time.sleep(backend.init_s)
+        backend.unplugged = False  # initializing finds the device again
+
+    def open(self, format=None, channels=1, rate=16000, frames_per_buffer=1024, stream_callback=None,
+             input=False, output=False, **kwargs):
+        time.sleep(self.backend.open_s)
+        if input and self.backend.removed:
+            raise OSError("Invalid input device")
+        return FakeStream(self.backend, rate, frames_per_buffer, stream_callback, input=input)
+
+    def get_device_count(self):
+        return 1
+
+    def get_device_info_by_index(self, index):
+        return {"index": index, "name": "Fake microphone"}
+
+    def terminate(self):
+        pass
+
+
+def fake_backend(init_ms: float, open_ms: float) -> SimpleNamespace:
+    # Stands in for the `pyaudio` module.
+    backend = SimpleNamespace(paInt16=8, paContinue=0, paInputOverflow=2, init_s=init_ms / 1000,
+                              open_s=open_ms / 1000, unplugged=False, removed=False)
+    backend.PyAudio = lambda: FakePyAudio(backend)
+    return backend
+
+
+def per_consumer_handover(backend) -> float:
+    # What WakeWordDetector and MicrophoneCapture did: their own PyAudio, opened and terminated per use.
+    wake = backend.PyAudio()
+    stream = wake.open(rate=16000, frames_per_buffer=FRAME_LENGTH, input=True)
+    stream.read(FRAME_LENGTH)
+    started = time.perf_counter()
+    stream.close()
+    wake.terminate()
+    stt = backend.PyAudio()
+    stream = stt.open(rate=16000, frames_per_buffer=320, input=True)
+    stream.read(320)
+    elapsed = time.perf_counter() - started
+    stream.close()
+    stt.terminate()
+    return elapsed
+
+
+def shared_handover(manager: AudioDeviceManager, wake) -> float:
+    # What app.py does: the wake word tap stays open, and the command tap starts a frame back.
+    wake.discard()
+    wake.read(FRAME_LENGTH)
+    started = time.perf_counter()
+    stt = manager.open_input(16000, pre_roll_ms=1000 * FRAME_LENGTH // 16000)
+    elapsed = time.perf_counter() - started
+    stt.read(320)
+    stt.close()
+    return elapsed
+
+
+def report(name: str, times) -> None:
+    times = [1000 * t for t in times]
+    print(f"{name:<13} handover mean {statistics.mean(times):9.3f} ms, max {max(times):9.3f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--turns", type=int, default=10)
+    parser.add_argument("--init-ms", type=float, default=250.0, help="time to initialize PortAudio")
+    parser.add_argument("--open-ms", type=float, default=60.0, help="time to open a stream")
+    args = parser.parse_args()
+
+    backend = fake_backend(args.init_ms, args.open_ms)
+    report("per-consumer", [per_consumer_handover(backend) for _ in range(args.turns)])
+
+    manager = AudioDeviceManager(backend=backend, watch_interval_s=0.2, stall_s=0.2)
+    wake = manager.open_input(16000)
+    report("shared", [shared_handover(manager, wake) for _ in range(args.turns)])
+    wake.close()
+    print(f"manager stats: {manager.stats()}")
+
+    # Unplug the microphone while a consumer is reading; the watchdog re-enumerates and reopens.
+    tap = manager.open_input(16000)
+    tap.read(320)
+    backend.unplugged = True
+    unplugged = time.perf_counter()
+    while not manager.refreshes:
+        tap.read(320, timeout=10)
+    print(f"audio flowing again {1000 * (time.perf_counter() - unplugged):.0f} ms after the device was lost "
+          f"(stall detection {1000 * manager.stall_s:.0f} ms + re-init {args.init_ms:.0f} ms "
+          f"+ open {args.open_ms:.0f} ms); refreshes: {manager.stats()['refreshes']}")
+    tap.close()
+
+    # Remove the microphone for good: the reopen fails, so the reader gets EOFError and the refreshes stop.
+    tap = manager.open_input(16000)
+    backend.unplugged = backend.removed = True
+    try:
+        while True:
+            tap.read(320, timeout=10)
+    except EOFError as e:
+        print(f"reader ended: {e}")
+    refreshes = manager.refreshes
+    time.sleep(5 * manager.watch_interval_s)
+    if manager.refreshes != refreshes:
+        print(f"FAIL: watchdog kept refreshing ({manager.refreshes - refreshes} more)")
+        sys.exit(1)
+    print(f"no refreshes after giving up on the stream; stats: {manager.stats()}")
+    manager.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,292 @@
+"""
+Drive the Gemini Live send path against a fake live server.
+
+--scenario send: a microphone producer puts 64 ms PCM chunks in real time
+and a video producer puts JPEG-sized frames, the way AudioHandler and
+VideoHandler do. The fake session's `send` takes as long as the payload
+needs at --kbps, so the link saturates when video is heavy. The same
+traffic goes once through a plain FIFO queue (the old send path) and once
+through SendScheduler, and the script reports how long audio waited from
+put to sent, plus what happened to video.
+
+--scenario reconnect: a fake client whose connections take --connect-ms
+to open, send session resumption updates, and drop every --drop-every
+seconds (announcing it with GoAway first with --go-away). The microphone
+keeps producing through LiveConnection and SendScheduler wired up as in
+GeminiLiveSession. The script reports reconnect times, whether the server
+kept one conversation context throughout, and how much audio reached it.
+It then starts a second conversation from a warm standby.
+
+Usage:
+    python scripts/fake_live_session.py --seconds 10
+    python scripts/fake_live_session.py --seconds 10 --kbps 600 --frame-kb 60 --fps 2
+    python scripts/fake_live_session.py --scenario reconnect --seconds 12 --drop-every 3
+    python scripts/fake_live_session.py --scenario reconnect --seconds 12 --drop-every 3 --go-away
+"""
+import argparse
+import asyncio
+import contextlib
+import itertools
+import os
+import statistics
+import sys
+import time
+
+engine_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'TTS-Engine')
+sys.path.append(engine_path)
+
+from types import SimpleNamespace
+
+from utils.live_connection import LiveConnection
+from utils.send_scheduler import SendScheduler
+
+SAMPLE_RATE = 16000
+CHUNK_SAMPLES = 1024
+
+
+class FakeLiveSession:
+    """Stands in for a live session: every send occupies the link for its payload's transfer time."""
+
+    def __init__(self, kbps: float):
+        self.bytes_per_s = kbps * 1000 / 8
+        self.sent = []  # (kind, bytes, put time, sent time)
+        self._link = asyncio.Lock()
+
+    async def send(self, input=None, end_of_turn=False):
+        data = input.get("data", b"") if isinstance(input, dict) else str(input).encode()
+        async with self._link:
+            await asyncio.sleep(len(data) / self.bytes_per_s)
+        kind = "video" if isinstance(input, dict) and str(input.get("mime_type")).startswith("image/") else "audio"
+        self.sent.append((kind, len(data), self._put_time(data), time.perf_counter()))
+
+    async def send_realtime_input(self, audio_stream_end=False):
+        pass
+
+    @staticmethod
+    def _put_time(data: bytes) -> float:
+        # Producers stamp each payload with its put time in the first 24 bytes; for coalesced
+        # audio that is the oldest chunk in the send.
+        return float.fromhex(data[:24].decode().strip()) if len(data) >= 24 else 0.0
+
+
+def stamped(size: int) -> bytes:
+    return time.perf_counter().hex().ljust(24).encode() + bytes(size - 24)
+
+
+async def produce(out_queue, seconds: float, frame_bytes: int, fps: float) -> None:
+    async def microphone():
+        chunk_s = CHUNK_SAMPLES / SAMPLE_RATE
+        start = time.perf_counter()
+        for index in range(int(seconds / chunk_s)):
+            await asyncio.sleep(max(0.0, start + (index + 1) * chunk_s - time.perf_counter()))
+            await out_queue.put({"data": stamped(CHUNK_SAMPLES * 2), "mime_type": "audio/pcm"})
+
+    async def camera():
+        for _ in range(int(seconds * fps)):
+            frame = {"data": stamped(frame_bytes), "mime_type": "image/jpeg"}
+            if isinstance(out_queue, SendScheduler):
+                out_queue.put_nowait(frame)
+            else:
+                await out_queue.put(frame)
+            await asyncio.sleep(1 / fps)
+
+    await asyncio.gather(microphone(), camera())
+
+
+async def fifo_sender(out_queue, session) -> None:
+    # The old CommunicationHandler.send_realtime: one FIFO, one send at a time.
+    while True:
+        msg = await out_queue.get()
+        await session.send(input=msg)
+
+
+async def run(mode: str, args) -> None:
+    session = FakeLiveSession(args.kbps)
+    if mode == "fifo":
+        out_queue = asyncio.Queue(maxsize=5)
+        sender = asyncio.create_task(fifo_sender(out_queue, session))
+    else:
+        out_queue = SendScheduler(SAMPLE_RATE)
+        sender = asyncio.create_task(out_queue.run(session))
+    await produce(out_queue, args.seconds, args.frame_kb * 1024, args.fps)
+    await asyncio.sleep(1.0)  # let the link drain
+    sender.cancel()
+    await asyncio.gather(sender, return_exceptions=True)
+
+    audio = sorted(sent - put for kind, _, put, sent in session.sent if kind == "audio")
+    audio_bytes = sum(size for kind, size, _, _ in session.sent if kind == "audio")
+    frames = sum(1 for kind, _, _, _ in session.sent if kind == "video")
+    p95 = audio[min(len(audio) - 1, int(0.95 * len(audio)))]
+    print(f"{mode:<9} audio: {len(audio):4d} sends, {audio_bytes / (SAMPLE_RATE * 2):5.1f} s, "
+          f"put->sent mean {statistics.mean(audio) * 1000:7.1f} ms, p95 {p95 * 1000:7.1f} ms, "
+          f"max {audio[-1] * 1000:7.1f} ms | video: {frames} of {int(args.seconds * args.fps)} frames sent")
+    if mode == "scheduler":
+        print(f"{'':<9} scheduler stats: {out_queue.stats()}")
+
+
+class FakeLiveServer:
+    """
+    Stands in for the Live API: hands out sessions that drop after a while.
+
+    Each conversation the server sees keeps the audio it received. A client
+    that connects with a resumption handle continues the conversation the
+    handle belongs to; without one it starts a new conversation.
+    """
+
+    def __init__(self, connect_ms: float, drop_every: float, go_away: bool):
+        self.connect_s = connect_ms / 1000
+        self.drop_every = drop_every
+        self.go_away = go_away
+        self.conversations = {}  # conversation id -> audio bytes received
+        self._handles = {}  # handle -> conversation id
+        self._ids = itertools.count(1)
+        self.aio = SimpleNamespace(live=SimpleNamespace(connect=self.connect))
+
+    @contextlib.asynccontextmanager
+    async def connect(self, model=None, config=None):
+        await asyncio.sleep(self.connect_s)
+        handle = (config or {}).get("handle")
+        if handle is not None and handle not in self._handles:
+            raise ConnectionError(f"Unknown resumption handle {handle!r}")
+        conversation = self._handles[handle] if handle is not None else next(self._ids)
+        self.conversations.setdefault(conversation, 0)
+        session = FakeServerSession(self, conversation)
+        try:
+            yield session
+        finally:
+            session.closed = True
+
+    def new_handle(self, conversation: int) -> str:
+        handle = f"h{conversation}-{len(self._handles)}"
+        self._handles[handle] = conversation
+        return handle
+
+
+def server_message(**fields) -> SimpleNamespace:
+    # The attributes of a LiveServerMessage that the client looks at.
+    message = dict(data=None, text=None, server_content=None, session_resumption_update=None, go_away=None)
+    message.update(fields)
+    return SimpleNamespace(**message)
+
+
+class FakeServerSession:
+    def __init__(self, server: FakeLiveServer, conversation: int):
+        self.server = server
+        self.conversation = conversation
+        self.closed = False
+        self._drop_at = time.perf_counter() + server.drop_every
+
+    async def send(self, input=None, end_of_turn=False):
+        if self.closed or time.perf_counter() >= self._drop_at:
+            raise ConnectionError("Connection closed")
+        self.server.conversations[self.conversation] += len(input.get("data", b""))
+
+    async def send_realtime_input(self, audio_stream_end=False):
+        pass
+
+    def receive(self):
+        async def messages():
+            announced = False
+            while True:
+                now = time.perf_counter()
+                if now >= self._drop_at or self.closed:
+                    raise ConnectionError("Connection closed")
+                if self.server.go_away and not announced and self._drop_at - now <= 0.5:
+                    announced = True
+                    yield server_message(go_away=SimpleNamespace(time_left="0.5s"))
+                    continue
+                await asyncio.sleep(0.25)
+                yield server_message(session_resumption_update=SimpleNamespace(
+                    new_handle=self.server.new_handle(self.conversation), resumable=True))
+        return messages()
+
+
+async def receive(session, connection) -> None:
+    # What AudioHandler.receive_audio does with the control messages.
+    try:
+        async for message in session.receive():
+            if connection.observe(message):
+                return
+    except ConnectionError:
+        return
+
+
+async def send(out_queue, session) -> None:
+    try:
+        await out_queue.run(session)
+    except ConnectionError:
+        return
+
+
+async def conversation(server: FakeLiveServer, connection: LiveConnection, seconds: float) -> None:
+    session = await connection.start()
+    out_queue = SendScheduler(SAMPLE_RATE, max_audio_ms=5000)
+    put_bytes = 0
+
+    async def microphone():
+        nonlocal put_bytes
+        chunk_s = CHUNK_SAMPLES / SAMPLE_RATE
+        start = time.perf_counter()
+        for index in range(int(seconds / chunk_s)):
+            await asyncio.sleep(max(0.0, start + (index + 1) * chunk_s - time.perf_counter()))
+            await out_queue.put({"data": bytes(CHUNK_SAMPLES * 2), "mime_type": "audio/pcm"})
+            put_bytes += CHUNK_SAMPLES * 2
+
+    mic = asyncio.create_task(microphone())
+    while not mic.done():
+        # The GeminiLiveSession.run loop: send and receive until the connection ends, then reconnect.
+        link = [asyncio.create_task(send(out_queue, session)), asyncio.create_task(receive(session, connection))]
+        await asyncio.wait(link + [mic], return_when=asyncio.FIRST_COMPLETED)
+        if mic.done():
+            await asyncio.sleep(0.3)  # let the tail go out
+        for task in link:
+            task.cancel()
+        await asyncio.gather(*link, return_exceptions=True)
+        if not mic.done():
+            session = await connection.reconnect()
+
+    received = {cid: size for cid, size in server.conversations.items() if size}
+    print(f"audio put {put_bytes / (SAMPLE_RATE * 2):.1f} s; server conversations with audio: "
+          f"{ {cid: round(size / (SAMPLE_RATE * 2), 1) for cid, size in received.items()} } s; "
+          f"dropped by scheduler: {out_queue.stats()['audio']['dropped']} chunks")
+    print(f"connection: {connection.stats()}")
+
+
+async def run_reconnect(args) -> None:
+    server = FakeLiveServer(args.connect_ms, args.drop_every, args.go_away)
+    connection = LiveConnection(
+        lambda handle: server.aio.live.connect(model="fake", config={"handle": handle}),
+        standby=True, min_uptime_s=0.5)
+    await conversation(server, connection, args.seconds)
+    await connection.close(keep_standby=True)
+
+    connection.prepare_standby()
+    await asyncio.sleep(args.connect_ms / 1000 + 0.2)  # the gap between two conversations
+    started = time.perf_counter()
+    await connection.start()
+    print(f"next conversation from warm standby ready in {1000 * (time.perf_counter() - started):.1f} ms "
+          f"(a cold connect takes {args.connect_ms:.0f} ms)")
+    await connection.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenario", choices=("send", "reconnect"), default="send")
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--kbps", type=float, default=600.0, help="link speed of the fake session")
+    parser.add_argument("--frame-kb", type=int, default=60, help="size of one video frame")
+    parser.add_argument("--fps", type=float, default=2.0)
+    parser.add_argument("--connect-ms", type=float, default=400.0, help="time to open a connection")
+    parser.add_argument("--drop-every", type=float, default=3.0, help="seconds until a connection drops")
+    parser.add_argument("--go-away", action="store_true", help="announce each drop with GoAway first")
+    args = parser.parse_args()
+
+    if args.scenario == "reconnect":
+        asyncio.run(run_reconnect(args))
+        return
+    for mode in ("fifo", "scheduler"):
+        asyncio.run(run(mode, args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""
+Drive a SessionRuntime with simulated callers to check concurrency, admission and latency.
+
+Each fake caller gets an in-process QueueTransport, streams synthetic speech in
+real-time 20 ms frames followed by silence, waits for the reply audio, and
+hangs up. The report shows how many calls were admitted or rejected, frames
+dropped by backpressure, and per-call time from the end of speech to the first
+reply audio.
+
+--offline swaps the transcriber and TTS provider for canned local ones, so the
+runtime itself can be exercised without models, network or API keys.
+
+Usage:
+    python scripts/fake_media_client.py --calls 40 --max-sessions 32 --offline
+    python scripts/fake_media_client.py --calls 4 --provider edge_tts --llm
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+import numpy as np
+
+engine_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'TTS-Engine')
+sys.path.append(engine_path)
+
+from synthetic_audio import synthetic_speech
+from voice.runtime import EchoResponder, OpenAIResponder, QueueTransport, SessionRejected, SessionRuntime
+from voice.text_to_speech.audio import AudioData
+from voice.text_to_speech.base import BaseTTSProvider
+from voice.transcription import BaseTranscriber
+
+RATE = 16000
+FRAME = RATE // 50
+
+
+class CannedTranscriber(BaseTranscriber):
+    """Reports every utterance as the same sentence after a short decode delay."""
+
+    NAME = "canned"
+
+    def finish(self, utterance_pcm):
+        time.sleep(0.02)
+        return "what is the weather like today", []
+
+
+class ToneTTSProvider(BaseTTSProvider):
+    """Renders each sentence as a beep whose length follows the text, after a fake network delay."""
+
+    PROVIDER_NAME = "tone"
+
+    def synthesize(self, text, voice=None):
+        seconds = 0.05 * len(text.split())
+        t = np.arange(int(RATE * seconds)) / RATE
+        return AudioData.from_pcm((0.2 * np.sin(2 * np.pi * 440 * t)).astype(np.float32), RATE)
+
+    async def asynthesize(self, text, voice=None):
+        await asyncio.sleep(0.05)
+        return self.synthesize(text, voice)
+
+    def list_available_voices(self):
+        return {}
+
+
+async def fake_call(runtime: SessionRuntime, index: int, speech_s: float, realtime: bool, results: list) -> None:
+    transport = QueueTransport(RATE)
+    serve = asyncio.create_task(runtime.serve(transport, session_id=f"call-{index}"))
+    await asyncio.sleep(0)
+    if serve.done():
+        try:
+            serve.result()
+        except SessionRejected:
+            results.append({"call": index, "rejected": True})
+        return
+
+    rng = np.random.default_rng(index)
+    audio = np.concatenate([
+        rng.normal(0, 0.002, RATE // 2).astype(np.float32),
+        synthetic_speech(RATE, speech_s, rng, f0=100 + 5 * (index % 20)),
+        rng.normal(0, 0.002, RATE * 2).astype(np.float32),
+    ])
+    pcm = (audio * 32767).astype(np.int16)
+    speech_end_sample = RATE // 2 + int(RATE * speech_s)
+    speech_end = None
+    reply = {"latency": None, "seconds": 0.0}
+
+    async def listen():
+        # Runs alongside the caller's audio so reply latency is measured when the audio arrives.
+        while True:
+            kind, chunk, rate = await transport.outbound.get()
+            if kind == "audio":
+                if reply["latency"] is None and speech_end is not None:
+                    reply["latency"] = time.perf_counter() - speech_end
+                reply["seconds"] += len(chunk) / rate
+
+    listener = asyncio.create_task(listen())
+    for offset in range(0, len(pcm), FRAME):
+        transport.push_audio(pcm[offset:offset + FRAME])
+        if speech_end is None and offset + FRAME >= speech_end_sample:
+            speech_end = time.perf_counter()
+        if realtime:
+            await asyncio.sleep(FRAME / RATE)
+
+    # Wait for the reply to start, then until it has been quiet for a second.
+    deadline = time.perf_counter() + 5.0
+    while reply["latency"] is None and time.perf_counter() < deadline:
+        await asyncio.sleep(0.1)
+    received = -1.0
+    while reply["seconds"] != received:
+        received = reply["seconds"]
+        await asyncio.sleep(1.0)
+    listener.cancel()
+
+    transport.hangup()
+    session = await serve
+    results.append({"call": index, "rejected": False, "reply_latency": reply["latency"],
+                    "reply_seconds": reply["seconds"], **session.stats()})
+
+
+async def main(args) -> None:
+    if args.offline:
+        tone = ToneTTSProvider()
+        runtime = SessionRuntime(EchoResponder(), transcriber_factory=CannedTranscriber,
+                                 provider_resolver=lambda name: tone,
+                                 max_sessions=args.max_sessions)
+    else:
+        responder = OpenAIResponder() if args.llm else EchoResponder()
+        runtime = SessionRuntime(responder, default_provider=args.provider, max_sessions=args.max_sessions)
+
+    results = []
+    start = time.perf_counter()
+    await asyncio.gather(*(fake_call(runtime, i, args.speech_seconds, not args.fast, results)
+                           for i in range(args.calls)))
+    elapsed = time.perf_counter() - start
+    await runtime.shutdown()
+
+    served = [r for r in results if not r["rejected"]]
+    latencies = [r["reply_latency"] for r in served if r["reply_latency"] is not None]
+    print(f"{args.calls} calls in {elapsed:.1f}s: {len(served)} served, "
+          f"{len(results) - len(served)} rejected, {sum(r['dropped_frames'] for r in served)} frames dropped")
+    if latencies:
+        latencies.sort()
+        print(f"end of speech -> first reply audio: median {statistics.median(latencies) * 1000:.0f} ms, "
+              f"p95 {latencies[int(0.95 * (len(latencies) - 1))] * 1000:.0f} ms, "
+              f"max {latencies[-1] * 1000:.0f} ms ({len(latencies)}/{len(served)} replied)")
+    for r in sorted(served, key=lambda r: r["call"])[:args.show]:
+        print(f"  {r['session_id']}: turns={r['turns']} reply={r['reply_seconds']:.2f}s latency={r['last_latency']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=20, help="simulated callers, all dialing at once")
+    parser.add_argument("--max-sessions", type=int, default=16, help="runtime admission limit")
+    parser.add_argument("--speech-seconds", type=float, default=1.5, help="length of each caller's utterance")
+    parser.add_argument("--provider", default="edge_tts", help="TTS provider when not --offline")
+    parser.add_argument("--llm", action="store_true", help="reply through the configured LLM instead of echoing")
+    parser.add_argument("--offline", action="store_true", help="canned transcriber and tone TTS; no models or network")
+    parser.add_argument("--fast", action="store_true", help="push caller audio as fast as possible instead of in real time")
+    parser.add_argument("--show", type=int, default=5, help="per-call lines to print")
+    asyncio.run(main(parser.parse_args()))
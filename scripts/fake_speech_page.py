@@ -0,0 +1,163 @@
+"""
+Exercise the browser speech bridge with a fake speech page, without Chrome.
+
+The fake page connects to a BrowserSpeechBridge the way index.html does and
+answers each start command like the Web Speech API would: a start event,
+interim results a word at a time, a final result, then end. For every turn
+the script measures how long after the page produced the final transcript
+Python had it, over the bridge and with the old DOM polling (a 100 ms poll
+loop in which each WebDriver call costs --rtt-ms).
+
+Usage:
+    python scripts/fake_speech_page.py --turns 20
+    python scripts/fake_speech_page.py --turns 20 --rtt-ms 8 --word-ms 250
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+
+engine_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'TTS-Engine')
+sys.path.append(engine_path)
+
+from utils.async_tools import BackgroundEventLoop
+from voice.browser_bridge import BrowserSpeechBridge
+
+UTTERANCES = [
+    "what's the weather like tomorrow",
+    "set a timer for ten minutes",
+    "play something relaxing",
+    "remind me to call mom",
+]
+
+
+class FakeSpeechPage:
+    """Plays the part of index.html: pushes events over the bridge and mirrors them into a fake DOM."""
+
+    def __init__(self, bridge_url: str, word_ms: int):
+        self.bridge_url = bridge_url
+        self.word_seconds = word_ms / 1000
+        self.loop = BackgroundEventLoop("FakeSpeechPage")
+        # What the old handler polled: #is_recording and #convert_text.
+        self.dom = {"recording": False, "text": ""}
+        self.final_at = None
+        self._turns = 0
+        self._current = None
+        self._stop = asyncio.Event()
+
+    def open(self) -> None:
+        self.loop.submit(self._run())
+
+    def close(self) -> None:
+        self.loop.loop.call_soon_threadsafe(self._stop.set)
+        time.sleep(0.1)
+        self.loop.stop()
+
+    async def _run(self) -> None:
+        from websockets.asyncio.client import connect
+
+        async with connect(self.bridge_url) as ws:
+            async def recv_commands():
+                async for raw in ws:
+                    command = json.loads(raw)
+                    if command["type"] not in ("start", "start_polled"):
+                        continue
+                    # Like Chrome, a new recognition aborts the one still running.
+                    if self._current is not None:
+                        self._current.cancel()
+                    polled = command["type"] == "start_polled"
+                    self._current = asyncio.create_task(self._recognize(None if polled else ws, command.get("turn")))
+
+            receiver = asyncio.create_task(recv_commands())
+            await self._stop.wait()
+            receiver.cancel()
+            if self._current is not None:
+                self._current.cancel()
+
+    async def _recognize(self, ws, turn) -> None:
+        async def emit(event):
+            if ws is not None:
+                event["turn"] = turn
+                await ws.send(json.dumps(event))
+
+        words = UTTERANCES[self._turns % len(UTTERANCES)].split()
+        self._turns += 1
+        self.dom.update(recording=True, text="")
+        await asyncio.sleep(0.05)
+        await emit({"type": "start", "lang": "en-US"})
+        for count in range(1, len(words) + 1):
+            await asyncio.sleep(self.word_seconds)
+            self.dom["text"] = " ".join(words[:count])
+            final = count == len(words)
+            if final:
+                self.final_at = time.perf_counter()
+            await emit({"type": "result", "transcript": self.dom["text"], "final": final, "confidence": 0.9})
+        # Chrome fires `end` a little after the final result.
+        await asyncio.sleep(0.03)
+        self.dom["recording"] = False
+        await emit({"type": "end"})
+
+
+def bridge_turn(bridge: BrowserSpeechBridge, page: FakeSpeechPage) -> float:
+    bridge.start_recognition("en-US")
+    while True:
+        event = bridge.next_event(10)
+        if event is None:
+            raise TimeoutError("No final result from the fake page.")
+        if event["type"] == "result" and event["final"]:
+            return time.perf_counter() - page.final_at
+
+
+def polled_turn(bridge: BrowserSpeechBridge, page: FakeSpeechPage, rtt: float) -> float:
+    # The old loop: find_element(is_recording), find_element(convert_text), sleep 100 ms.
+    while page.dom["recording"]:
+        time.sleep(0.005)  # let the previous turn end first
+    page.final_at = None
+    bridge.send({"type": "start_polled"})
+    while not page.dom["recording"]:
+        time.sleep(0.005)
+    while True:
+        time.sleep(rtt)
+        recording = page.dom["recording"]
+        time.sleep(rtt)
+        if not recording:
+            break
+        time.sleep(0.1)
+    time.sleep(rtt)  # final get_text()
+    return time.perf_counter() - page.final_at
+
+
+def summarize(name: str, latencies) -> None:
+    ordered = sorted(latencies)
+    p95 = ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))]
+    print(f"{name:<8} final transcript -> Python: mean {statistics.mean(ordered) * 1000:6.1f} ms, "
+          f"p95 {p95 * 1000:6.1f} ms, max {ordered[-1] * 1000:6.1f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--turns", type=int, default=10)
+    parser.add_argument("--word-ms", type=int, default=200, help="time between interim results")
+    parser.add_argument("--rtt-ms", type=float, default=5.0, help="cost of one WebDriver call when polling")
+    args = parser.parse_args()
+
+    bridge = BrowserSpeechBridge()
+    bridge.start()
+    page = FakeSpeechPage(bridge.url, args.word_ms)
+    page.open()
+    if not bridge.wait_connected(5):
+        sys.exit("Fake page did not connect to the bridge.")
+
+    try:
+        summarize("bridge", [bridge_turn(bridge, page) for _ in range(args.turns)])
+        summarize("polling", [polled_turn(bridge, page, args.rtt_ms / 1000) for _ in range(args.turns)])
+    finally:
+        page.close()
+        bridge.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+"""
+Synthetic test audio shared by the scripts in this directory.
+
+Not a script itself: the checks and fake clients import it, e.g.
+`from synthetic_audio import synthetic_speech`, to feed the voice
+activity detector and the media runtime something that looks like speech
+without recordings.
+"""
+import numpy as np
+
+
+def synthetic_speech(sample_rate: int, seconds: float, rng: np.random.Generator, f0: float = 120.0) -> np.ndarray:
+    """
+    Harmonics of a wobbling pitch shaped by three formants, with a 4 Hz syllable
+    envelope and a little breath noise: enough structure to look like voiced speech.
+
+    Args:
+        sample_rate (int): Rate of the returned samples.
+        seconds (float): Length of the speech.
+        rng (np.random.Generator): Source of the breath noise.
+        f0 (float): Base pitch in Hz; vary it to tell callers apart.
+
+    Returns:
+        np.ndarray: float32 samples peaking at 0.3.
+    """
+    t = np.arange(int(sample_rate * seconds)) / sample_rate
+    phase = 2 * np.pi * np.cumsum(f0 * (1 + 0.05 * np.sin(2 * np.pi * 3 * t))) / sample_rate
+    signal = np.zeros_like(t)
+    for k in range(1, int(4000 // f0)):
+        gain = sum(np.exp(-((k * f0 - f) / bw) ** 2) for f, bw in ((700, 150), (1200, 120), (2600, 200))) + 0.02
+        signal += gain * np.sin(k * phase)
+    signal += rng.normal(0, 0.05 * np.std(signal), len(t))
+    signal *= 0.6 + 0.4 * np.sin(2 * np.pi * 4 * t)
+    return (0.3 * signal / np.max(np.abs(signal))).astype(np.float32)
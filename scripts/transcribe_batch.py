@@ -0,0 +1,144 @@
+"""
+Transcribe a corpus of recordings with Vosk, e.g. to re-transcribe call recordings overnight.
+
+Inputs are directories (searched recursively for audio files) and manifests:
+text files with one path per line, or JSON-lines files with a "path" field.
+Relative manifest paths are resolved against the manifest's directory.
+
+Files are decoded and resampled block by block and spread over a process pool,
+one Vosk model per worker (--mode thread shares one model instead). Each result
+is appended to the output as one JSON line with the text and word timings.
+
+Runs are resumable: once a file's result is written, its path, size and
+modification time go into a completed-files index (--index, by default next to
+the output), and later runs skip it unless the file has changed. Files that
+fail are written with an "error" field and retried on the next run.
+
+Usage:
+    python scripts/transcribe_batch.py data/recordings --out transcripts.jsonl
+    python scripts/transcribe_batch.py calls.txt more_calls.jsonl --out transcripts.jsonl --workers 4
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from collections import defaultdict
+
+engine_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'TTS-Engine')
+sys.path.append(engine_path)
+
+from core.config import AppConfig
+from voice.vosk_pool import BatchTranscriber
+
+AUDIO_EXTENSIONS = (".wav", ".mp3", ".flac", ".ogg")
+
+
+def expand_inputs(inputs):
+    """Yield absolute audio paths from directories and manifests, without duplicates."""
+    seen = set()
+
+    def emit(path):
+        path = os.path.abspath(path)
+        if path not in seen:
+            seen.add(path)
+            yield path
+
+    for item in inputs:
+        if os.path.isdir(item):
+            for root, _, names in sorted(os.walk(item)):
+                for name in sorted(names):
+                    if name.lower().endswith(AUDIO_EXTENSIONS):
+                        yield from emit(os.path.join(root, name))
+        elif item.lower().endswith(AUDIO_EXTENSIONS):
+            yield from emit(item)
+        else:
+            base = os.path.dirname(os.path.abspath(item))
+            with open(item) as f:
+                for line in f:
+                    line = line.strip()
+                    if not line or line.startswith("#"):
+                        continue
+                    path = json.loads(line)["path"] if line.startswith("{") else line
+                    yield from emit(os.path.join(base, path))
+
+
+def file_key(path: str) -> str:
+    """Index entry for a file; changes when the file is replaced or modified."""
+    stat = os.stat(path)
+    return f"{path}\t{stat.st_size}\t{int(stat.st_mtime)}"
+
+
+def load_index(path: str) -> set:
+    if not os.path.exists(path):
+        return set()
+    with open(path) as f:
+        return {line.rstrip("\n") for line in f if line.strip()}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("inputs", nargs="+", help="audio files, directories, or manifest files")
+    parser.add_argument("--out", required=True, help="JSON-lines file results are appended to")
+    parser.add_argument("--index", help="completed-files index (default: <out>.done)")
+    parser.add_argument("--model", default=AppConfig.VOSK_MODEL_PATH, help="Vosk model directory")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--mode", choices=("process", "thread"), default="process")
+    parser.add_argument("--sample-rate", type=int, default=16000, help="rate audio is resampled to for the model")
+    args = parser.parse_args()
+
+    index_path = args.index or args.out + ".done"
+    done = load_index(index_path)
+    pending, keys, missing = [], {}, 0
+    for path in expand_inputs(args.inputs):
+        if not os.path.exists(path):
+            missing += 1
+            print(f"missing: {path}", file=sys.stderr)
+            continue
+        keys[path] = file_key(path)
+        if keys[path] not in done:
+            pending.append(path)
+    skipped = len(keys) - len(pending)
+    print(f"{len(pending)} files to transcribe, {skipped} already done"
+          + (f", {missing} missing" if missing else "") + f" ({args.workers} {args.mode} workers)")
+    if not pending:
+        return
+
+    per_worker = defaultdict(lambda: {"files": 0, "audio": 0.0, "decode": 0.0, "rtfs": []})
+    failed = 0
+    start = time.perf_counter()
+    transcriber = BatchTranscriber(args.model, workers=args.workers, mode=args.mode, sample_rate=args.sample_rate)
+    with open(args.out, "a") as out, open(index_path, "a") as index:
+        try:
+            for number, result in enumerate(transcriber.transcribe(pending), 1):
+                out.write(json.dumps(result) + "\n")
+                out.flush()
+                if "error" in result:
+                    failed += 1
+                    print(f"[{number}/{len(pending)}] FAILED {result['path']}: {result['error']}", file=sys.stderr)
+                    continue
+                # Only recorded as done once its result is safely in the output.
+                index.write(keys[result["path"]] + "\n")
+                index.flush()
+                worker = per_worker[result["worker"]]
+                worker["files"] += 1
+                worker["audio"] += result["audio_seconds"]
+                worker["decode"] += result["decode_seconds"]
+                if result["rtf"] is not None:
+                    worker["rtfs"].append(result["rtf"])
+                print(f"[{number}/{len(pending)}] {result['path']} "
+                      f"({result['audio_seconds']:.1f}s, RTF {result['rtf'] or 0:.3f})")
+        except KeyboardInterrupt:
+            print("\nInterrupted; run again to resume.", file=sys.stderr)
+    elapsed = time.perf_counter() - start
+
+    audio = sum(w["audio"] for w in per_worker.values())
+    print(f"\n{sum(w['files'] for w in per_worker.values())} files, {audio:.1f}s of audio in {elapsed:.1f}s "
+          f"({audio / elapsed:.1f} audio s / wall s)" + (f", {failed} failed" if failed else ""))
+    for name, w in sorted(per_worker.items()):
+        rtf = f"RTF {w['decode'] / w['audio']:.3f} overall, worst file {max(w['rtfs']):.3f}" if w["rtfs"] else "RTF n/a"
+        print(f"  worker {name:<28} {w['files']:5d} files  {w['audio']:8.1f}s audio  {rtf}")
+
+
+if __name__ == "__main__":
+    main()
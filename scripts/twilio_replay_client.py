@@ -0,0 +1,198 @@
+"""
+Replay a call against the Twilio media stream server, the way Twilio would send it.
+
+The caller audio comes from a recording made by the server (MEDIA_RECORD_DIR),
+from a WAV file, or from synthetic speech. It is sent as base64 8 kHz mu-law
+media messages in real time. Reply audio is "played" on a simulated clock:
+each `mark` is echoed back once the audio before it would have finished, and
+a `clear` drops what is still queued, just like Twilio does on barge-in.
+
+--offline-server starts an in-process server with the canned transcriber and
+tone TTS from fake_media_client.py, so the whole path (codec, resampling,
+framing, marks) can be checked without models, network or keys.
+
+Usage:
+    python scripts/twilio_replay_client.py --offline-server --calls 4
+    python scripts/twilio_replay_client.py ws://localhost:5000/media --recording data/media/MZ123.jsonl
+    python scripts/twilio_replay_client.py ws://localhost:5000/media --wav hello.wav --save-reply reply.wav
+"""
+import argparse
+import asyncio
+import base64
+import json
+import os
+import sys
+import time
+import uuid
+
+import numpy as np
+
+engine_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'TTS-Engine')
+sys.path.append(engine_path)
+
+from synthetic_audio import synthetic_speech
+from utils.audio_codec import float_to_pcm16, mulaw_decode, mulaw_encode, resample_block
+from voice.runtime.twilio import TWILIO_FRAME_BYTES, TWILIO_SAMPLE_RATE
+
+FRAME_SECONDS = TWILIO_FRAME_BYTES / TWILIO_SAMPLE_RATE
+
+
+def load_payloads(args, index: int):
+    """Return the caller's media payloads (base64 strings), one per 20 ms frame."""
+    if args.recording:
+        with open(args.recording) as f:
+            messages = [json.loads(line) for line in f if line.strip()]
+        return [m["media"]["payload"] for m in messages
+                if m.get("event") == "media" and m["media"].get("track", "inbound") == "inbound"]
+
+    if args.wav:
+        import soundfile as sf
+        audio, rate = sf.read(args.wav, dtype="float32", always_2d=True)
+        audio = resample_block(audio.mean(axis=1), rate, TWILIO_SAMPLE_RATE)
+    else:
+        rng = np.random.default_rng(index)
+        audio = np.concatenate([
+            rng.normal(0, 0.002, TWILIO_SAMPLE_RATE // 2).astype(np.float32),
+            synthetic_speech(TWILIO_SAMPLE_RATE, args.speech_seconds, rng, f0=110 + 5 * index),
+        ])
+    audio = np.concatenate([audio, np.zeros(int(TWILIO_SAMPLE_RATE * args.trailing_silence), np.float32)])
+    encoded = mulaw_encode(float_to_pcm16(audio))
+    return [base64.b64encode(encoded[i:i + TWILIO_FRAME_BYTES]).decode()
+            for i in range(0, len(encoded) - TWILIO_FRAME_BYTES + 1, TWILIO_FRAME_BYTES)]
+
+
+def last_voiced_frame(payloads) -> int:
+    energies = [np.sqrt(np.mean(mulaw_decode(base64.b64decode(p)).astype(np.float32) ** 2)) for p in payloads]
+    voiced = [i for i, energy in enumerate(energies) if energy > 300]
+    return voiced[-1] if voiced else len(payloads) - 1
+
+
+async def replay_call(url: str, args, index: int) -> dict:
+    from websockets.asyncio.client import connect
+
+    payloads = load_payloads(args, index)
+    speech_end_frame = last_voiced_frame(payloads)
+    stream_sid = f"MZ{uuid.uuid4().hex}"
+    stats = {"call": index, "frames_sent": 0, "reply_frames": 0, "marks": 0, "clears": 0, "first_reply": None}
+    reply_audio = []
+    speech_end = None
+    play_clock = {"ends_at": 0.0}
+    pending_marks = []
+
+    async with connect(url) as ws:
+        async def send(message):
+            await ws.send(json.dumps(message))
+
+        async def listen():
+            async for raw in ws:
+                message = json.loads(raw)
+                event = message.get("event")
+                now = time.perf_counter()
+                if event == "media":
+                    if stats["first_reply"] is None and speech_end is not None:
+                        stats["first_reply"] = now - speech_end
+                    stats["reply_frames"] += 1
+                    reply_audio.append(mulaw_decode(base64.b64decode(message["media"]["payload"])))
+                    play_clock["ends_at"] = max(play_clock["ends_at"], now) + FRAME_SECONDS
+                elif event == "mark":
+                    stats["marks"] += 1
+                    pending_marks.append((play_clock["ends_at"], message["mark"]["name"]))
+                elif event == "clear":
+                    stats["clears"] += 1
+                    play_clock["ends_at"] = now
+
+        async def echo_marks():
+            # Twilio reports each mark once the audio queued before it has played.
+            while True:
+                await asyncio.sleep(0.01)
+                now = time.perf_counter()
+                while pending_marks and (pending_marks[0][0] <= now or play_clock["ends_at"] <= now):
+                    _, name = pending_marks.pop(0)
+                    await send({"event": "mark", "streamSid": stream_sid, "mark": {"name": name}})
+
+        listener = asyncio.create_task(listen())
+        echoer = asyncio.create_task(echo_marks())
+        await send({"event": "connected", "protocol": "Call", "version": "1.0.0"})
+        await send({"event": "start", "sequenceNumber": "1", "streamSid": stream_sid,
+                    "start": {"streamSid": stream_sid, "callSid": f"CA{uuid.uuid4().hex}",
+                              "tracks": ["inbound"], "customParameters": {},
+                              "mediaFormat": {"encoding": "audio/x-mulaw", "sampleRate": 8000, "channels": 1}}})
+
+        start = time.perf_counter()
+        for number, payload in enumerate(payloads):
+            await send({"event": "media", "streamSid": stream_sid,
+                        "media": {"track": "inbound", "chunk": str(number + 1),
+                                  "timestamp": str(int(number * FRAME_SECONDS * 1000)), "payload": payload}})
+            stats["frames_sent"] += 1
+            if number == speech_end_frame:
+                speech_end = time.perf_counter()
+            # Pace against the start time so scheduling jitter does not accumulate.
+            await asyncio.sleep(max(0.0, start + (number + 1) * FRAME_SECONDS - time.perf_counter()))
+
+        # Wait for the reply, then until it has played out.
+        deadline = time.perf_counter() + 5.0
+        while stats["reply_frames"] == 0 and time.perf_counter() < deadline:
+            await asyncio.sleep(0.1)
+        while time.perf_counter() < play_clock["ends_at"] + args.linger:
+            await asyncio.sleep(0.1)
+
+        await send({"event": "stop", "streamSid": stream_sid, "stop": {}})
+        echoer.cancel()
+        await asyncio.sleep(0.1)
+        listener.cancel()
+
+    stats["reply_seconds"] = stats["reply_frames"] * FRAME_SECONDS
+    if args.save_reply and reply_audio:
+        import soundfile as sf
+        path = args.save_reply if args.calls == 1 else f"{os.path.splitext(args.save_reply)[0]}-{index}.wav"
+        sf.write(path, np.concatenate(reply_audio), TWILIO_SAMPLE_RATE)
+    return stats
+
+
+async def start_offline_server(port: int):
+    sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+    from fake_media_client import CannedTranscriber, ToneTTSProvider
+    from voice.runtime import EchoResponder, SessionRuntime
+    from voice.runtime.twilio import serve_twilio
+
+    tone = ToneTTSProvider()
+    runtime = SessionRuntime(EchoResponder(), transcriber_factory=CannedTranscriber, provider_resolver=lambda name: tone)
+    server = asyncio.create_task(serve_twilio(runtime, "127.0.0.1", port))
+    await asyncio.sleep(0.3)
+    return server
+
+
+async def main(args) -> None:
+    url = args.url
+    server = None
+    if args.offline_server:
+        server = await start_offline_server(args.port)
+        url = f"ws://127.0.0.1:{args.port}/media"
+
+    try:
+        results = await asyncio.gather(*(replay_call(url, args, i) for i in range(args.calls)))
+    finally:
+        if server is not None:
+            server.cancel()
+            await asyncio.gather(server, return_exceptions=True)
+
+    for r in results:
+        latency = f"{r['first_reply'] * 1000:.0f} ms" if r["first_reply"] is not None else "no reply"
+        print(f"call {r['call']}: sent {r['frames_sent']} frames, got {r['reply_frames']} reply frames "
+              f"({r['reply_seconds']:.2f}s), {r['marks']} marks, {r['clears']} clears, "
+              f"end of speech -> first reply: {latency}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("url", nargs="?", default="ws://localhost:5000/media", help="media stream websocket URL")
+    parser.add_argument("--recording", help="JSON-lines recording of a media stream to replay")
+    parser.add_argument("--wav", help="audio file to send as the caller")
+    parser.add_argument("--speech-seconds", type=float, default=1.5, help="length of synthetic caller speech")
+    parser.add_argument("--trailing-silence", type=float, default=1.0, help="silence appended after WAV/synthetic audio")
+    parser.add_argument("--linger", type=float, default=1.0, help="seconds to stay on the line after the reply")
+    parser.add_argument("--calls", type=int, default=1, help="concurrent calls to replay")
+    parser.add_argument("--save-reply", help="write the received reply audio to this WAV file")
+    parser.add_argument("--offline-server", action="store_true", help="start an in-process server with canned backends")
+    parser.add_argument("--port", type=int, default=5055, help="port for --offline-server")
+    asyncio.run(main(parser.parse_args()))
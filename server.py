@@ -0,0 +1,42 @@
+import asyncio
+import os
+import sys
+
+# --- CONFIGURATION ---
+HOST = "0.0.0.0"
+PORT = 5000
+TTS_PROVIDER_TO_USE = "edge_tts"
+PUBLIC_HOST = os.environ.get("PUBLIC_HOST")  # e.g. your Codespaces port-5000 host name
+RECORD_DIR = os.environ.get("MEDIA_RECORD_DIR")  # save inbound media streams for replay
+
+# --- PATH SETUP ---
+engine_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'TTS-Engine')
+sys.path.append(engine_path)
+
+from core.model_registry import model_registry
+from voice.runtime import OpenAIResponder, SessionRuntime
+from voice.runtime.twilio import serve_twilio
+
+
+async def main():
+    runtime = SessionRuntime(OpenAIResponder(), default_provider=TTS_PROVIDER_TO_USE)
+
+    # Load the shared models before the first call rings.
+    print("🔥 Loading AI models...")
+    await runtime.prewarm()
+    print(f"✅ Models loaded: {model_registry.report()}")
+
+    print(f"📞 Aura Voice is taking calls on port {PORT} (webhook: /voice, stream: /media)")
+    try:
+        await serve_twilio(runtime, HOST, PORT, public_host=PUBLIC_HOST, record_dir=RECORD_DIR)
+    finally:
+        await runtime.shutdown()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        print("\n\nHanging up. Peace out! ✌️")
+    finally:
+        model_registry.close()